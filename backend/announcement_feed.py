@@ -0,0 +1,186 @@
+"""
+Pre-rendered announcement feeds (RSS 2.0, Atom and JSON Feed)
+The item list is loaded once per change of the announcements table version or the
+site title/URL; each format is rendered from it on first request and kept until then.
+"""
+
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from xml.sax.saxutils import escape, quoteattr
+import hashlib
+import json
+import threading
+
+FEED_SIZE = 20
+
+PRIORITY_EMOJI = {"high": "🔴", "medium": "🟠", "normal": "🔵", "low": "⚪"}
+
+
+def _rfc822(value: datetime) -> str:
+    return format_datetime(value.replace(tzinfo=timezone.utc), usegmt=True)
+
+
+def _rfc3339(value: datetime) -> str:
+    return value.replace(tzinfo=timezone.utc, microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def _cdata(text: str) -> str:
+    # "]]>" would end the CDATA section early
+    return "<![CDATA[" + text.replace("]]>", "]]]]><![CDATA[>") + "]]>"
+
+
+def feed_item(announcement) -> dict:
+    """Plain feed item from an Announcement row"""
+    tags = [tag.strip() for tag in announcement.tags.split(',')] if announcement.tags else []
+    return {
+        "id": announcement.id,
+        "title": announcement.title,
+        "content": announcement.content,
+        "author": announcement.author or "IM Team",
+        "priority": announcement.priority,
+        "tags": tags,
+        "date": announcement.date,
+        "updated_at": announcement.updated_at or announcement.date,
+    }
+
+
+def render_rss(items, site_title: str, site_url: str) -> str:
+    title = escape(site_title)
+    self_link = quoteattr(f"{site_url}/feeds/announcements.xml")
+
+    if not items:
+        return f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">
+  <channel>
+    <title>{title} - Announcements</title>
+    <link>{escape(site_url)}</link>
+    <description>Latest announcements from {title}</description>
+    <atom:link href={self_link} rel="self" type="application/rss+xml" />
+  </channel>
+</rss>"""
+
+    parts = []
+    for item in items:
+        priority_badge = PRIORITY_EMOJI.get(item["priority"], "🔵")
+        categories = "".join(f"    <category>{escape(tag)}</category>\n" for tag in item["tags"])
+        parts.append(f"""  <item>
+    <title>{priority_badge} {escape(item["title"])}</title>
+    <link>{escape(site_url)}/#announcement-{item["id"]}</link>
+    <guid isPermaLink="false">announcement-{item["id"]}</guid>
+    <pubDate>{_rfc822(item["date"])}</pubDate>
+    <author>{escape(item["author"])}</author>
+{categories}    <description>{_cdata(item["content"])}</description>
+  </item>
+""")
+
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">
+  <channel>
+    <title>{title} - Announcements</title>
+    <link>{escape(site_url)}</link>
+    <description>Latest announcements and updates from {title}</description>
+    <language>en-us</language>
+    <lastBuildDate>{_rfc822(items[0]["date"])}</lastBuildDate>
+    <atom:link href={self_link} rel="self" type="application/rss+xml" />
+{"".join(parts)}  </channel>
+</rss>"""
+
+
+def render_atom(items, site_title: str, site_url: str, updated: datetime) -> str:
+    parts = []
+    for item in items:
+        priority_badge = PRIORITY_EMOJI.get(item["priority"], "🔵")
+        categories = "".join(f"    <category term={quoteattr(tag)} />\n" for tag in item["tags"])
+        parts.append(f"""  <entry>
+    <title>{priority_badge} {escape(item["title"])}</title>
+    <link href={quoteattr(f"{site_url}/#announcement-{item['id']}")} />
+    <id>{escape(site_url)}/#announcement-{item["id"]}</id>
+    <published>{_rfc3339(item["date"])}</published>
+    <updated>{_rfc3339(item["updated_at"])}</updated>
+    <author><name>{escape(item["author"])}</name></author>
+{categories}    <content type="html">{escape(item["content"])}</content>
+  </entry>
+""")
+
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>{escape(site_title)} - Announcements</title>
+  <subtitle>Latest announcements and updates from {escape(site_title)}</subtitle>
+  <link href={quoteattr(site_url)} />
+  <link href={quoteattr(f"{site_url}/feeds/announcements.atom")} rel="self" type="application/atom+xml" />
+  <id>{escape(site_url)}/feeds/announcements.atom</id>
+  <updated>{_rfc3339(updated)}</updated>
+{"".join(parts)}</feed>"""
+
+
+def render_json_feed(items, site_title: str, site_url: str) -> str:
+    feed = {
+        "version": "https://jsonfeed.org/version/1.1",
+        "title": f"{site_title} - Announcements",
+        "description": f"Latest announcements and updates from {site_title}",
+        "home_page_url": site_url,
+        "feed_url": f"{site_url}/feeds/announcements.json",
+        "language": "en-us",
+        "items": [
+            {
+                "id": f"announcement-{item['id']}",
+                "url": f"{site_url}/#announcement-{item['id']}",
+                "title": item["title"],
+                "content_html": item["content"],
+                "date_published": _rfc3339(item["date"]),
+                "date_modified": _rfc3339(item["updated_at"]),
+                "authors": [{"name": item["author"]}],
+                "tags": item["tags"],
+            }
+            for item in items
+        ],
+    }
+    return json.dumps(feed, ensure_ascii=False)
+
+
+RENDERERS = {
+    "rss": lambda items, title, url, updated: render_rss(items, title, url),
+    "atom": render_atom,
+    "json": lambda items, title, url, updated: render_json_feed(items, title, url),
+}
+
+
+class AnnouncementFeedCache:
+    """Feed documents keyed by (announcements version, site title, site URL)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key = None
+        self._items = None
+        self._updated = None
+        # format -> (etag, body)
+        self._documents = {}
+
+        self.build_count = 0
+
+    def get(self, key, load_items, feed_format: str = "rss", changed_at: datetime = None):
+        """
+        Get (etag, last_modified, body) for a feed format. last_modified is changed_at,
+        the time of the last write to the announcements table, so it is the same in every
+        worker and across restarts, and a deleted or unpublished item moves it too. Before
+        the first stamped write it falls back to the newest item's updated_at.
+        load_items() is only called when key differs from the cached one.
+        """
+        with self._lock:
+            if key != self._key:
+                items = [feed_item(announcement) for announcement in load_items()]
+                self._items = items
+                self._updated = max((item["updated_at"] for item in items), default=None) or datetime.utcnow()
+                self._documents = {}
+                self._key = key
+
+            document = self._documents.get(feed_format)
+            if document is None:
+                _, site_title, site_url = key
+                body = RENDERERS[feed_format](self._items, site_title, site_url, self._updated)
+                etag = '"' + hashlib.sha256(body.encode("utf-8")).hexdigest()[:32] + '"'
+                document = (etag, body)
+                self._documents[feed_format] = document
+                self.build_count += 1
+
+            return document[0], changed_at or self._updated, document[1]
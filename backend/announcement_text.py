@@ -0,0 +1,52 @@
+"""
+Derived text fields for announcements
+The list cards show a summary (the first paragraph's HTML) and a plain-text excerpt;
+both are computed when the content is written and stored, instead of being extracted
+from the full HTML on every request. Tags are stored normalized so reading them is a
+plain split.
+"""
+
+from html import unescape
+import re
+
+EXCERPT_LENGTH = 200
+
+_FIRST_PARAGRAPH = re.compile(r"<p>(.*?)</p>", re.DOTALL)
+# Headings usually repeat the title, so the excerpt starts after them
+_HEADING = re.compile(r"<h[1-6][^>]*>.*?</h[1-6]>", re.DOTALL | re.IGNORECASE)
+_TAG = re.compile(r"<[^>]*>")
+_SPACE = re.compile(r"\s+")
+
+
+def summary_html(content) -> str:
+    """Inner HTML of the first <p>, or '' if there is none"""
+    match = _FIRST_PARAGRAPH.search(content or "")
+    return match.group(1) if match else ""
+
+
+def plain_excerpt(content, length: int = EXCERPT_LENGTH) -> str:
+    """Text of the HTML content without headings, cut at a word boundary to at most length characters"""
+    text = _HEADING.sub(" ", content or "")
+    text = _SPACE.sub(" ", unescape(_TAG.sub(" ", text))).strip()
+    if len(text) <= length:
+        return text
+    cut = text[:length - 1]
+    if " " in cut:
+        cut = cut[:cut.rindex(" ")]
+    return cut.rstrip(" ,.;:") + "…"
+
+
+def normalize_tags(tags) -> str:
+    """Comma-separated tags (string or list) trimmed, without blanks or case-insensitive duplicates"""
+    if tags is None:
+        return ""
+    if isinstance(tags, str):
+        tags = tags.split(",")
+    normalized = []
+    seen = set()
+    for tag in tags:
+        tag = _SPACE.sub(" ", str(tag).replace(",", " ")).strip()
+        if tag and tag.lower() not in seen:
+            seen.add(tag.lower())
+            normalized.append(tag)
+    return ",".join(normalized)
@@ -0,0 +1,121 @@
+"""
+Contact counts per parish (ADM1) and community (ADM2) for choropleth maps
+Counts come from one GROUP BY over contacts.adm1_pcode/adm2_pcode, re-run only when the
+contacts table version or the boundary file changes. Every area in the boundary file is
+listed (with its population from the POPN property) so the map can colour empty areas.
+"""
+
+import hashlib
+import threading
+
+import orjson
+
+LEVELS = ("adm1", "adm2")
+GROUP_FIELDS = ("sector", "status", "location_type")
+
+UNSPECIFIED = "unspecified"
+
+
+def parse_group_by(value) -> tuple:
+    """'sector,status' -> ('sector', 'status'); raises ValueError for unknown fields"""
+    if not value:
+        return ()
+    fields = {field.strip() for field in value.split(",") if field.strip()}
+    unknown = fields - set(GROUP_FIELDS)
+    if unknown:
+        raise ValueError(f"group_by fields must be among: {', '.join(GROUP_FIELDS)}")
+    return tuple(field for field in GROUP_FIELDS if field in fields)
+
+
+def _empty_entry(group_by: tuple) -> dict:
+    entry = {"count": 0}
+    for field in group_by:
+        entry[field] = {}
+    return entry
+
+
+def _add(entry: dict, group_by: tuple, values: dict, count: int):
+    entry["count"] += count
+    for field in group_by:
+        key = values[field] or UNSPECIFIED
+        entry[field][key] = entry[field].get(key, 0) + count
+
+
+def render(rows, areas: dict, level: str, group_by: tuple) -> dict:
+    """
+    Aggregate GROUP BY rows (adm1_pcode, adm2_pcode, sector, status, location_type, count)
+    into one entry per area of the level. areas is BoundaryIndex.areas.
+    """
+    catalogue = {}
+    for area in areas.values():
+        if level == "adm2":
+            catalogue[area["adm2_pcode"]] = {
+                "name": area["adm2_name"],
+                "adm1_pcode": area["adm1_pcode"],
+                "population": area["population"],
+            }
+        else:
+            parish = catalogue.setdefault(area["adm1_pcode"], {"name": area["adm1_name"], "population": 0})
+            parish["population"] += area["population"] or 0
+
+    result = {pcode: dict(info, **_empty_entry(group_by)) for pcode, info in sorted(catalogue.items())}
+    unassigned = _empty_entry(group_by)
+    total = 0
+    for adm1_pcode, adm2_pcode, sector, status, location_type, count in rows:
+        values = {"sector": sector, "status": status, "location_type": location_type}
+        entry = result.get(adm2_pcode if level == "adm2" else adm1_pcode, unassigned)
+        _add(entry, group_by, values, count)
+        total += count
+
+    for entry in result.values():
+        population = entry["population"]
+        entry["per_10k"] = round(entry["count"] * 10000 / population, 2) if population else None
+
+    return {
+        "level": level,
+        "group_by": list(group_by),
+        "total": total,
+        "unassigned": unassigned,
+        "areas": result,
+    }
+
+
+class AreaStatsCache:
+    """Rendered contacts-by-area documents, kept until the contacts or boundaries change"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key = None
+        self._rows = None
+        # (level, group_by) -> (etag, body)
+        self._documents = {}
+
+        self.build_count = 0
+
+    def get(self, key, load_rows, areas: dict, level: str, group_by: tuple):
+        """
+        Get (etag, body) for a level and grouping.
+        load_rows() is only called when key differs from the cached one.
+        """
+        with self._lock:
+            if key != self._key:
+                self._rows = [tuple(row) for row in load_rows()]
+                self._documents = {}
+                self._key = key
+
+            document = self._documents.get((level, group_by))
+            if document is None:
+                body = orjson.dumps(render(self._rows, areas, level, group_by))
+                etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+                document = (etag, body)
+                self._documents[(level, group_by)] = document
+                self.build_count += 1
+
+            return document
+
+    def stats(self) -> dict:
+        """Cache statistics for monitoring"""
+        return {
+            "documents": len(self._documents),
+            "build_count": self.build_count,
+        }
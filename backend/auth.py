@@ -0,0 +1,127 @@
+"""
+Authentication context without a decode and a query per request
+Decoded JWT claims are kept in a bounded LRU keyed by token (until the token expires),
+and each user's (id, is_active, is_admin) in a short-TTL cache that user updates and
+deletions invalidate, so checking that a token's user still exists, is active and is an
+admin costs two dict lookups on the common path.
+"""
+
+from collections import OrderedDict, namedtuple
+import os
+import threading
+import time
+
+import jwt
+
+TOKEN_CACHE_SIZE = 4096
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "30"))
+USER_CACHE_SIZE = 1024
+
+# The authenticated user behind a request; id is None for the environment admin account
+AuthUser = namedtuple("AuthUser", ["username", "id", "is_active", "is_admin"])
+
+# UserCache.cached() result for a user that has to be loaded
+MISSING = object()
+
+
+class TokenCache:
+    """Bounded LRU of token -> decoded claims"""
+
+    def __init__(self, secret_key: str, algorithm: str, max_size: int = TOKEN_CACHE_SIZE):
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._claims = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def decode(self, token: str) -> dict:
+        """
+        Claims of a valid token. Raises jwt.ExpiredSignatureError or jwt.InvalidTokenError
+        like jwt.decode; only valid tokens are cached.
+        """
+        with self._lock:
+            claims = self._claims.get(token)
+            if claims is not None:
+                self._claims.move_to_end(token)
+        if claims is not None:
+            expires = claims.get("exp")
+            if expires is not None and expires <= time.time():
+                with self._lock:
+                    self._claims.pop(token, None)
+                raise jwt.ExpiredSignatureError("Signature has expired")
+            self.hits += 1
+            return claims
+
+        self.misses += 1
+        claims = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+        with self._lock:
+            self._claims[token] = claims
+            while len(self._claims) > self.max_size:
+                self._claims.popitem(last=False)
+        return claims
+
+    def stats(self) -> dict:
+        """Cache statistics for monitoring"""
+        return {"entries": len(self._claims), "hits": self.hits, "misses": self.misses}
+
+
+class UserCache:
+    """username -> AuthUser (or None for no such user), loaded on a miss and kept for ttl seconds"""
+
+    def __init__(self, load, ttl: int = USER_CACHE_TTL, max_size: int = USER_CACHE_SIZE):
+        # load(username) -> AuthUser or None
+        self.load = load
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        # username -> (AuthUser or None, expires at)
+        self._users = OrderedDict()
+        # Bumped by discard(), so a load that raced with it is not cached
+        self._generation = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    def cached(self, username: str):
+        """The cached entry for a user, or MISSING if it has to be loaded"""
+        with self._lock:
+            entry = self._users.get(username)
+            if entry is None:
+                return MISSING
+            if entry[1] <= time.monotonic():
+                del self._users[username]
+                return MISSING
+            self._users.move_to_end(username)
+        self.hits += 1
+        return entry[0]
+
+    def get(self, username: str):
+        """AuthUser for a username, or None if there is no such user (blocks on a miss)"""
+        user = self.cached(username)
+        if user is not MISSING:
+            return user
+        self.misses += 1
+        generation = self._generation
+        user = self.load(username)
+        if self.ttl:
+            with self._lock:
+                if generation != self._generation:
+                    return user
+                self._users[username] = (user, time.monotonic() + self.ttl)
+                self._users.move_to_end(username)
+                while len(self._users) > self.max_size:
+                    self._users.popitem(last=False)
+        return user
+
+    def discard(self, username: str):
+        """Forget a user so the next request reloads it (create, update, delete)"""
+        with self._lock:
+            self._users.pop(username, None)
+            self._generation += 1
+
+    def stats(self) -> dict:
+        """Cache statistics for monitoring"""
+        return {"entries": len(self._users), "ttl": self.ttl, "hits": self.hits, "misses": self.misses}
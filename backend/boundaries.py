@@ -0,0 +1,170 @@
+"""
+Point-in-polygon lookup of parish (ADM1) and community (ADM2) for a coordinate
+The communities boundary file is loaded once (WGS84 "high" level of detail from geo.py).
+Polygon bounding boxes are packed into an STR-tree, and each polygon is prepared with
+its edges bucketed into horizontal bands, so a lookup tests a handful of candidate
+polygons against a few edges each.
+"""
+
+from typing import Optional
+import json
+import threading
+
+from geo import GEOJSON_DIR, get_detail_file, source_version
+
+COMMUNITIES_FILE = GEOJSON_DIR / "jamaica-communities.geojson"
+
+NODE_CAPACITY = 16
+BANDS_PER_POLYGON = 32
+
+
+class PreparedPolygon:
+    """Polygon (with holes) ready for fast even-odd point-in-polygon tests"""
+
+    __slots__ = ("bbox", "area", "_min_y", "_band_height", "_bands")
+
+    def __init__(self, rings, area: dict):
+        self.area = area
+        xs = [x for x, _ in rings[0]]
+        ys = [y for _, y in rings[0]]
+        self.bbox = (min(xs), min(ys), max(xs), max(ys))
+        self._min_y = self.bbox[1]
+        self._band_height = (self.bbox[3] - self.bbox[1]) / BANDS_PER_POLYGON or 1.0
+        self._bands = [[] for _ in range(BANDS_PER_POLYGON)]
+
+        for ring in rings:
+            for i in range(len(ring) - 1):
+                x1, y1 = ring[i]
+                x2, y2 = ring[i + 1]
+                if y1 == y2:
+                    continue  # horizontal edges never cross a horizontal ray
+                first = self._band(min(y1, y2))
+                last = self._band(max(y1, y2))
+                edge = (x1, y1, x2, y2)
+                for band in range(first, last + 1):
+                    self._bands[band].append(edge)
+
+    def _band(self, y: float) -> int:
+        return max(0, min(BANDS_PER_POLYGON - 1, int((y - self._min_y) / self._band_height)))
+
+    def contains(self, x: float, y: float) -> bool:
+        min_x, min_y, max_x, max_y = self.bbox
+        if x < min_x or x > max_x or y < min_y or y > max_y:
+            return False
+        inside = False
+        for x1, y1, x2, y2 in self._bands[self._band(y)]:
+            if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+                inside = not inside
+        return inside
+
+
+def _union(boxes):
+    return (
+        min(box[0] for box in boxes), min(box[1] for box in boxes),
+        max(box[2] for box in boxes), max(box[3] for box in boxes),
+    )
+
+
+class STRTree:
+    """Static R-tree packed with Sort-Tile-Recursive over (bbox, item) pairs"""
+
+    def __init__(self, entries, capacity: int = NODE_CAPACITY):
+        # A node is (bbox, children, is_leaf); leaf children are items
+        nodes = self._pack([(bbox, item, True) for bbox, item in entries], capacity, True)
+        while len(nodes) > 1:
+            nodes = self._pack(nodes, capacity, False)
+        self.root = nodes[0] if nodes else None
+
+    @staticmethod
+    def _pack(nodes, capacity: int, leaf_level: bool):
+        count = len(nodes)
+        if not count:
+            return []
+        node_count = -(-count // capacity)
+        slices = max(1, round(node_count ** 0.5))
+        per_slice = -(-count // slices)
+
+        by_x = sorted(nodes, key=lambda node: node[0][0] + node[0][2])
+        packed = []
+        for start in range(0, count, per_slice):
+            column = sorted(by_x[start:start + per_slice], key=lambda node: node[0][1] + node[0][3])
+            for group_start in range(0, len(column), capacity):
+                group = column[group_start:group_start + capacity]
+                children = [node[1] for node in group] if leaf_level else group
+                packed.append((_union([node[0] for node in group]), children, leaf_level))
+        return packed
+
+    def query_point(self, x: float, y: float):
+        """Items whose bbox contains the point"""
+        if self.root is None:
+            return
+        stack = [self.root]
+        while stack:
+            (min_x, min_y, max_x, max_y), children, is_leaf = stack.pop()
+            if x < min_x or x > max_x or y < min_y or y > max_y:
+                continue
+            if is_leaf:
+                for item in children:
+                    box = item.bbox
+                    if box[0] <= x <= box[2] and box[1] <= y <= box[3]:
+                        yield item
+            else:
+                stack.extend(children)
+
+
+class BoundaryIndex:
+    """ADM1/ADM2 lookup over the communities boundary file"""
+
+    def __init__(self, source=COMMUNITIES_FILE):
+        self.source = source
+        self.version = source_version(source)
+
+        with open(get_detail_file(source, "high"), "r", encoding="utf-8") as f:
+            collection = json.load(f)
+
+        polygons = []
+        # adm2 pcode -> area dict plus population, for every community in the file
+        self.areas = {}
+        for feature in collection["features"]:
+            properties = feature.get("properties") or {}
+            area = {
+                "adm1_pcode": properties.get("ADM1_PCODE"),
+                "adm1_name": properties.get("ADM1_EN"),
+                "adm2_pcode": properties.get("ADM2_PCODE"),
+                "adm2_name": properties.get("ADM2_EN"),
+            }
+            if area["adm2_pcode"]:
+                self.areas[area["adm2_pcode"]] = dict(area, population=properties.get("POPN"))
+            geometry = feature.get("geometry") or {}
+            parts = [geometry["coordinates"]] if geometry.get("type") == "Polygon" else geometry.get("coordinates", [])
+            for rings in parts:
+                if rings and len(rings[0]) >= 4:
+                    polygons.append(PreparedPolygon(rings, area))
+
+        self.polygon_count = len(polygons)
+        self.tree = STRTree([(polygon.bbox, polygon) for polygon in polygons])
+
+    def lookup(self, lat: Optional[float], lon: Optional[float]) -> Optional[dict]:
+        """Area dict (adm1/adm2 pcode and name) containing the point, or None"""
+        if lat is None or lon is None:
+            return None
+        for polygon in self.tree.query_point(lon, lat):
+            if polygon.contains(lon, lat):
+                return polygon.area
+        return None
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_boundary_index() -> BoundaryIndex:
+    """Shared index, reloaded when the communities file changes"""
+    global _index
+    index = _index
+    if index is not None and index.version == source_version(index.source):
+        return index
+    with _index_lock:
+        if _index is None or _index.version != source_version(_index.source):
+            _index = BoundaryIndex()
+        return _index
@@ -0,0 +1,229 @@
+"""
+Hierarchical point clustering for the contacts map
+Contacts are bucketed into a Web Mercator quadtree: at zoom z a cluster is a cell of
+256 / 2^CELL_BITS pixels (level z + CELL_BITS), holding the count, centroid and
+sector/status breakdown of its contacts, and a response holds at most one cluster
+per cell in view. The index is a cache of the whole located contacts list: every
+change to the contacts table means a full re-read of that list, diffed against the
+previous read so that only added, moved, re-tagged or removed contacts are
+re-bucketed (one cell per level each).
+"""
+
+import threading
+
+from geo import mercator, inverse_mercator
+
+# Cells are 64 px at every zoom (256 px tiles split 2^2 ways)
+CELL_BITS = 2
+# Above this zoom every contact is returned on its own
+MAX_CLUSTER_ZOOM = 16
+MAX_LEVEL = MAX_CLUSTER_ZOOM + CELL_BITS
+
+UNSPECIFIED = "unspecified"
+
+
+class _Cell:
+    __slots__ = ("count", "sum_x", "sum_y", "sectors", "statuses")
+
+    def __init__(self):
+        self.count = 0
+        self.sum_x = 0.0
+        self.sum_y = 0.0
+        self.sectors = {}
+        self.statuses = {}
+
+
+def _bump(counts: dict, key: str, delta: int):
+    value = counts.get(key, 0) + delta
+    if value:
+        counts[key] = value
+    else:
+        del counts[key]
+
+
+class ClusterIndex:
+    """Contact clusters for every zoom level, refreshed from a full read when the contacts version changes"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # level -> {(cx, cy): _Cell}
+        self._levels = [{} for _ in range(MAX_LEVEL + 1)]
+        # Contact ids per finest-level cell (for single points and zooms past MAX_CLUSTER_ZOOM)
+        self._leaves = {}
+        # contact id -> (x, y, sector, status)
+        self._points = {}
+        # contact id -> (lat, lon, sector, status) as last read, to find changed rows
+        self._rows = {}
+        self.version = None
+
+        self.sync_count = 0
+        self.changes_applied = 0
+
+    # --- Updates ---
+
+    def _add(self, contact_id: int, point):
+        x, y, sector, status = point
+        scale = 1 << MAX_LEVEL
+        fx, fy = min(int(x * scale), scale - 1), min(int(y * scale), scale - 1)
+        for level in range(MAX_LEVEL, -1, -1):
+            shift = MAX_LEVEL - level
+            key = (fx >> shift, fy >> shift)
+            cell = self._levels[level].get(key)
+            if cell is None:
+                cell = self._levels[level][key] = _Cell()
+            cell.count += 1
+            cell.sum_x += x
+            cell.sum_y += y
+            _bump(cell.sectors, sector, 1)
+            _bump(cell.statuses, status, 1)
+        self._leaves.setdefault((fx, fy), set()).add(contact_id)
+        self._points[contact_id] = point
+
+    def _remove(self, contact_id: int):
+        point = self._points.pop(contact_id, None)
+        if point is None:
+            return
+        x, y, sector, status = point
+        scale = 1 << MAX_LEVEL
+        fx, fy = min(int(x * scale), scale - 1), min(int(y * scale), scale - 1)
+        for level in range(MAX_LEVEL, -1, -1):
+            shift = MAX_LEVEL - level
+            key = (fx >> shift, fy >> shift)
+            cell = self._levels[level][key]
+            cell.count -= 1
+            if not cell.count:
+                del self._levels[level][key]
+                continue
+            cell.sum_x -= x
+            cell.sum_y -= y
+            _bump(cell.sectors, sector, -1)
+            _bump(cell.statuses, status, -1)
+        leaf = self._leaves[(fx, fy)]
+        leaf.discard(contact_id)
+        if not leaf:
+            del self._leaves[(fx, fy)]
+
+    def apply(self, rows, version) -> int:
+        """
+        Bring the index in line with the current located, non-deleted contacts
+        (rows of id, lat, lon, sector, status: the full list, not just changed rows).
+        Every row is compared with the previous read, and only contacts that were added,
+        moved, re-tagged or removed are re-bucketed. Returns the number of changes applied.
+        """
+        current = {row[0]: tuple(row[1:]) for row in rows}
+
+        with self._lock:
+            changes = 0
+            for contact_id in [cid for cid in self._rows if cid not in current]:
+                self._remove(contact_id)
+                del self._rows[contact_id]
+                changes += 1
+            for contact_id, row in current.items():
+                old = self._rows.get(contact_id)
+                if old == row:
+                    continue
+                if old is not None:
+                    self._remove(contact_id)
+                lat, lon, sector, status = row
+                x, y = mercator(lon, lat)
+                self._add(contact_id, (x, y, sector or UNSPECIFIED, status or UNSPECIFIED))
+                self._rows[contact_id] = row
+                changes += 1
+
+            self.version = version
+            self.sync_count += 1
+            self.changes_applied += changes
+            return changes
+
+    # --- Queries ---
+
+    def _expansion_zoom(self, level: int, cx: int, cy: int) -> int:
+        """Lowest zoom at which this cell's contacts are split across cells"""
+        while level < MAX_LEVEL:
+            children = [
+                (cx * 2 + dx, cy * 2 + dy)
+                for dx in (0, 1) for dy in (0, 1)
+                if (cx * 2 + dx, cy * 2 + dy) in self._levels[level + 1]
+            ]
+            level += 1
+            if len(children) > 1:
+                break
+            cx, cy = children[0]
+        return min(level - CELL_BITS, MAX_CLUSTER_ZOOM + 1)
+
+    def _leaf_ids(self, level: int, cx: int, cy: int) -> list:
+        """Contact ids in a cell, found through the finest level"""
+        shift = MAX_LEVEL - level
+        if shift == 0:
+            return sorted(self._leaves.get((cx, cy), ()))
+        ids = []
+        for child in ((cx * 2 + dx, cy * 2 + dy) for dx in (0, 1) for dy in (0, 1)):
+            if child in self._levels[level + 1]:
+                ids += self._leaf_ids(level + 1, *child)
+        return ids
+
+    def _cells_in(self, level: int, min_x: float, min_y: float, max_x: float, max_y: float):
+        cells = self._levels[level]
+        scale = 1 << level
+        x0, x1 = int(min_x * scale), min(int(max_x * scale), scale - 1)
+        y0, y1 = int(min_y * scale), min(int(max_y * scale), scale - 1)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(cells):
+            return sorted(key for key in cells if x0 <= key[0] <= x1 and y0 <= key[1] <= y1)
+        return [
+            (cx, cy)
+            for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)
+            if (cx, cy) in cells
+        ]
+
+    def _point_dict(self, contact_id: int) -> dict:
+        x, y, sector, status = self._points[contact_id]
+        lon, lat = inverse_mercator(x, y)
+        return {
+            "lat": round(lat, 6),
+            "lon": round(lon, 6),
+            "count": 1,
+            "contact_id": contact_id,
+            "sectors": {sector: 1},
+            "statuses": {status: 1},
+        }
+
+    def query(self, zoom: int, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> list:
+        """Clusters (and single contacts) with a centroid inside the box at a zoom level"""
+        min_x, max_y = mercator(min_lon, min_lat)
+        max_x, min_y = mercator(max_lon, max_lat)
+
+        with self._lock:
+            if zoom > MAX_CLUSTER_ZOOM:
+                return [
+                    self._point_dict(contact_id)
+                    for key in self._cells_in(MAX_LEVEL, min_x, min_y, max_x, max_y)
+                    for contact_id in sorted(self._leaves[key])
+                ]
+
+            level = zoom + CELL_BITS
+            clusters = []
+            for cx, cy in self._cells_in(level, min_x, min_y, max_x, max_y):
+                cell = self._levels[level][(cx, cy)]
+                if cell.count == 1:
+                    clusters.append(self._point_dict(self._leaf_ids(level, cx, cy)[0]))
+                    continue
+                lon, lat = inverse_mercator(cell.sum_x / cell.count, cell.sum_y / cell.count)
+                clusters.append({
+                    "id": f"{zoom}/{cx}/{cy}",
+                    "lat": round(lat, 6),
+                    "lon": round(lon, 6),
+                    "count": cell.count,
+                    "expansion_zoom": self._expansion_zoom(level, cx, cy),
+                    "sectors": dict(cell.sectors),
+                    "statuses": dict(cell.statuses),
+                })
+            return clusters
+
+    def stats(self) -> dict:
+        """Index statistics for monitoring"""
+        return {
+            "contacts": len(self._points),
+            "version": self.version,
+            "sync_count": self.sync_count,
+            "changes_applied": self.changes_applied,
+        }
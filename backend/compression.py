@@ -0,0 +1,301 @@
+"""
+Response compression
+Static files (frontend bundle, GeoJSON) are served from .br/.gz siblings compressed once
+at build time or startup; API responses above a size threshold are compressed on the fly.
+Brotli is used when the brotli package is installed and the client accepts it.
+"""
+
+from mimetypes import guess_type
+from pathlib import Path
+from typing import Optional
+import gzip
+import os
+import threading
+import zlib
+
+from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles, NotModifiedResponse
+
+try:
+    import brotli
+except ImportError:  # optional - gzip only without it
+    brotli = None
+
+# Responses smaller than this are sent as they are
+MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+# Bodies (or streamed chunks) at least this big are compressed in the threadpool rather
+# than on the event loop; gzip 6 of a 4 MB body takes ~40 ms
+THREAD_MIN_SIZE = int(os.getenv("COMPRESSION_THREAD_MIN_SIZE", "65536"))
+
+# On-the-fly levels favour speed; precompressed files use the maximum
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+# Brotli 11 takes ~11 s on the 4 MB communities file - for build.sh only, never at
+# startup or during a request
+MAX_BROTLI_QUALITY = 11
+# Copies the app writes itself when build.sh has not: ~0.5 s for that file, ~35% larger
+LAZY_BROTLI_QUALITY = 9
+
+SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/geo+json",
+    "application/javascript",
+    "application/xml",
+    "application/rss+xml",
+    "application/atom+xml",
+    "application/feed+json",
+    "application/manifest+json",
+    "application/vnd.mapbox-vector-tile",
+    "image/svg+xml",
+)
+
+# Static file extensions worth precompressing
+PRECOMPRESS_EXTENSIONS = {".js", ".css", ".html", ".json", ".geojson", ".svg", ".txt", ".xml", ".map"}
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    if not content_type:
+        return False
+    return content_type.split(";")[0].strip().lower().startswith(COMPRESSIBLE_TYPES)
+
+
+def accepted_encodings(accept_encoding: Optional[str]) -> list:
+    """Supported encodings the client accepts, most preferred first (q-values honoured)"""
+    if not accept_encoding:
+        return []
+
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+
+    available = ["br", "gzip"] if brotli is not None else ["gzip"]
+    wildcard = weights.get("*")
+    ranked = []
+    for encoding in available:
+        q = weights.get(encoding, wildcard)
+        if q:
+            ranked.append((q, encoding))
+    # Stable sort keeps br ahead of gzip at equal weight
+    ranked.sort(key=lambda item: -item[0])
+    return [encoding for _, encoding in ranked]
+
+
+# --- Precompressed files ---
+
+def compressed_path(path: Path, encoding: str, cache_dir: Optional[Path] = None) -> Path:
+    """Sibling file holding the compressed copy (in cache_dir when given)"""
+    directory = cache_dir if cache_dir is not None else path.parent
+    return directory / (path.name + SUFFIXES[encoding])
+
+
+def _is_fresh(compressed: Path, source_stat: os.stat_result) -> bool:
+    try:
+        return compressed.stat().st_mtime_ns >= source_stat.st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+
+_precompress_lock = threading.Lock()
+
+
+def add_vary(headers: MutableHeaders):
+    """Add Vary: Accept-Encoding unless already present"""
+    vary = headers.get("vary", "")
+    if "accept-encoding" not in vary.lower():
+        headers.add_vary_header("Accept-Encoding")
+
+
+def precompress(path: Path, cache_dir: Optional[Path] = None, brotli_quality: int = MAX_BROTLI_QUALITY) -> list:
+    """Write .gz (and .br) copies of a file unless up to date. Returns the paths written."""
+    source_stat = path.stat()
+    encodings = ["gzip", "br"] if brotli is not None else ["gzip"]
+    targets = [(encoding, compressed_path(path, encoding, cache_dir)) for encoding in encodings]
+    if all(_is_fresh(target, source_stat) for _, target in targets):
+        return []
+
+    with _precompress_lock:
+        data = path.read_bytes()
+        written = []
+        for encoding, target in targets:
+            if _is_fresh(target, source_stat):
+                continue
+            if encoding == "br":
+                compressed = brotli.compress(data, quality=brotli_quality)
+            else:
+                compressed = gzip.compress(data, compresslevel=9, mtime=0)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_name(target.name + ".tmp")
+            tmp.write_bytes(compressed)
+            os.replace(tmp, target)
+            written.append(target)
+        return written
+
+
+def precompress_tree(directory: Path, brotli_quality: int = MAX_BROTLI_QUALITY) -> list:
+    """Precompress every static file under a directory"""
+    written = []
+    for path in directory.rglob("*"):
+        if path.is_file() and path.suffix.lower() in PRECOMPRESS_EXTENSIONS and path.stat().st_size >= MIN_SIZE:
+            written += precompress(path, brotli_quality=brotli_quality)
+    return written
+
+
+def file_response(request_headers, path: Path, media_type: Optional[str] = None,
+                  filename: Optional[str] = None, cache_dir: Optional[Path] = None,
+                  stat_result: Optional[os.stat_result] = None, **kwargs) -> Response:
+    """
+    FileResponse that serves a precompressed sibling when the client accepts it.
+    The sibling's own size/mtime give each encoding a distinct ETag.
+    """
+    media_type = media_type or guess_type(path.name)[0] or "text/plain"
+
+    encodings = accepted_encodings(request_headers.get("accept-encoding"))
+    source_stat = stat_result or path.stat() if encodings else None
+    for encoding in encodings:
+        compressed = compressed_path(path, encoding, cache_dir)
+        if _is_fresh(compressed, source_stat):
+            response = FileResponse(
+                compressed, media_type=media_type, filename=filename,
+                stat_result=compressed.stat(), **kwargs,
+            )
+            response.headers["Content-Encoding"] = encoding
+            add_vary(response.headers)
+            return response
+
+    response = FileResponse(path, media_type=media_type, filename=filename, stat_result=stat_result, **kwargs)
+    if is_compressible(media_type):
+        add_vary(response.headers)
+    return response
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that serves .br/.gz siblings when they exist"""
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        response = file_response(request_headers, Path(full_path), stat_result=stat_result, status_code=status_code)
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+# --- On-the-fly compression ---
+
+class _Compressor:
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # 31 = gzip container
+
+    def compress(self, data: bytes) -> bytes:
+        return self._brotli.process(data) if self._brotli else self._zlib.compress(data)
+
+    def flush(self) -> bytes:
+        """Output everything compressed so far, so a streamed chunk is sent without waiting for the next"""
+        return self._brotli.flush() if self._brotli else self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._brotli.finish() if self._brotli else self._zlib.flush()
+
+    def chunk(self, data: bytes, last: bool) -> bytes:
+        """Compressed output for one body message: finished if it is the last, flushed otherwise"""
+        return self.compress(data) + (self.finish() if last else self.flush())
+
+
+class CompressionMiddleware:
+    """
+    Brotli/gzip compression for compressible responses of at least minimum_size bytes.
+    Responses that already carry a Content-Encoding (precompressed files) pass through.
+    """
+
+    def __init__(self, app, minimum_size: int = MIN_SIZE, thread_min_size: int = THREAD_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.thread_min_size = thread_min_size
+
+    async def _compress(self, compressor: _Compressor, data: bytes, last: bool) -> bytes:
+        """Compress one body message, in the threadpool if it is big enough to stall the event loop"""
+        if len(data) >= self.thread_min_size:
+            return await run_in_threadpool(compressor.chunk, data, last)
+        return compressor.chunk(data, last)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encodings = accepted_encodings(Headers(scope=scope).get("accept-encoding"))
+        encoding = encodings[0] if encodings else None
+
+        start_message = None
+        compressor = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, compressor, passthrough
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None:
+                headers = MutableHeaders(raw=start_message["headers"])
+                eligible = (
+                    "content-encoding" not in headers
+                    and start_message["status"] not in (204, 304)
+                    and is_compressible(headers.get("content-type"))
+                    and (more_body or len(body) >= self.minimum_size)
+                )
+                if eligible:
+                    add_vary(headers)
+                if not eligible or encoding is None:
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                compressor = _Compressor(encoding)
+                headers["Content-Encoding"] = encoding
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    # The compressed body is a different representation
+                    headers["ETag"] = "W/" + etag
+
+                if not more_body:
+                    body = await self._compress(compressor, body, last=True)
+                    headers["Content-Length"] = str(len(body))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+
+                del headers["Content-Length"]
+                await send(start_message)
+
+            data = await self._compress(compressor, body, last=not more_body)
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
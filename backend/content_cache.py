@@ -0,0 +1,227 @@
+"""
+In-memory caches for file-based content (content.yaml, sector markdown pages)
+Files are re-read only when their mtime/size changes, and re-parsed only when their hash changes
+"""
+
+from pathlib import Path
+from datetime import datetime
+import hashlib
+import threading
+import time
+import os
+import re
+import yaml
+import frontmatter
+import markdown
+
+
+DEFAULT_CONTENT = {
+    "title": "IM Hub",
+    "tagline": "Information Management Dashboard",
+    "sections": []
+}
+
+
+class ContentCache:
+    """Parsed content.yaml plus pre-indexed dashboards/forms maps"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._stat_key = None
+        self._hash = None
+        self._content = DEFAULT_CONTENT
+        self._dashboards = {}
+        self._forms = {}
+
+        # Stats exposed through /api/health
+        self.reload_count = 0
+        self.last_load_seconds = None
+        self.last_loaded_at = None
+
+    def _current_stat_key(self):
+        """Cheap change check: (mtime_ns, size) or None if the file is missing"""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _refresh(self):
+        """Reload the file if its stat key changed since the last check"""
+        stat_key = self._current_stat_key()
+        if stat_key == self._stat_key:
+            return
+
+        with self._lock:
+            # Another thread may have reloaded while we waited for the lock
+            if stat_key == self._stat_key:
+                return
+
+            started = time.perf_counter()
+
+            if stat_key is None:
+                content = DEFAULT_CONTENT
+                file_hash = None
+            else:
+                try:
+                    raw = self.path.read_bytes()
+                except FileNotFoundError:
+                    raw = None
+
+                if raw is None:
+                    content = DEFAULT_CONTENT
+                    file_hash = None
+                else:
+                    file_hash = hashlib.sha256(raw).hexdigest()
+                    if file_hash == self._hash:
+                        # Touched but not changed - keep the parsed document
+                        self._stat_key = stat_key
+                        return
+                    content = yaml.safe_load(raw) or {}
+
+            self._content = content
+            self._dashboards = content.get("dashboards") or {}
+            self._forms = content.get("forms") or {}
+            self._hash = file_hash
+            self._stat_key = stat_key
+
+            self.reload_count += 1
+            self.last_load_seconds = time.perf_counter() - started
+            self.last_loaded_at = datetime.utcnow()
+
+    def get(self) -> dict:
+        """Get the parsed content document"""
+        self._refresh()
+        return self._content
+
+    def get_dashboard(self, dashboard_id: str):
+        """Get a dashboard config by id, or None"""
+        self._refresh()
+        return self._dashboards.get(dashboard_id)
+
+    def get_form(self, form_id: str):
+        """Get a form config by id, or None"""
+        self._refresh()
+        return self._forms.get(form_id)
+
+    @property
+    def content_hash(self):
+        """SHA-256 of the currently loaded file (None when using defaults)"""
+        self._refresh()
+        return self._hash
+
+    def stats(self) -> dict:
+        """Cache statistics for monitoring"""
+        return {
+            "reload_count": self.reload_count,
+            "last_load_ms": round(self.last_load_seconds * 1000, 3) if self.last_load_seconds is not None else None,
+            "last_loaded_at": self.last_loaded_at.isoformat() if self.last_loaded_at else None,
+        }
+
+
+# Markdown links: [text](url)
+LINK_PATTERN = re.compile(r'\[([^\]]+)\]\(([^\)]+)\)')
+
+
+def render_sector(sector_id: str, text: str) -> dict:
+    """Render a sector markdown file into the /api/sector response dict"""
+    post = frontmatter.loads(text)
+
+    # Convert markdown content to HTML
+    html_content = markdown.markdown(
+        post.content,
+        extensions=['extra', 'codehilite', 'nl2br']
+    )
+
+    # Extract links from the markdown content
+    links = LINK_PATTERN.findall(post.content)
+    resources = [{"name": name, "url": url} for name, url in links]
+
+    return {
+        "title": post.get("title", sector_id.replace("-", " ").title()),
+        "description": post.get("description", ""),
+        "content": html_content,
+        "resources": resources
+    }
+
+
+class SectorCache:
+    """Rendered sector pages keyed by sector id, invalidated per file by mtime/size"""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        # sector_id -> (stat_key, etag, response dict)
+        self._entries = {}
+
+        self.render_count = 0
+        self.last_render_seconds = None
+
+    def _path(self, sector_id: str) -> Path:
+        return self.directory / f"{sector_id}.md"
+
+    def _stat_key(self, path: Path):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _render(self, sector_id: str, path: Path, stat_key):
+        started = time.perf_counter()
+        raw = path.read_bytes()
+        etag = '"' + hashlib.sha256(raw).hexdigest()[:32] + '"'
+
+        cached = self._entries.get(sector_id)
+        if cached and cached[1] == etag:
+            # Touched but not changed - keep the rendered page
+            entry = (stat_key, etag, cached[2])
+        else:
+            entry = (stat_key, etag, render_sector(sector_id, raw.decode('utf-8')))
+            self.render_count += 1
+            self.last_render_seconds = time.perf_counter() - started
+
+        self._entries[sector_id] = entry
+        return entry
+
+    def preload(self):
+        """Render every sector file in the directory (called at startup)"""
+        if not self.directory.exists():
+            return
+        for path in sorted(self.directory.glob("*.md")):
+            if path.name == "README.md":
+                continue
+            try:
+                self.get(path.stem)
+            except Exception as e:
+                print(f"Error rendering sector {path.name}: {e}")
+
+    def get(self, sector_id: str):
+        """
+        Get (etag, response dict) for a sector, or None if the file does not exist.
+        Re-renders the page only when its file has changed.
+        """
+        path = self._path(sector_id)
+        stat_key = self._stat_key(path)
+
+        if stat_key is None:
+            self._entries.pop(sector_id, None)
+            return None
+
+        entry = self._entries.get(sector_id)
+        if entry is None or entry[0] != stat_key:
+            with self._lock:
+                entry = self._entries.get(sector_id)
+                if entry is None or entry[0] != stat_key:
+                    entry = self._render(sector_id, path, stat_key)
+
+        return entry[1], entry[2]
+
+    def stats(self) -> dict:
+        """Cache statistics for monitoring"""
+        return {
+            "entries": len(self._entries),
+            "render_count": self.render_count,
+            "last_render_ms": round(self.last_render_seconds * 1000, 3) if self.last_render_seconds is not None else None,
+        }
@@ -3,16 +3,28 @@ Database models and configuration for IM Hub
 Using SQLAlchemy ORM with SQLite
 """
 
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Boolean
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy import (
+    create_engine, event, select, Column, Integer, String, Text, DateTime, Boolean, Float, Index, text,
+    Table, MetaData,
+)
+from sqlalchemy.orm import sessionmaker, declarative_base, validates
+from sqlalchemy import inspect as sa_inspect
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 import bcrypt
 import os
 
+from geo import haversine_km, parse_coordinate
+from boundaries import get_boundary_index
+from announcement_text import summary_html, plain_excerpt, normalize_tags
+
 # Database file location
 # Use persistent disk on Render, local file in development
-if os.getenv('RENDER'):
+if os.getenv('DATABASE_PATH'):
+    # Explicit override (e.g. benchmarks or a scratch database)
+    DB_PATH = Path(os.getenv('DATABASE_PATH'))
+elif os.getenv('RENDER'):
     # Production on Render: use persistent disk
     DB_PATH = Path('/var/data/imhub.db')
 else:
@@ -21,18 +33,95 @@ else:
 
 DATABASE_URL = f"sqlite:///{DB_PATH}"
 
+# Worker threads serving sync endpoints (AnyIO's default is 40). main.py applies
+# this to the threadpool and the connection pool keeps as many connections open.
+# A request holds its connection until its session is closed, and a sync endpoint's
+# session is closed only after the response is sent, across the threadpool hops for
+# response-model validation and dependency teardown. Requests waiting for one of those
+# hops can therefore hold more connections than there are threads. With a hard cap,
+# every thread could end up waiting for a connection that is held by a request
+# waiting for a thread. So the pool overflows without limit by default; overflow
+# connections are closed when they are returned, and SQLite connections are cheap.
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "40"))
+
+# SQLite engine profile - every value can be overridden from the environment
+SQLITE_PRAGMAS = {
+    # WAL lets readers run concurrently with a writer instead of blocking on it
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    # NORMAL is durable in WAL mode except for power loss before a checkpoint
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    # Wait for locks instead of failing with "database is locked"
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    # Negative values are KiB: 8 MB page cache per connection
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", "-8000")),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+}
+
 # Create engine
 engine = create_engine(
     DATABASE_URL,
-    connect_args={"check_same_thread": False}  # Needed for SQLite
+    connect_args={"check_same_thread": False},  # Needed for SQLite
+    pool_size=int(os.getenv("DB_POOL_SIZE", str(THREADPOOL_SIZE))),
+    # -1: no limit (see THREADPOOL_SIZE)
+    max_overflow=int(os.getenv("DB_POOL_MAX_OVERFLOW", "-1")),
+    pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "30")),
 )
 
+
+@event.listens_for(engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply the engine profile and SQL functions to every new SQLite connection"""
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name} = {value}")
+    cursor.close()
+    # SQLite's own math functions are a compile-time option - don't rely on them
+    dbapi_connection.create_function("haversine_km", 4, haversine_km, deterministic=True)
+
+
+def engine_settings() -> dict:
+    """Effective SQLite settings as reported by a live connection"""
+    with engine.connect() as conn:
+        settings = {
+            name: conn.execute(text(f"PRAGMA {name}")).scalar()
+            for name in SQLITE_PRAGMAS
+        }
+    settings["pool_size"] = engine.pool.size()
+    settings["max_overflow"] = engine.pool._max_overflow
+    return settings
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Optional async mode: public read endpoints run on the event loop through
+# aiosqlite instead of occupying a threadpool worker for the whole request
+ASYNC_DB = os.getenv("DB_ASYNC", "false").lower() in ("1", "true", "yes")
+
+async_engine = None
+AsyncSessionLocal = None
+if ASYNC_DB:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{DB_PATH}",
+        pool_size=int(os.getenv("DB_POOL_SIZE", str(THREADPOOL_SIZE))),
+        # -1: no limit (see THREADPOOL_SIZE)
+    max_overflow=int(os.getenv("DB_POOL_MAX_OVERFLOW", "-1")),
+        pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "30")),
+    )
+    event.listen(async_engine.sync_engine, "connect", set_sqlite_pragmas)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Base class for models
 Base = declarative_base()
 
+# Partial index predicates for the public (non-deleted, approved) views.
+# These must match the SQL SQLAlchemy renders for `col == False` / `col == True`
+# on SQLite so the query planner can use the partial indexes.
+NOT_DELETED = text("deleted = 0")
+PUBLIC_ROWS = text("deleted = 0 AND approved = 1")
+
 
 # Models
 class WhatsAppGroup(Base):
@@ -51,6 +140,15 @@ class WhatsAppGroup(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # Public list: deleted = 0 AND approved = 1 ORDER BY sector, name
+        Index("ix_whatsapp_groups_public_sector_name", "sector", "name", "id", sqlite_where=PUBLIC_ROWS),
+        # Admin list (all rows) ORDER BY sector, name
+        Index("ix_whatsapp_groups_sector_name", "sector", "name", "id"),
+        # Deleted list: deleted = 1 ORDER BY updated_at DESC
+        Index("ix_whatsapp_groups_deleted_updated", "updated_at", sqlite_where=text("deleted = 1")),
+    )
+    
     def to_dict(self):
         """Convert to dictionary for API responses"""
         return {
@@ -84,6 +182,13 @@ class Resource(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # approved = ? [AND sector/category = ?] ORDER BY created_at DESC
+        Index("ix_resources_approved_created", "approved", "created_at", "id"),
+        Index("ix_resources_approved_sector_created", "approved", "sector", "created_at", "id"),
+        Index("ix_resources_created", "created_at", "id"),
+    )
+    
     def to_dict(self):
         """Convert to dictionary for API responses"""
         return {
@@ -118,6 +223,12 @@ class ContactSubmission(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # approved = ? ORDER BY created_at DESC
+        Index("ix_contact_submissions_approved_created", "approved", "created_at", "id"),
+        Index("ix_contact_submissions_created", "created_at", "id"),
+    )
+    
     def to_dict(self):
         """Convert to dictionary for API responses"""
         return {
@@ -153,6 +264,12 @@ class Contact(Base):
     community = Column(String(200))  # Administrative level 2 or locality
     latitude = Column(String(50))  # Store as string to preserve precision
     longitude = Column(String(50))
+    # Numeric copies of latitude/longitude (NULL when missing or invalid), indexed by contacts_rtree
+    lat = Column(Float)
+    lon = Column(Float)
+    # Parish/community pcodes resolved from lat/lon against the boundary files
+    adm1_pcode = Column(String(20))
+    adm2_pcode = Column(String(20))
     
     # Deployment status
     location_type = Column(String(50), default="field")  # "field", "remote", "office", "mobile"
@@ -165,6 +282,32 @@ class Contact(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # Public list: deleted = 0 [AND <filter> = ?] ORDER BY organization, name
+        Index("ix_contacts_live_org_name", "organization", "name", "id", sqlite_where=NOT_DELETED),
+        Index("ix_contacts_live_sector_org_name", "sector", "organization", "name", "id", sqlite_where=NOT_DELETED),
+        Index("ix_contacts_live_parish_org_name", "parish", "organization", "name", "id", sqlite_where=NOT_DELETED),
+        Index("ix_contacts_live_status_org_name", "status", "organization", "name", "id", sqlite_where=NOT_DELETED),
+        Index("ix_contacts_live_location_type_org_name", "location_type", "organization", "name", "id", sqlite_where=NOT_DELETED),
+        # Contacts-by-area stats: GROUP BY these columns without a temp B-tree
+        Index(
+            "ix_contacts_live_area", "adm1_pcode", "adm2_pcode", "sector", "status", "location_type",
+            sqlite_where=NOT_DELETED,
+        ),
+        # Admin list including deleted rows
+        Index("ix_contacts_org_name", "organization", "name", "id"),
+    )
+    
+    @validates("latitude")
+    def _sync_lat(self, key, value):
+        self.lat = parse_coordinate(value, 90)
+        return value
+    
+    @validates("longitude")
+    def _sync_lon(self, key, value):
+        self.lon = parse_coordinate(value, 180)
+        return value
+    
     def to_dict(self):
         """Convert to dictionary for API responses"""
         return {
@@ -179,6 +322,8 @@ class Contact(Base):
             "community": self.community,
             "latitude": self.latitude,
             "longitude": self.longitude,
+            "adm1_pcode": self.adm1_pcode,
+            "adm2_pcode": self.adm2_pcode,
             "location_type": self.location_type,
             "status": self.status,
             "notes": self.notes,
@@ -189,6 +334,35 @@ class Contact(Base):
         }
 
 
+def assign_contact_area(contact, area: Optional[dict] = None):
+    """
+    Set a contact's adm1/adm2 pcodes from its coordinates, and fill a blank
+    parish/community with the resolved names (text someone entered is kept).
+    """
+    if area is None and contact.lat is not None and contact.lon is not None:
+        area = get_boundary_index().lookup(contact.lat, contact.lon)
+    contact.adm1_pcode = area["adm1_pcode"] if area else None
+    contact.adm2_pcode = area["adm2_pcode"] if area else None
+    if area:
+        if not (contact.parish or "").strip():
+            contact.parish = area["adm1_name"]
+        if not (contact.community or "").strip():
+            contact.community = area["adm2_name"]
+
+
+@event.listens_for(Contact, "before_insert")
+@event.listens_for(Contact, "before_update")
+def _assign_contact_area(mapper, connection, contact):
+    state = sa_inspect(contact)
+    if state.persistent and not (state.attrs.lat.history.has_changes() or state.attrs.lon.history.has_changes()):
+        return
+    try:
+        assign_contact_area(contact)
+    except Exception as e:
+        # A missing or broken boundary file must not block saving contacts
+        print(f"Could not resolve area for contact {contact.id}: {e}")
+
+
 class User(Base):
     """User accounts for authentication"""
     __tablename__ = "users"
@@ -236,23 +410,44 @@ class Announcement(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
     content = Column(Text, nullable=False)  # HTML or markdown content
+    summary = Column(Text)  # First paragraph of content (HTML), set with content
+    excerpt = Column(String(200))  # Plain-text start of content, set with content
     date = Column(DateTime, nullable=False, default=datetime.utcnow)
     priority = Column(String(20), default="normal")  # "high", "medium", "normal", "low"
     author = Column(String(200))
-    tags = Column(Text)  # Comma-separated tags
+    tags = Column(Text)  # Comma-separated tags, normalized on assignment
     approved = Column(Boolean, default=True)  # Auto-approved for admins
     deleted = Column(Boolean, default=False)  # Soft delete
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # Public list and RSS feed: deleted = 0 AND approved = 1 ORDER BY date DESC
+        Index("ix_announcements_public_date", "date", "id", sqlite_where=PUBLIC_ROWS),
+        # Admin list including deleted rows ORDER BY date DESC
+        Index("ix_announcements_date", "date", "id"),
+    )
+    
+    @validates("content")
+    def _sync_summary(self, key, value):
+        self.summary = summary_html(value)
+        self.excerpt = plain_excerpt(value)
+        return value
+    
+    @validates("tags")
+    def _normalize_tags(self, key, value):
+        return normalize_tags(value)
+    
     def to_dict(self):
         """Convert to dictionary for API responses"""
-        tags_list = [tag.strip() for tag in self.tags.split(',')] if self.tags else []
+        tags_list = self.tags.split(',') if self.tags else []
         
         return {
             "id": self.id,
             "title": self.title,
             "content": self.content,
+            "summary": self.summary,
+            "excerpt": self.excerpt,
             "date": self.date.isoformat() if self.date else None,
             "priority": self.priority,
             "author": self.author,
@@ -278,6 +473,12 @@ class Link(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # Public list: deleted = 0 ORDER BY created_at DESC
+        Index("ix_links_live_created", "created_at", "id", sqlite_where=NOT_DELETED),
+        Index("ix_links_created", "created_at", "id"),
+    )
+    
     def to_dict(self):
         """Convert to dictionary for API responses"""
         return {
@@ -293,11 +494,241 @@ class Link(Base):
         }
 
 
+class LinkClick(Base):
+    """Short-link clicks per link, UTC hour, referring host and user-agent family (written in batches)"""
+    __tablename__ = "link_clicks"
+    
+    link_id = Column(Integer, primary_key=True)
+    hour = Column(DateTime, primary_key=True)  # Start of the UTC hour
+    referrer = Column(String(100), primary_key=True, default="")  # Referring host, '' for direct
+    agent = Column(String(50), primary_key=True, default="")  # User-agent family, '' if none sent
+    clicks = Column(Integer, nullable=False, default=0)
+
+
+class TableVersion(Base):
+    """Per-table change counters, bumped by triggers on every write (used for ETags)"""
+    __tablename__ = "table_versions"
+    
+    table_name = Column(String(100), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime)  # UTC time of the last write, set by the same triggers
+
+
+# SQLite R*Tree over contacts.lat/lon, maintained by triggers (see ensure_spatial_index).
+# Declared on its own MetaData so create_all() leaves it alone.
+contacts_rtree = Table(
+    "contacts_rtree", MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("min_lat", Float), Column("max_lat", Float),
+    Column("min_lon", Float), Column("max_lon", Float),
+)
+
+
+# Tables whose list endpoints are served with version-based ETags
+VERSIONED_TABLES = [
+    "whatsapp_groups",
+    "resources",
+    "contact_submissions",
+    "contacts",
+    "users",
+    "announcements",
+    "links",
+]
+
+
 # Database initialization
 def init_db():
     """Create all tables in the database"""
     Base.metadata.create_all(bind=engine)
+    ensure_columns()
+    ensure_indexes()
+    ensure_version_triggers()
+    ensure_contact_coordinates()
+    ensure_announcement_text()
+    ensure_spatial_index()
     print(f"Database initialized at {DB_PATH}")
+    settings = ", ".join(f"{name}={value}" for name, value in engine_settings().items())
+    print(f"SQLite engine settings: {settings}")
+
+
+def ensure_indexes():
+    """
+    Create any model indexes missing from an existing database.
+    create_all() skips tables that already exist (and their indexes), so databases
+    created before an index was declared need this step. Safe to run on every startup.
+    """
+    created = []
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                exists = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = :name"),
+                    {"name": index.name}
+                ).first()
+                if not exists:
+                    index.create(bind=conn)
+                    created.append(index.name)
+    if created:
+        print(f"Created {len(created)} missing indexes: {', '.join(created)}")
+
+
+def ensure_version_triggers():
+    """
+    Create the table_versions rows and the INSERT/UPDATE/DELETE triggers that bump them
+    and stamp the write time. Triggers catch every write (API, scripts, sqlite3 shell)
+    and are shared by all worker processes. Triggers from before the write time was
+    stamped are replaced. Safe to run on every startup.
+    """
+    with engine.begin() as conn:
+        for table_name in VERSIONED_TABLES:
+            conn.execute(
+                text("INSERT OR IGNORE INTO table_versions (table_name, version) VALUES (:name, 0)"),
+                {"name": table_name}
+            )
+            for operation in ("INSERT", "UPDATE", "DELETE"):
+                trigger = f"trg_{table_name}_{operation.lower()}_version"
+                sql = (
+                    f"CREATE TRIGGER {trigger} "
+                    f"AFTER {operation} ON {table_name} BEGIN "
+                    f"UPDATE table_versions SET version = version + 1, "
+                    f"updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now') WHERE table_name = '{table_name}'; "
+                    f"END"
+                )
+                existing = conn.execute(
+                    text("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = :name"),
+                    {"name": trigger}
+                ).scalar()
+                if existing != sql:
+                    conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+                    conn.execute(text(sql))
+
+
+def ensure_columns():
+    """
+    Add model columns missing from existing tables (nullable, no default).
+    create_all() never alters a table that already exists. Safe to run on every startup.
+    """
+    added = []
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {row[1] for row in conn.execute(text(f"PRAGMA table_info({table.name})"))}
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+                    added.append(f"{table.name}.{column.name}")
+    if added:
+        print(f"Added {len(added)} missing columns: {', '.join(added)}")
+
+
+def ensure_contact_coordinates():
+    """
+    Backfill the numeric contacts.lat/lon columns from the latitude/longitude strings.
+    Only rows with a coordinate string and no numeric value are parsed, so this is
+    cheap on every startup. Returns (filled, invalid) row counts.
+    """
+    with engine.begin() as conn:
+        rows = conn.execute(text(
+            "SELECT id, latitude, longitude, lat, lon FROM contacts "
+            "WHERE (lat IS NULL AND trim(coalesce(latitude, '')) <> '') "
+            "OR (lon IS NULL AND trim(coalesce(longitude, '')) <> '')"
+        )).all()
+
+        updates = []
+        invalid = 0
+        for contact_id, latitude, longitude, old_lat, old_lon in rows:
+            lat, lon = parse_coordinate(latitude, 90), parse_coordinate(longitude, 180)
+            if lat is None or lon is None:
+                invalid += 1
+            if (lat, lon) != (old_lat, old_lon):
+                updates.append({"id": contact_id, "lat": lat, "lon": lon})
+        if updates:
+            conn.execute(text("UPDATE contacts SET lat = :lat, lon = :lon WHERE id = :id"), updates)
+            print(f"Backfilled coordinates for {len(updates)} contacts")
+
+    return len(updates), invalid
+
+
+def ensure_announcement_text():
+    """
+    Backfill announcements.summary/excerpt (and normalize tags) for rows written before
+    those columns existed. Only rows without a summary are read, so this is cheap on
+    every startup. Returns the number of rows updated.
+    """
+    with engine.begin() as conn:
+        rows = conn.execute(text(
+            "SELECT id, content, tags FROM announcements WHERE summary IS NULL OR excerpt IS NULL"
+        )).all()
+        updates = [
+            {"id": announcement_id, "summary": summary_html(content),
+             "excerpt": plain_excerpt(content), "tags": normalize_tags(tags)}
+            for announcement_id, content, tags in rows
+        ]
+        if updates:
+            conn.execute(text(
+                "UPDATE announcements SET summary = :summary, excerpt = :excerpt, tags = :tags WHERE id = :id"
+            ), updates)
+            print(f"Backfilled summaries for {len(updates)} announcements")
+
+    return len(updates)
+
+
+def ensure_spatial_index():
+    """
+    Create the contacts_rtree R*Tree and the triggers that keep it in sync with
+    contacts.lat/lon, then index any located contact missing from it. Every contact
+    with both coordinates has one (point) entry; deleted rows are filtered at query time.
+    """
+    located = "NEW.lat IS NOT NULL AND NEW.lon IS NOT NULL"
+    insert_entry = (
+        "INSERT OR REPLACE INTO contacts_rtree (id, min_lat, max_lat, min_lon, max_lon) "
+        "VALUES (NEW.id, NEW.lat, NEW.lat, NEW.lon, NEW.lon);"
+    )
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS contacts_rtree "
+            "USING rtree(id, min_lat, max_lat, min_lon, max_lon)"
+        ))
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS trg_contacts_rtree_insert AFTER INSERT ON contacts "
+            f"WHEN {located} BEGIN {insert_entry} END"
+        ))
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS trg_contacts_rtree_update AFTER UPDATE OF lat, lon ON contacts BEGIN "
+            f"DELETE FROM contacts_rtree WHERE id = OLD.id; "
+            f"INSERT INTO contacts_rtree (id, min_lat, max_lat, min_lon, max_lon) "
+            f"SELECT NEW.id, NEW.lat, NEW.lat, NEW.lon, NEW.lon WHERE {located}; "
+            f"END"
+        ))
+        conn.execute(text(
+            "CREATE TRIGGER IF NOT EXISTS trg_contacts_rtree_delete AFTER DELETE ON contacts BEGIN "
+            "DELETE FROM contacts_rtree WHERE id = OLD.id; "
+            "END"
+        ))
+        conn.execute(text(
+            "INSERT INTO contacts_rtree (id, min_lat, max_lat, min_lon, max_lon) "
+            "SELECT id, lat, lat, lon, lon FROM contacts "
+            "WHERE lat IS NOT NULL AND lon IS NOT NULL AND id NOT IN (SELECT id FROM contacts_rtree)"
+        ))
+
+
+def table_versions_statement(*table_names):
+    """select() of (table_name, version) for the given tables"""
+    return select(TableVersion.table_name, TableVersion.version).where(
+        TableVersion.table_name.in_(table_names)
+    )
+
+
+def get_table_versions(db, *table_names) -> dict:
+    """Current change counters for the given tables, e.g. {"contacts": 42}"""
+    return dict(db.execute(table_versions_statement(*table_names)).all())
+
+
+def get_table_version(db, table_name: str):
+    """(version, updated_at) of one table; updated_at is None until its first write"""
+    return db.execute(
+        select(TableVersion.version, TableVersion.updated_at).where(TableVersion.table_name == table_name)
+    ).one()
 
 
 # Dependency for getting DB session
@@ -310,6 +741,16 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """Dependency to get an async database session (requires DB_ASYNC)"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Read endpoints use the async session when DB_ASYNC is enabled
+get_read_db = get_async_db if ASYNC_DB else get_db
+
+
 # Seed some initial data for testing
 def seed_initial_data():
     """Add some initial WhatsApp groups, default admin user, and announcements for testing"""
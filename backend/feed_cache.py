@@ -0,0 +1,141 @@
+"""
+Cached MapAction Atom feed
+Serves the last parsed copy while it is fresh, serves it stale while a single
+background refresh runs, and keeps serving the last good copy if upstream fails.
+"""
+
+from starlette.concurrency import run_in_threadpool
+import asyncio
+import time
+import feedparser
+import httpx
+
+
+def parse_mapaction_feed(text: str) -> dict:
+    """Parse the MapAction Atom feed into the /api/mapaction-feed response dict"""
+    feed = feedparser.parse(text)
+
+    # Extract relevant information from feed entries
+    maps = []
+    for entry in feed.entries[:20]:  # Limit to 20 most recent entries
+        map_data = {
+            "title": entry.get("title", ""),
+            "summary": entry.get("summary", ""),
+            "link": entry.get("link", ""),
+            "updated": entry.get("updated", ""),
+            "published": entry.get("published", ""),
+            "id": entry.get("id", ""),
+        }
+
+        # Extract georss box if available
+        if hasattr(entry, 'georss_box'):
+            map_data["georss_box"] = entry.georss_box
+
+        # Extract enclosure link (package download)
+        if hasattr(entry, 'links'):
+            for link in entry.links:
+                if link.get('rel') == 'enclosure':
+                    map_data["package_url"] = link.get('href', '')
+                    map_data["package_type"] = link.get('type', '')
+                    break
+
+        maps.append(map_data)
+
+    return {
+        "feed_title": feed.feed.get("title", "MapAction Maps"),
+        "feed_updated": feed.feed.get("updated", ""),
+        "maps": maps
+    }
+
+
+class FeedCache:
+    """Stale-while-revalidate cache for a remote feed with single-flight refreshes"""
+
+    def __init__(self, url: str, ttl: float = 600.0, timeout: float = 30.0, retry_after: float = 30.0):
+        self.url = url
+        self.ttl = ttl
+        self.timeout = timeout
+        # After a failed refresh, wait this long before retrying while stale data is served
+        self.retry_after = retry_after
+
+        self._client = None
+        self._data = None
+        self._fetched_at = 0.0
+        self._failed_at = None
+        self._refresh_task = None
+
+        self.fetch_count = 0
+        self.error_count = 0
+        self.last_error = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Shared pooled client (created on first use)"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=4, max_keepalive_connections=2),
+            )
+        return self._client
+
+    async def close(self):
+        """Close the shared client (called on shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _refresh(self):
+        try:
+            response = await self._get_client().get(self.url)
+            response.raise_for_status()
+            # feedparser is pure Python and slow on large feeds - keep it off the event loop
+            data = await run_in_threadpool(parse_mapaction_feed, response.text)
+        except Exception as e:
+            self.error_count += 1
+            self.last_error = str(e)
+            self._failed_at = time.monotonic()
+            raise
+
+        self._data = data
+        self._fetched_at = time.monotonic()
+        self._failed_at = None
+        self.fetch_count += 1
+        return data
+
+    def _start_refresh(self) -> asyncio.Task:
+        """Start a refresh unless one is already running (single flight)"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh())
+            # Background refreshes may fail with nobody awaiting them
+            self._refresh_task.add_done_callback(lambda task: task.cancelled() or task.exception())
+        return self._refresh_task
+
+    def is_fresh(self) -> bool:
+        return self._data is not None and time.monotonic() - self._fetched_at < self.ttl
+
+    async def get(self) -> dict:
+        """
+        Get the parsed feed. Raises the upstream/parse error only when there is
+        no previously fetched copy to fall back to.
+        """
+        if self.is_fresh():
+            return self._data
+
+        if self._data is not None:
+            # Stale: serve the last good copy and revalidate in the background
+            recently_failed = self._failed_at is not None and time.monotonic() - self._failed_at < self.retry_after
+            if not recently_failed:
+                self._start_refresh()
+            return self._data
+
+        # Nothing cached yet - every concurrent caller waits on the same fetch
+        return await asyncio.shield(self._start_refresh())
+
+    def stats(self) -> dict:
+        """Cache statistics for monitoring"""
+        return {
+            "cached": self._data is not None,
+            "age_seconds": round(time.monotonic() - self._fetched_at, 1) if self._data is not None else None,
+            "fetch_count": self.fetch_count,
+            "error_count": self.error_count,
+            "last_error": self.last_error,
+        }
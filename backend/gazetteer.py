@@ -0,0 +1,232 @@
+"""
+Offline geocoder for Jamaican community, development area and parish names
+Built from jamaica-communities.geojson (ADM2_EN, Dev_Area, ADM1_EN): each place gets a
+point inside its polygon(s), and names are matched exactly through a normalized-name
+index or fuzzily by trigram similarity, optionally narrowed by a parish name.
+"""
+
+from functools import lru_cache
+from typing import Optional
+import json
+import re
+import threading
+
+from geo import get_detail_file, source_version
+from boundaries import COMMUNITIES_FILE, PreparedPolygon
+
+# Results scoring below this are not returned
+MIN_SCORE = 0.45
+# Imports only fill coordinates from a match at least this close
+AUTO_FILL_SCORE = 0.8
+MAX_RESULTS = 20
+
+# Equal scores rank the most precise place first
+KIND_ORDER = {"community": 0, "dev_area": 1, "parish": 2}
+
+_ABBREVIATIONS = ((r"\bsaint\b", "st"), (r"\bmount\b", "mt"))
+
+
+def normalize_name(value) -> str:
+    """'St. Andrew', 'ST ANDREW' and 'Saint Andrew' all normalize to 'standrew'"""
+    value = (value or "").lower()
+    for pattern, replacement in _ABBREVIATIONS:
+        value = re.sub(pattern, replacement, value)
+    return re.sub(r"[^a-z0-9]", "", value)
+
+
+def _trigrams(normalized: str) -> set:
+    padded = f"$${normalized}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _ring_centroid(ring):
+    """(area, cx, cy) of a closed ring by the shoelace formula"""
+    area = cx = cy = 0.0
+    for (x1, y1), (x2, y2) in zip(ring, ring[1:]):
+        cross = x1 * y2 - x2 * y1
+        area += cross
+        cx += (x1 + x2) * cross
+        cy += (y1 + y2) * cross
+    if not area:
+        return 0.0, ring[0][0], ring[0][1]
+    return abs(area) / 2, cx / (3 * area), cy / (3 * area)
+
+
+def _interior_point(rings, x: float, y: float):
+    """Midpoint of the widest inside span of the polygon along the horizontal line through y"""
+    crossings = []
+    for ring in rings:
+        for (x1, y1), (x2, y2) in zip(ring, ring[1:]):
+            if (y1 > y) != (y2 > y):
+                crossings.append(x1 + (y - y1) * (x2 - x1) / (y2 - y1))
+    crossings.sort()
+    spans = [(crossings[i + 1] - crossings[i], crossings[i]) for i in range(0, len(crossings) - 1, 2)]
+    if not spans:
+        return rings[0][0][0], rings[0][0][1]
+    width, start = max(spans)
+    return start + width / 2, y
+
+
+class _Part:
+    """One polygon of a place, with its area and a point inside it"""
+
+    __slots__ = ("polygon", "area", "x", "y")
+
+    def __init__(self, rings):
+        self.polygon = PreparedPolygon(rings, None)
+        self.area, x, y = _ring_centroid(rings[0])
+        if not self.polygon.contains(x, y):
+            x, y = _interior_point(rings, x, y)
+        self.x, self.y = x, y
+
+
+def _place_point(parts):
+    """Area-weighted centroid of the parts if it falls inside one, else the largest part's point"""
+    total = sum(part.area for part in parts)
+    if total:
+        x = sum(part.x * part.area for part in parts) / total
+        y = sum(part.y * part.area for part in parts) / total
+        if any(part.polygon.contains(x, y) for part in parts):
+            return x, y
+    largest = max(parts, key=lambda part: part.area)
+    return largest.x, largest.y
+
+
+class Gazetteer:
+    """Name lookup over the communities boundary file"""
+
+    def __init__(self, source=COMMUNITIES_FILE):
+        self.source = source
+        self.version = source_version(source)
+
+        with open(get_detail_file(source, "high"), "r", encoding="utf-8") as f:
+            collection = json.load(f)
+
+        # (kind, name, adm1_name) -> place fields and its polygon parts
+        groups = {}
+        for feature in collection["features"]:
+            properties = feature.get("properties") or {}
+            geometry = feature.get("geometry") or {}
+            polygons = [geometry["coordinates"]] if geometry.get("type") == "Polygon" else geometry.get("coordinates", [])
+            parts = [_Part(rings) for rings in polygons if rings and len(rings[0]) >= 4]
+            if not parts:
+                continue
+
+            adm1_name = properties.get("ADM1_EN")
+            adm1_pcode = properties.get("ADM1_PCODE")
+            places = [
+                ("community", properties.get("ADM2_EN"), properties.get("ADM2_PCODE")),
+                ("dev_area", properties.get("Dev_Area"), None),
+                ("parish", adm1_name, None),
+            ]
+            for kind, name, adm2_pcode in places:
+                if not name:
+                    continue
+                key = (kind, name, adm1_name) if kind != "community" else (kind, name, adm2_pcode)
+                group = groups.setdefault(key, {
+                    "name": name,
+                    "kind": kind,
+                    "parish": adm1_name,
+                    "adm1_pcode": adm1_pcode,
+                    "adm2_pcode": adm2_pcode,
+                    "parts": [],
+                })
+                group["parts"] += parts
+
+        self.places = []
+        self._exact = {}
+        self._postings = {}
+        for group in groups.values():
+            lon, lat = _place_point(group.pop("parts"))
+            place = dict(group, lat=round(lat, 6), lon=round(lon, 6))
+            normalized = normalize_name(place["name"])
+            grams = _trigrams(normalized)
+            index = len(self.places)
+            self.places.append((place, normalized, len(grams)))
+            self._exact.setdefault(normalized, []).append(index)
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(index)
+
+        self._parishes = {
+            normalize_name(place["name"]): place["name"]
+            for place, _, _ in self.places if place["kind"] == "parish"
+        }
+        self.geocode = lru_cache(maxsize=4096)(self._geocode)
+
+    def parish_name(self, value) -> Optional[str]:
+        """Canonical parish name for free text ('ST.ANDREW' -> 'St. Andrew'), or None"""
+        return self._parishes.get(normalize_name(value))
+
+    def _geocode(self, query: str, parish: Optional[str] = None, limit: int = 5) -> tuple:
+        """
+        Places matching a name, best first, as dicts with a score in (0, 1].
+        'Half Way Tree, St Andrew' reads the last part as the parish when it names one.
+        """
+        if parish is None and "," in query:
+            head, _, tail = query.rpartition(",")
+            if self.parish_name(tail):
+                query, parish = head, tail
+        normalized = normalize_name(query)
+        if not normalized:
+            return ()
+        parish_name = self.parish_name(parish) if parish else None
+
+        scores = {index: 1.0 for index in self._exact.get(normalized, ())}
+        grams = _trigrams(normalized)
+        shared = {}
+        for gram in grams:
+            for index in self._postings.get(gram, ()):
+                shared[index] = shared.get(index, 0) + 1
+        for index, count in shared.items():
+            if index not in scores:
+                # Dice coefficient of the two trigram sets
+                score = 2 * count / (len(grams) + self.places[index][2])
+                if score >= MIN_SCORE:
+                    scores[index] = score
+
+        matches = [(score, self.places[index][0]) for index, score in scores.items()]
+        if parish_name:
+            in_parish = [match for match in matches if match[1]["parish"] == parish_name]
+            matches = in_parish or matches
+        matches.sort(key=lambda match: (-match[0], KIND_ORDER[match[1]["kind"]], match[1]["name"]))
+        return tuple(dict(place, score=round(score, 3)) for score, place in matches[:limit])
+
+    def best_match(self, community: Optional[str], parish: Optional[str] = None,
+                   min_score: float = AUTO_FILL_SCORE) -> Optional[dict]:
+        """
+        Closest place for a community name if close enough and unambiguous - a name
+        shared by places in different parishes needs the parish to pick one.
+        """
+        if not community:
+            return None
+        results = self.geocode(community, parish, 2)
+        if not results or results[0]["score"] < min_score:
+            return None
+        if len(results) > 1 and results[1]["score"] == results[0]["score"] and results[1]["parish"] != results[0]["parish"]:
+            return None
+        return results[0]
+
+    def stats(self) -> dict:
+        """Index and lookup cache statistics for monitoring"""
+        info = self.geocode.cache_info()
+        return {
+            "places": len(self.places),
+            "cache_hits": info.hits,
+            "cache_misses": info.misses,
+        }
+
+
+_gazetteer = None
+_gazetteer_lock = threading.Lock()
+
+
+def get_gazetteer() -> Gazetteer:
+    """Shared gazetteer, rebuilt when the communities file changes"""
+    global _gazetteer
+    gazetteer = _gazetteer
+    if gazetteer is not None and gazetteer.version == source_version(gazetteer.source):
+        return gazetteer
+    with _gazetteer_lock:
+        if _gazetteer is None or _gazetteer.version != source_version(_gazetteer.source):
+            _gazetteer = Gazetteer()
+        return _gazetteer
@@ -0,0 +1,301 @@
+"""
+GeoJSON processing pipeline for the boundary files in backend/geojson/
+Reprojects projected sources (EPSG:3448, JAD2001 / Jamaica Metric Grid) to WGS84 and
+builds Douglas-Peucker simplified, coordinate-quantized levels of detail, cached on disk.
+"""
+
+from pathlib import Path
+import hashlib
+import json
+import math
+import os
+import threading
+
+GEOJSON_DIR = Path(__file__).parent / "geojson"
+CACHE_DIR = Path(os.getenv("GEOJSON_CACHE_DIR", str(GEOJSON_DIR / ".cache")))
+
+# Bump when the output of the pipeline changes so stale cache files are ignored
+PIPELINE_VERSION = 1
+
+# detail -> (simplification tolerance in metres, decimal places kept in degrees)
+DETAIL_LEVELS = {
+    "high": (5.0, 6),     # ~0.1 m quantization
+    "medium": (20.0, 5),  # ~1 m
+    "low": (120.0, 4),    # ~11 m
+}
+
+METRES_PER_DEGREE = 111320.0
+
+# Measurements in source CRS units - meaningless once reprojected, so dropped
+PROJECTED_PROPERTIES = ("Shape_Leng", "Shape_Area")
+
+# WGS84 ellipsoid (JAD2001 uses it too)
+_A = 6378137.0
+_F = 1 / 298.257223563
+_E = math.sqrt(2 * _F - _F ** 2)
+
+
+class LambertConformalConic1SP:
+    """Inverse Lambert Conformal Conic (1SP), Snyder 'Map Projections' eq. 15-5 ff."""
+
+    def __init__(self, lat0: float, lon0: float, k0: float, false_easting: float, false_northing: float):
+        self.lon0 = math.radians(lon0)
+        self.k0 = k0
+        self.fe = false_easting
+        self.fn = false_northing
+
+        phi0 = math.radians(lat0)
+        self.n = math.sin(phi0)
+        m0 = math.cos(phi0) / math.sqrt(1 - _E ** 2 * math.sin(phi0) ** 2)
+        t0 = self._t(phi0)
+        self.big_f = m0 / (self.n * t0 ** self.n)
+        self.r0 = _A * self.big_f * k0 * t0 ** self.n
+
+    @staticmethod
+    def _t(phi: float) -> float:
+        esin = _E * math.sin(phi)
+        return math.tan(math.pi / 4 - phi / 2) / ((1 - esin) / (1 + esin)) ** (_E / 2)
+
+    def to_lonlat(self, x: float, y: float):
+        """Projected metres -> (longitude, latitude) in degrees"""
+        dx = x - self.fe
+        dy = self.r0 - (y - self.fn)
+        r = math.copysign(math.hypot(dx, dy), self.n)
+        t = (r / (_A * self.k0 * self.big_f)) ** (1 / self.n)
+        theta = math.atan2(dx, dy)
+
+        phi = math.pi / 2 - 2 * math.atan(t)
+        for _ in range(8):
+            esin = _E * math.sin(phi)
+            next_phi = math.pi / 2 - 2 * math.atan(t * ((1 - esin) / (1 + esin)) ** (_E / 2))
+            if abs(next_phi - phi) < 1e-12:
+                phi = next_phi
+                break
+            phi = next_phi
+
+        return math.degrees(theta / self.n + self.lon0), math.degrees(phi)
+
+
+# Source CRS identifiers -> inverse projection (None means already lon/lat)
+PROJECTIONS = {
+    "urn:ogc:def:crs:EPSG::3448": LambertConformalConic1SP(18.0, -77.0, 1.0, 750000.0, 650000.0),
+    "EPSG:3448": LambertConformalConic1SP(18.0, -77.0, 1.0, 750000.0, 650000.0),
+}
+
+
+def source_projection(collection: dict):
+    """Inverse projection for a FeatureCollection's crs member, or None for WGS84/CRS84"""
+    name = ((collection.get("crs") or {}).get("properties") or {}).get("name")
+    return PROJECTIONS.get(name)
+
+
+def simplify_ring(points, tolerance: float):
+    """Douglas-Peucker simplification of a closed or open line (iterative)"""
+    if tolerance <= 0 or len(points) < 3:
+        return list(points)
+
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    tolerance_sq = tolerance * tolerance
+
+    while stack:
+        first, last = stack.pop()
+        ax, ay = points[first]
+        bx, by = points[last]
+        dx, dy = bx - ax, by - ay
+        length_sq = dx * dx + dy * dy
+
+        max_dist_sq = -1.0
+        index = first
+        for i in range(first + 1, last):
+            px, py = points[i]
+            if length_sq == 0:
+                dist_sq = (px - ax) ** 2 + (py - ay) ** 2
+            else:
+                u = ((px - ax) * dx + (py - ay) * dy) / length_sq
+                u = 0.0 if u < 0 else 1.0 if u > 1 else u
+                qx, qy = ax + u * dx, ay + u * dy
+                dist_sq = (px - qx) ** 2 + (py - qy) ** 2
+            if dist_sq > max_dist_sq:
+                max_dist_sq = dist_sq
+                index = i
+
+        if max_dist_sq > tolerance_sq:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+def _transform_ring(ring, projection, tolerance: float, decimals: int):
+    """Simplify (in source units), reproject and quantize one ring; None if it collapses"""
+    simplified = simplify_ring(ring, tolerance)
+    if len(simplified) < 4:
+        return None
+
+    out = []
+    previous = None
+    for x, y in simplified:
+        lon, lat = projection.to_lonlat(x, y) if projection else (x, y)
+        point = [round(lon, decimals), round(lat, decimals)]
+        if point != previous:
+            out.append(point)
+            previous = point
+
+    if out[0] != out[-1]:
+        out.append(out[0])
+    return out if len(out) >= 4 else None
+
+
+def _polygons(geometry):
+    if geometry["type"] == "Polygon":
+        return [geometry["coordinates"]]
+    if geometry["type"] == "MultiPolygon":
+        return geometry["coordinates"]
+    return None
+
+
+def transform_collection(collection: dict, detail: str) -> dict:
+    """Build the WGS84, simplified and quantized version of a FeatureCollection"""
+    tolerance_m, decimals = DETAIL_LEVELS[detail]
+    projection = source_projection(collection)
+    # Geographic sources are simplified in degrees
+    tolerance = tolerance_m if projection else tolerance_m / METRES_PER_DEGREE
+
+    features = []
+    for feature in collection.get("features", []):
+        geometry = feature.get("geometry")
+        polygons = _polygons(geometry) if geometry else None
+        if polygons is None:
+            features.append(feature)
+            continue
+
+        out_polygons = []
+        for polygon in polygons:
+            exterior = _transform_ring(polygon[0], projection, tolerance, decimals)
+            if exterior is None:
+                continue
+            holes = [ring for ring in (_transform_ring(r, projection, tolerance, decimals) for r in polygon[1:]) if ring]
+            out_polygons.append([exterior] + holes)
+
+        if not out_polygons:
+            # Everything collapsed - keep the largest part at full detail so the feature stays on the map
+            largest = max(polygons, key=lambda polygon: len(polygon[0]))
+            out_polygons = [[_transform_ring(largest[0], projection, 0, decimals) or []]]
+
+        properties = feature.get("properties") or {}
+        if projection:
+            properties = {k: v for k, v in properties.items() if k not in PROJECTED_PROPERTIES}
+
+        features.append({
+            "type": "Feature",
+            "properties": properties,
+            "geometry": {"type": "MultiPolygon", "coordinates": out_polygons},
+        })
+
+    return {
+        "type": "FeatureCollection",
+        "name": collection.get("name"),
+        "features": features,
+    }
+
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+MAX_MERCATOR_LATITUDE = 85.0511287798
+
+
+def mercator(lon: float, lat: float):
+    """lon/lat -> Web Mercator in [0, 1] units (y grows southwards)"""
+    lat = max(-MAX_MERCATOR_LATITUDE, min(MAX_MERCATOR_LATITUDE, lat))
+    x = (lon + 180.0) / 360.0
+    s = math.sin(math.radians(lat))
+    y = 0.5 - math.log((1 + s) / (1 - s)) / (4 * math.pi)
+    return x, y
+
+
+def inverse_mercator(x: float, y: float):
+    """Web Mercator [0, 1] units -> (lon, lat)"""
+    return x * 360.0 - 180.0, math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y))))
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def radius_bbox(lat: float, lon: float, radius_km: float):
+    """(min_lat, min_lon, max_lat, max_lon) enclosing a circle - used to pre-filter by index"""
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = math.cos(math.radians(lat))
+    dlon = 180.0 if cos_lat < 1e-6 else min(180.0, dlat / cos_lat)
+    return lat - dlat, lon - dlon, lat + dlat, lon + dlon
+
+
+def parse_coordinate(value, limit: float):
+    """Float from a stored coordinate string, or None if missing, malformed or out of range"""
+    if value is None:
+        return None
+    try:
+        number = float(str(value).strip())
+    except ValueError:
+        return None
+    if not math.isfinite(number) or abs(number) > limit:
+        return None
+    return number
+
+
+def source_version(source: Path) -> str:
+    """Changes whenever the source file or the pipeline changes"""
+    st = source.stat()
+    return f"{PIPELINE_VERSION}|{source.name}|{st.st_mtime_ns}|{st.st_size}"
+
+
+def _cache_key(source: Path, detail: str) -> str:
+    raw = f"{source_version(source)}|{detail}|{DETAIL_LEVELS[detail]}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+_build_lock = threading.Lock()
+
+
+def get_detail_file(source: Path, detail: str) -> Path:
+    """
+    Path of the cached level-of-detail file for a source GeoJSON, building it (and
+    the other levels, which share the parse) if missing or out of date.
+    """
+    target = CACHE_DIR / f"{source.stem}.{detail}.{_cache_key(source, detail)}.geojson"
+    if target.exists():
+        return target
+
+    with _build_lock:
+        if not target.exists():
+            build_detail_levels(source)
+    return target
+
+
+def build_detail_levels(source: Path):
+    """Write every level of detail for a source file to the cache directory"""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(source, "r", encoding="utf-8") as f:
+        collection = json.load(f)
+
+    for detail in DETAIL_LEVELS:
+        target = CACHE_DIR / f"{source.stem}.{detail}.{_cache_key(source, detail)}.geojson"
+        data = transform_collection(collection, detail)
+        tmp = target.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
+        os.replace(tmp, target)
+
+        # Drop outdated builds of this level (and their compressed copies)
+        for old in CACHE_DIR.glob(f"{source.stem}.{detail}.*.geojson*"):
+            if not old.name.startswith(target.name):
+                old.unlink(missing_ok=True)
@@ -0,0 +1,186 @@
+"""
+Short-link click counting without a write per redirect
+Each redirect adds one to an in-memory counter keyed by (link id, UTC hour, referring
+host, user-agent family). A background task writes the counters every flush interval,
+and once more on shutdown, as a single batch of upserts into link_clicks that add to the
+stored counts, so several worker processes can flush into the same rows.
+"""
+
+from datetime import datetime
+from functools import lru_cache
+from urllib.parse import urlsplit
+import os
+import re
+import threading
+import time
+
+FLUSH_INTERVAL = float(os.getenv("LINK_CLICK_FLUSH_INTERVAL", "10"))
+# Distinct counters held between flushes; past this, new referrers are counted as "other"
+MAX_PENDING = 50000
+OTHER_REFERRER = "other"
+
+# First match wins: link-preview fetchers and bots before browsers, and browsers whose
+# user agents mention others (Edge and Opera say Chrome, Chrome says Safari) first
+AGENT_FAMILIES = [
+    (r"whatsapp", "WhatsApp"),
+    (r"facebookexternalhit|facebot", "Facebook"),
+    (r"telegrambot", "Telegram"),
+    (r"twitterbot", "Twitter"),
+    (r"slackbot", "Slack"),
+    (r"bot\b|crawler|spider", "Bot"),
+    (r"edg(e|a|ios)?/", "Edge"),
+    (r"opr/|opera", "Opera"),
+    (r"samsungbrowser", "Samsung Internet"),
+    (r"firefox|fxios", "Firefox"),
+    (r"chrome|crios", "Chrome"),
+    (r"safari", "Safari"),
+    (r"curl|wget|python|httpx|okhttp|go-http-client", "Script"),
+]
+_AGENT_PATTERNS = [(re.compile(pattern), family) for pattern, family in AGENT_FAMILIES]
+
+
+@lru_cache(maxsize=2048)
+def agent_family(user_agent) -> str:
+    """'Chrome', 'WhatsApp', 'Bot', ... for a User-Agent header; '' if there is none"""
+    if not user_agent:
+        return ""
+    user_agent = user_agent.lower()
+    for pattern, family in _AGENT_PATTERNS:
+        if pattern.search(user_agent):
+            return family
+    return "Other"
+
+
+@lru_cache(maxsize=2048)
+def referrer_host(referrer) -> str:
+    """Host of a Referer header without 'www.'; '' for a direct visit"""
+    if not referrer:
+        return ""
+    try:
+        host = urlsplit(referrer).hostname or ""
+    except ValueError:
+        return OTHER_REFERRER
+    if host.startswith("www."):
+        host = host[4:]
+    return host[:100]
+
+
+class ClickCounter:
+    """Pending click counts, swapped out and written by flush()"""
+
+    def __init__(self, max_pending: int = MAX_PENDING):
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        # Serializes flushes, so counts merged back after a failed write are not lost
+        self._flush_lock = threading.Lock()
+        # (link_id, hour start as unix time, referrer, agent) -> clicks
+        self._pending = {}
+
+        self.recorded = 0
+        self.dropped = 0
+        self.flushed = 0
+        self.flush_count = 0
+        self.failed_flushes = 0
+        self.last_flush_seconds = 0.0
+
+    def record(self, link_id: int, referrer=None, user_agent=None, now: float = None):
+        """Count one click (memory only)"""
+        hour = int((now or time.time()) // 3600) * 3600
+        key = (link_id, hour, referrer_host(referrer), agent_family(user_agent))
+        with self._lock:
+            if key not in self._pending and len(self._pending) >= self.max_pending:
+                key = (link_id, hour, OTHER_REFERRER, key[3])
+                if key not in self._pending and len(self._pending) >= self.max_pending:
+                    self.dropped += 1
+                    return
+            self._pending[key] = self._pending.get(key, 0) + 1
+            self.recorded += 1
+
+    def pending_for(self, link_id: int) -> list:
+        """Unflushed (hour, referrer, agent, clicks) rows of one link"""
+        with self._lock:
+            return [
+                (datetime.utcfromtimestamp(hour), referrer, agent, clicks)
+                for (pending_id, hour, referrer, agent), clicks in self._pending.items()
+                if pending_id == link_id
+            ]
+
+    def discard(self, link_id: int):
+        """Drop unflushed clicks of a link (permanently deleted)"""
+        with self._lock:
+            for key in [key for key in self._pending if key[0] == link_id]:
+                del self._pending[key]
+
+    def flush(self, write) -> int:
+        """
+        Hand the pending counts to write(rows) as dicts of link_id, hour (datetime),
+        referrer, agent and clicks. If write raises, the counts are kept for the next flush.
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+            started = time.perf_counter()
+            rows = [
+                {"link_id": link_id, "hour": datetime.utcfromtimestamp(hour),
+                 "referrer": referrer, "agent": agent, "clicks": clicks}
+                for (link_id, hour, referrer, agent), clicks in pending.items()
+            ]
+            try:
+                write(rows)
+            except Exception:
+                with self._lock:
+                    for key, clicks in pending.items():
+                        self._pending[key] = self._pending.get(key, 0) + clicks
+                    self.failed_flushes += 1
+                raise
+            self.flushed += sum(pending.values())
+            self.flush_count += 1
+            self.last_flush_seconds = time.perf_counter() - started
+            return len(rows)
+
+    def stats(self) -> dict:
+        """Counter statistics for monitoring"""
+        return {
+            "pending_keys": len(self._pending),
+            "recorded": self.recorded,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "flush_count": self.flush_count,
+            "failed_flushes": self.failed_flushes,
+            "last_flush_ms": round(self.last_flush_seconds * 1000, 1),
+        }
+
+
+def summarize(rows, since: datetime) -> dict:
+    """
+    Totals, an hourly series from since onwards and referrer/agent breakdowns from
+    (hour, referrer, agent, clicks) rows, which may repeat a key (stored + pending).
+    """
+    hours, referrers, agents = {}, {}, {}
+    total = 0
+    first = last = None
+    for hour, referrer, agent, clicks in rows:
+        total += clicks
+        first = hour if first is None or hour < first else first
+        last = hour if last is None or hour > last else last
+        if hour >= since:
+            hours[hour] = hours.get(hour, 0) + clicks
+        referrer = referrer or "direct"
+        referrers[referrer] = referrers.get(referrer, 0) + clicks
+        agent = agent or "unknown"
+        agents[agent] = agents.get(agent, 0) + clicks
+
+    def ranked(counts: dict, field: str) -> list:
+        return [{field: name, "clicks": clicks}
+                for name, clicks in sorted(counts.items(), key=lambda item: (-item[1], item[0]))]
+
+    return {
+        "total_clicks": total,
+        "first_click_hour": first.isoformat() if first else None,
+        "last_click_hour": last.isoformat() if last else None,
+        "hourly": [{"hour": hour.isoformat(), "clicks": clicks} for hour, clicks in sorted(hours.items())],
+        "referrers": ranked(referrers, "referrer"),
+        "agents": ranked(agents, "agent"),
+    }
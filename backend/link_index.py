@@ -0,0 +1,75 @@
+"""
+Short-link redirects from memory
+Live links are held as a slug -> (link id, URL) dict. The links table version is
+checked at most once per check interval (and on a miss, so a slug created by another
+worker is found at once); the dict is reloaded only when the version has changed. Link
+writes in this process invalidate it so the next redirect rechecks straight away.
+"""
+
+from typing import Optional
+import os
+import threading
+import time
+
+VERSION_CHECK_INTERVAL = float(os.getenv("LINK_VERSION_CHECK_INTERVAL", "1"))
+
+
+class LinkIndex:
+    """slug -> (link id, destination URL) for links that are not deleted"""
+
+    def __init__(self, check_interval: float = VERSION_CHECK_INTERVAL):
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._links = {}
+        self._checked = None
+        self.version = None
+
+        self.hits = 0
+        self.misses = 0
+        self.version_checks = 0
+        self.reload_count = 0
+
+    def stale(self) -> bool:
+        """True if the table version is due a check"""
+        checked = self._checked
+        return checked is None or time.monotonic() - checked >= self.check_interval
+
+    def invalidate(self):
+        """Recheck the table version on the next lookup (after a write in this process)"""
+        self._checked = None
+
+    def refresh(self, load_version, load_links, force: bool = False):
+        """
+        Check the table version with load_version() and, if it changed, reload the
+        (slug, id, url) rows from load_links(). No-op until the check interval has passed.
+        """
+        with self._lock:
+            if not force and not self.stale():
+                return
+            self.version_checks += 1
+            version = load_version()
+            if version != self.version or self._checked is None:
+                self._links = {slug: (link_id, url) for slug, link_id, url in load_links()}
+                self.version = version
+                self.reload_count += 1
+            self._checked = time.monotonic()
+
+    def lookup(self, slug: str) -> Optional[tuple]:
+        """(link id, URL) of a live link, or None"""
+        link = self._links.get(slug)
+        if link is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return link
+
+    def stats(self) -> dict:
+        """Index statistics for monitoring"""
+        return {
+            "links": len(self._links),
+            "version": self.version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "version_checks": self.version_checks,
+            "reload_count": self.reload_count,
+        }
@@ -1,29 +1,36 @@
-from fastapi import FastAPI, Depends, HTTPException, status, Header
+from fastapi import FastAPI, Depends, HTTPException, status, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, Response
+from fastapi.responses import FileResponse, Response, StreamingResponse, RedirectResponse
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
-import yaml
+from sqlalchemy import select, func, update, delete, bindparam
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from starlette.concurrency import run_in_threadpool
 import os
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import jwt
 from dotenv import load_dotenv
 from pathlib import Path
-import feedparser
 import httpx
 from typing import Optional, List
-import frontmatter
-import markdown
+import anyio
+import asyncio
 import re
-from email.utils import formatdate
-import time
+from email.utils import format_datetime, parsedate_to_datetime
+import hashlib
+import orjson
 
 # Import database
 from database import (
     init_db, 
     get_db, 
+    SessionLocal,
+    get_read_db,
+    THREADPOOL_SIZE,
+    table_versions_statement,
+    get_table_versions,
+    get_table_version,
     WhatsAppGroup as DBWhatsAppGroup,
     Resource as DBResource,
     ContactSubmission as DBContactSubmission,
@@ -31,7 +38,40 @@ from database import (
     User as DBUser,
     Announcement as DBAnnouncement,
     Link as DBLink,
-    seed_initial_data
+    LinkClick as DBLinkClick,
+    engine,
+    seed_initial_data,
+    async_engine
+)
+from content_cache import ContentCache, SectorCache
+from feed_cache import FeedCache
+from announcement_feed import AnnouncementFeedCache, FEED_SIZE
+from geo import DETAIL_LEVELS, CACHE_DIR as GEOJSON_CACHE_DIR, get_detail_file
+from compression import (
+    CompressionMiddleware, PrecompressedStaticFiles, LAZY_BROTLI_QUALITY, file_response, precompress, precompress_tree,
+)
+from tiles import TileCache, MIN_ZOOM, MAX_ZOOM
+from spatial import parse_bbox, parse_near, within_bbox, within_radius
+from clusters import ClusterIndex
+from nearest import NearestIndex, MAX_K as NEAREST_MAX_K
+from boundaries import get_boundary_index
+from gazetteer import get_gazetteer, MAX_RESULTS as GEOCODE_MAX_RESULTS
+from area_stats import AreaStatsCache, LEVELS as AREA_LEVELS, parse_group_by
+from passwords import PasswordPool, PasswordPoolBusy, BrokenProcessPool, CredentialCache
+from auth import AuthUser, TokenCache, UserCache, MISSING
+from link_index import LinkIndex
+from link_clicks import ClickCounter, FLUSH_INTERVAL as LINK_CLICK_FLUSH_INTERVAL, summarize as summarize_clicks
+from pagination import paginate, paginate_async, set_page_headers, InvalidPage
+from serializers import (
+    WHATSAPP_GROUP_PROJECTION,
+    RESOURCE_PROJECTION,
+    CONTACT_SUBMISSION_PROJECTION,
+    CONTACT_PROJECTION,
+    CONTACT_FEATURE_PROJECTION,
+    USER_PROJECTION,
+    ANNOUNCEMENT_PROJECTION,
+    ANNOUNCEMENT_SUMMARY_PROJECTION,
+    LINK_PROJECTION,
 )
 
 load_dotenv()
@@ -41,8 +81,37 @@ app = FastAPI(title="IM Hub API")
 # Initialize database on startup
 @app.on_event("startup")
 def startup_event():
+    # Sync endpoints run in AnyIO's threadpool; match it to the DB connection pool
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
     init_db()
     seed_initial_data()
+    content_cache.get()
+    sector_cache.preload()
+    # Load the parish/community polygons before the first contact write needs them
+    get_boundary_index()
+    get_gazetteer()
+    refresh_link_index()
+    # No-op when build.sh already wrote the .br/.gz copies; otherwise a faster brotli
+    # level than build.sh's, so a missing build step doesn't hold up startup
+    if frontend_dist.exists():
+        precompress_tree(frontend_dist, brotli_quality=LAZY_BROTLI_QUALITY)
+
+
+@app.on_event("startup")
+async def start_background_tasks():
+    global link_click_flusher
+    link_click_flusher = asyncio.create_task(flush_link_clicks_periodically())
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if link_click_flusher is not None:
+        link_click_flusher.cancel()
+    await run_in_threadpool(flush_link_clicks)
+    await mapaction_feed.close()
+    password_pool.shutdown()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 # CORS configuration
 app.add_middleware(
@@ -51,7 +120,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "ETag"],
 )
+app.add_middleware(CompressionMiddleware)
 
 # Configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
@@ -215,6 +286,8 @@ class ContactResponse(BaseModel):
     community: Optional[str] = None
     latitude: Optional[str] = None
     longitude: Optional[str] = None
+    adm1_pcode: Optional[str] = None
+    adm2_pcode: Optional[str] = None
     location_type: str
     status: str
     notes: Optional[str] = None
@@ -280,6 +353,8 @@ class AnnouncementResponse(BaseModel):
     id: int
     title: str
     content: str
+    summary: Optional[str] = None
+    excerpt: Optional[str] = None
     date: str
     priority: str
     author: Optional[str] = None
@@ -331,30 +406,74 @@ def create_access_token(data: dict):
     return encoded_jwt
 
 
-def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+def load_auth_user(username: str) -> Optional[AuthUser]:
+    """(id, is_active, is_admin) of a user, on a short-lived session; None if there is no such user"""
+    db = SessionLocal()
+    try:
+        user = db.execute(
+            select(DBUser.id, DBUser.is_active, DBUser.is_admin).where(DBUser.username == username)
+        ).first()
+    finally:
+        db.close()
+    if user is not None:
+        return AuthUser(username, user.id, bool(user.is_active), bool(user.is_admin))
+    if username == ADMIN_USERNAME:
+        # Environment admin account (login fallback), not stored in the database
+        return AuthUser(username, None, True, True)
+    return None
+
+
+token_cache = TokenCache(SECRET_KEY, ALGORITHM)
+user_cache = UserCache(load_auth_user)
+
+
+def token_username(token: str) -> str:
+    """Username (sub claim) of a valid token; raises 401 otherwise"""
     try:
-        token = credentials.credentials
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials",
-            )
-        return username
+        username = token_cache.decode(token).get("sub")
     except jwt.ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token has expired",
         )
-    except jwt.JWTError:
+    except jwt.InvalidTokenError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+        )
+    if username is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
         )
+    return username
+
+
+def current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> AuthUser:
+    """The active user behind the bearer token"""
+    user = user_cache.get(token_username(credentials.credentials))
+    if user is None or not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User is inactive or no longer exists",
+        )
+    return user
+
+
+def verify_token(user: AuthUser = Depends(current_user)) -> str:
+    return user.username
+
+
+def require_admin(user: AuthUser = Depends(current_user)) -> AuthUser:
+    if not user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required",
+        )
+    return user
 
 
-def verify_token_optional(authorization: Optional[str] = Header(None)):
+async def verify_token_optional(authorization: Optional[str] = Header(None)):
     """
     Optional token verification - returns username if valid token provided, None otherwise.
     Does not raise exception if no token or invalid token.
@@ -368,24 +487,192 @@ def verify_token_optional(authorization: Optional[str] = Header(None)):
     token = authorization.replace("Bearer ", "")
     
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        return username
-    except (jwt.ExpiredSignatureError, jwt.JWTError):
+        username = token_username(token)
+    except HTTPException:
         return None
+    user = user_cache.cached(username)
+    if user is MISSING:
+        user = await run_in_threadpool(user_cache.get, username)
+    return username if user is not None and user.is_active else None
+
+
+content_cache = ContentCache(Path(__file__).parent / "content.yaml")
+sector_cache = SectorCache(Path(__file__).parent / "sectors")
+announcement_feed = AnnouncementFeedCache()
+tile_cache = TileCache()
+contact_clusters = ClusterIndex()
+nearest_contacts = NearestIndex()
+area_stats = AreaStatsCache()
+link_index = LinkIndex()
+link_clicks = ClickCounter()
+link_click_flusher = None
+password_pool = PasswordPool()
+credential_cache = CredentialCache()
+# Tiles only change when a boundary file is replaced
+TILE_CACHE_CONTROL = "public, max-age=3600"
+mapaction_feed = FeedCache(
+    os.getenv("MAPACTION_FEED_URL", "https://maps.mapaction.org/feeds/custom.atom?groups=2025-jam-001"),
+    ttl=float(os.getenv("MAPACTION_FEED_TTL", "600")),
+)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header value against an ETag (weak comparison)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return etag in candidates or f"W/{etag}" in candidates
+
+
+def not_modified_since(if_modified_since: Optional[str], last_modified: datetime) -> bool:
+    """Check an If-Modified-Since header value against a naive UTC timestamp"""
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is not None:
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+    return last_modified.replace(microsecond=0) <= since
+
+
+def conditional_response(request: Request, response: Response, etag: str,
+                         last_modified: Optional[datetime] = None):
+    """
+    Return a 304 response if the client already has this ETag (or, without
+    If-None-Match, hasn't seen a change since If-Modified-Since); otherwise set the
+    validator headers on the outgoing response and return None.
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.replace(tzinfo=timezone.utc), usegmt=True)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        not_modified = etag_matches(if_none_match, etag)
+    else:
+        not_modified = last_modified is not None and not_modified_since(
+            request.headers.get("if-modified-since"), last_modified
+        )
+
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+def versions_etag(request: Request, versions) -> str:
+    """ETag from (table, version) rows and the query string"""
+    key = f"{sorted(tuple(row) for row in versions)}|{request.url.query}"
+    return '"' + hashlib.sha256(key.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+async def check_not_modified(request: Request, response: Response, db, *tables):
+    """
+    Conditional GET for list endpoints. The ETag is derived from the tables' change
+    versions (bumped by triggers on every write) and the query string, so a matching
+    If-None-Match is answered with 304 before the list query runs.
+    """
+    versions = await read_rows(db, table_versions_statement(*tables))
+    return conditional_response(request, response, versions_etag(request, versions))
 
 
 def load_content_yaml():
-    yaml_path = Path(__file__).parent / "content.yaml"
+    """Get the parsed content.yaml (cached, reloaded only when the file changes)"""
+    return content_cache.get()
+
+
+def paginated(response: Response, db: Session, stmt, sort_columns, descending: bool = False,
+              cursor: Optional[str] = None, page_size: Optional[int] = None, include_total: bool = False,
+              scalars: bool = True):
+    """Run a keyset-paginated list query and set the pagination headers"""
+    try:
+        rows, next_cursor, total = paginate(
+            db, stmt, sort_columns, descending=descending,
+            cursor=cursor, page_size=page_size, include_total=include_total, scalars=scalars
+        )
+    except InvalidPage as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    set_page_headers(response, next_cursor, total)
+    return rows
+
+
+def read_list_sync(db: Session, request: Request, tables, stmt, sort_columns, page: dict):
+    """
+    read_list() on the sync session, run as one threadpool call. Returns (etag, None)
+    when If-None-Match already matches, else (etag, (rows, next_cursor, total)).
+    """
     try:
-        with open(yaml_path, "r") as file:
-            return yaml.safe_load(file)
-    except FileNotFoundError:
-        return {
-            "title": "IM Hub",
-            "tagline": "Information Management Dashboard",
-            "sections": []
-        }
+        etag = versions_etag(request, db.execute(table_versions_statement(*tables)).all())
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return etag, None
+        if sort_columns is None:
+            return etag, (db.execute(stmt).all(), None, None)
+        return etag, paginate(db, stmt, sort_columns, scalars=False, **page)
+    finally:
+        # Back to the pool before the request waits for a thread again
+        db.close()
+
+
+async def read_list_async(db, request: Request, tables, stmt, sort_columns, page: dict):
+    """read_list_sync() on an AsyncSession"""
+    etag = versions_etag(request, (await db.execute(table_versions_statement(*tables))).all())
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return etag, None
+    if sort_columns is None:
+        return etag, ((await db.execute(stmt)).all(), None, None)
+    return etag, await paginate_async(db, stmt, sort_columns, scalars=False, **page)
+
+
+async def read_list(request: Request, response: Response, db, tables, stmt, sort_columns=None,
+                    descending: bool = False, cursor: Optional[str] = None, page_size: Optional[int] = None,
+                    include_total: bool = False):
+    """
+    Conditional GET plus the list query of a public list endpoint (column select; keyset
+    paginated when sort_columns is given). Returns (not_modified, rows): a 304 response,
+    or the rows with the ETag and pagination headers set on response.
+
+    With the sync session the version check, the query and closing the session are a
+    single threadpool call, so no connection is held while the request waits for a
+    thread; the rows are serialized after the connection is back in the pool.
+    """
+    page = dict(descending=descending, cursor=cursor, page_size=page_size, include_total=include_total)
+    try:
+        if isinstance(db, Session):
+            etag, result = await run_in_threadpool(read_list_sync, db, request, tables, stmt, sort_columns, page)
+        else:
+            etag, result = await read_list_async(db, request, tables, stmt, sort_columns, page)
+    except InvalidPage as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    not_modified = conditional_response(request, response, etag)
+    if not_modified:
+        return not_modified, None
+    rows, next_cursor, total = result
+    set_page_headers(response, next_cursor, total)
+    return None, rows
+
+
+def execute_and_close(db: Session, stmt):
+    try:
+        return db.execute(stmt).all()
+    finally:
+        # Back to the pool before the request waits for a thread again
+        db.close()
+
+
+async def read_rows(db, stmt):
+    """
+    Execute a column select() on the read session and return row tuples. The sync
+    session is closed afterwards (it reconnects on the next query), so its connection
+    is not held between threadpool calls.
+    """
+    if isinstance(db, Session):
+        return await run_in_threadpool(execute_and_close, db, stmt)
+    return (await db.execute(stmt)).all()
 
 
 # Routes
@@ -394,15 +681,66 @@ def read_root():
     return {"message": "IM Hub API", "status": "running"}
 
 
+def password_pool_busy():
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many logins in progress, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+async def verify_password(username: str, password: str, password_hash: str) -> bool:
+    """Check a login against the verified-credential cache, then bcrypt in the password pool"""
+    if credential_cache.check(username, password_hash, password):
+        return True
+    try:
+        matches = await password_pool.check(password, password_hash)
+    except (PasswordPoolBusy, BrokenProcessPool):
+        # BrokenProcessPool: the worker died mid-check; the pool is replaced on the next login
+        raise password_pool_busy()
+    if matches:
+        credential_cache.add(username, password_hash, password)
+    return matches
+
+
+def hash_password(password: str) -> str:
+    """bcrypt hash computed in the password pool"""
+    try:
+        return password_pool.hash(password)
+    except (PasswordPoolBusy, BrokenProcessPool):
+        raise password_pool_busy()
+
+
+def load_login_user(username: str):
+    """(id, username, password_hash, is_active, is_admin) of a user, on a short-lived session"""
+    db = SessionLocal()
+    try:
+        return db.execute(
+            select(DBUser.id, DBUser.username, DBUser.password_hash, DBUser.is_active, DBUser.is_admin)
+            .where(DBUser.username == username)
+        ).first()
+    finally:
+        db.close()
+
+
+def record_login(user_id: int):
+    db = SessionLocal()
+    try:
+        db.execute(update(DBUser).where(DBUser.id == user_id).values(last_login=datetime.utcnow()))
+        db.commit()
+    finally:
+        db.close()
+
+
 @app.post("/api/auth/login", response_model=TokenResponse)
-def login(login_data: LoginRequest, db: Session = Depends(get_db)):
-    # Try database authentication first
-    user = db.query(DBUser).filter(DBUser.username == login_data.username).first()
+async def login(login_data: LoginRequest):
+    # Try database authentication first. No connection or worker thread is held
+    # while bcrypt runs in the password pool.
+    user = await run_in_threadpool(load_login_user, login_data.username)
     
-    if user and user.is_active and user.check_password(login_data.password):
+    if user and user.is_active and await verify_password(user.username, login_data.password, user.password_hash):
         # Update last login time
-        user.last_login = datetime.utcnow()
-        db.commit()
+        await run_in_threadpool(record_login, user.id)
         
         access_token = create_access_token(data={"sub": login_data.username, "is_admin": user.is_admin})
         return {"access_token": access_token, "token_type": "bearer"}
@@ -424,9 +762,16 @@ def verify(username: str = Depends(verify_token)):
 
 
 @app.get("/api/content")
-def get_content():
+def get_content(request: Request, response: Response):
     """Public endpoint for site content - no auth required"""
     content = load_content_yaml()
+    
+    content_hash = content_cache.content_hash
+    if content_hash:
+        not_modified = conditional_response(request, response, f'"{content_hash[:32]}"')
+        if not_modified:
+            return not_modified
+    
     return content
 
 
@@ -452,61 +797,48 @@ def get_navigation():
 @app.get("/api/dashboard/{dashboard_id}")
 def get_dashboard(dashboard_id: str):
     """Public endpoint for dashboard config - no auth required"""
-    content = load_content_yaml()
-    dashboards = content.get("dashboards", {})
+    dashboard = content_cache.get_dashboard(dashboard_id)
     
-    if dashboard_id not in dashboards:
+    if dashboard is None:
         raise HTTPException(status_code=404, detail="Dashboard not found")
     
-    return dashboards[dashboard_id]
+    return dashboard
 
 
 @app.get("/api/form/{form_id}")
 def get_form(form_id: str):
     """Public endpoint for form config - no auth required"""
-    content = load_content_yaml()
-    forms = content.get("forms", {})
+    form = content_cache.get_form(form_id)
     
-    if form_id not in forms:
+    if form is None:
         raise HTTPException(status_code=404, detail="Form not found")
     
-    return forms[form_id]
+    return form
 
 
 @app.get("/api/sector/{sector_id}")
-def get_sector(sector_id: str):
+def get_sector(
+    sector_id: str,
+    request: Request,
+    response: Response
+):
     """Get sector information from markdown files - public endpoint"""
-    sectors_dir = Path(__file__).parent / "sectors"
-    sector_file = sectors_dir / f"{sector_id}.md"
-    
-    if not sector_file.exists():
-        raise HTTPException(status_code=404, detail="Sector not found")
-    
     try:
-        with open(sector_file, 'r', encoding='utf-8') as f:
-            post = frontmatter.load(f)
-            
-            # Convert markdown content to HTML
-            html_content = markdown.markdown(
-                post.content,
-                extensions=['extra', 'codehilite', 'nl2br']
-            )
-            
-            # Extract links from the markdown content
-            # Look for markdown links: [text](url)
-            link_pattern = r'\[([^\]]+)\]\(([^\)]+)\)'
-            links = re.findall(link_pattern, post.content)
-            
-            resources = [{"name": name, "url": url} for name, url in links]
-            
-            return {
-                "title": post.get("title", sector_id.replace("-", " ").title()),
-                "description": post.get("description", ""),
-                "content": html_content,
-                "resources": resources
-            }
+        cached = sector_cache.get(sector_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing sector file: {str(e)}")
+    
+    if cached is None:
+        raise HTTPException(status_code=404, detail="Sector not found")
+    
+    etag, sector = cached
+    
+    # Client already has this version
+    not_modified = conditional_response(request, response, etag)
+    if not_modified:
+        return not_modified
+    
+    return sector
 
 
 @app.get("/api/resources")
@@ -541,8 +873,11 @@ def download_file(filename: str):
 
 
 @app.get("/api/geojson/{filename}")
-def get_geojson(filename: str):
-    """Get GeoJSON administrative boundaries - public endpoint"""
+def get_geojson(filename: str, request: Request, detail: Optional[str] = None):
+    """
+    Get GeoJSON administrative boundaries - public endpoint
+    detail=low|medium|high serves a simplified WGS84 copy (see geo.py); omit for the source file
+    """
     geojson_dir = Path(__file__).parent / "geojson"
     file_path = geojson_dir / filename
     
@@ -560,16 +895,65 @@ def get_geojson(filename: str):
     if not file_path.is_file():
         raise HTTPException(status_code=404, detail="Not a file")
     
-    return FileResponse(
-        path=str(file_path),
+    if detail is not None:
+        if detail not in DETAIL_LEVELS:
+            raise HTTPException(status_code=400, detail=f"detail must be one of: {', '.join(DETAIL_LEVELS)}")
+        file_path = get_detail_file(file_path, detail)
+    
+    # Compressed once, served as .br/.gz to clients that accept it (build.sh writes
+    # maximum-quality copies; a lazy build here uses a faster brotli level)
+    precompress(file_path, GEOJSON_CACHE_DIR, brotli_quality=LAZY_BROTLI_QUALITY)
+    return file_response(
+        request.headers,
+        file_path,
         filename=filename,
-        media_type="application/geo+json"
+        media_type="application/geo+json",
+        cache_dir=GEOJSON_CACHE_DIR,
     )
 
 
+@app.get("/api/tiles/{layer}/{z}/{x}/{y}.mvt")
+def get_tile(layer: str, z: int, x: int, y: int, request: Request, response: Response):
+    """Mapbox Vector Tile of a boundary layer (parishes, communities) - public endpoint"""
+    if layer not in tile_cache.layers:
+        raise HTTPException(status_code=404, detail="Tile layer not found")
+    if not MIN_ZOOM <= z <= MAX_ZOOM or not 0 <= x < (1 << z) or not 0 <= y < (1 << z):
+        raise HTTPException(status_code=404, detail="Tile out of range")
+    
+    etag, data = tile_cache.get(layer, z, x, y)
+    
+    not_modified = conditional_response(request, response, etag)
+    if not_modified:
+        not_modified.headers["Cache-Control"] = TILE_CACHE_CONTROL
+        return not_modified
+    
+    response.headers["Cache-Control"] = TILE_CACHE_CONTROL
+    if not data:
+        # No boundary touches this tile
+        return Response(status_code=204, headers=response.headers)
+    return Response(content=data, media_type="application/vnd.mapbox-vector-tile", headers=response.headers)
+
+
 @app.get("/api/health")
 def health_check():
-    return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
+    return {
+        "status": "healthy",
+        "timestamp": datetime.utcnow().isoformat(),
+        "content_cache": content_cache.stats(),
+        "sector_cache": sector_cache.stats(),
+        "tile_cache": tile_cache.stats(),
+        "contact_clusters": contact_clusters.stats(),
+        "nearest_contacts": nearest_contacts.stats(),
+        "area_stats": area_stats.stats(),
+        "gazetteer": get_gazetteer().stats(),
+        "mapaction_feed": mapaction_feed.stats(),
+        "password_pool": password_pool.stats(),
+        "credential_cache": credential_cache.stats(),
+        "token_cache": token_cache.stats(),
+        "link_index": link_index.stats(),
+        "link_clicks": link_clicks.stats(),
+        "user_cache": user_cache.stats(),
+    }
 
 
 # WhatsApp Groups endpoints
@@ -579,21 +963,27 @@ def get_deleted_whatsapp_groups(
     username: str = Depends(verify_token)
 ):
     """Get all soft-deleted WhatsApp groups (admin only)"""
-    groups = db.query(DBWhatsAppGroup).filter(DBWhatsAppGroup.deleted == True).order_by(DBWhatsAppGroup.updated_at.desc()).all()
+    groups = db.execute(deleted_whatsapp_groups_query()).scalars().all()
     return [group.to_dict() for group in groups]
 
 
-@app.get("/api/whatsapp-groups", response_model=List[WhatsAppGroupResponse])
-def get_whatsapp_groups(
-    approved_only: bool = True,
-    include_deleted: bool = False,
-    sector: Optional[str] = None,
-    db: Session = Depends(get_db),
-    username: Optional[str] = Depends(verify_token_optional)
-):
-    """Get all WhatsApp groups - public endpoint for viewing"""
-    query = db.query(DBWhatsAppGroup)
-    
+def deleted_whatsapp_groups_query():
+    """Soft-deleted groups, most recently changed first"""
+    return select(DBWhatsAppGroup).where(DBWhatsAppGroup.deleted == True).order_by(DBWhatsAppGroup.updated_at.desc())
+
+
+WHATSAPP_GROUP_SORT = [DBWhatsAppGroup.sector, DBWhatsAppGroup.name, DBWhatsAppGroup.id]
+# Within one sector: a (sector, name, id) > cursor bound can't seek once sector is pinned
+WHATSAPP_GROUP_SECTOR_SORT = [DBWhatsAppGroup.name, DBWhatsAppGroup.id]
+
+
+def whatsapp_group_sort(sector: Optional[str] = None) -> list:
+    return WHATSAPP_GROUP_SECTOR_SORT if sector else WHATSAPP_GROUP_SORT
+
+
+def filter_whatsapp_groups(query, approved_only: bool = True, include_deleted: bool = False,
+                           sector: Optional[str] = None):
+    """Apply the WhatsApp group list filters to a select()"""
     # Filter out deleted groups unless specifically requested (for admin panel)
     if not include_deleted:
         query = query.filter(DBWhatsAppGroup.deleted == False)
@@ -604,8 +994,32 @@ def get_whatsapp_groups(
     if sector:
         query = query.filter(DBWhatsAppGroup.sector == sector)
     
-    groups = query.order_by(DBWhatsAppGroup.sector, DBWhatsAppGroup.name).all()
-    return [group.to_dict() for group in groups]
+    return query
+
+
+@app.get("/api/whatsapp-groups", response_model=List[WhatsAppGroupResponse])
+async def get_whatsapp_groups(
+    request: Request,
+    response: Response,
+    approved_only: bool = True,
+    include_deleted: bool = False,
+    sector: Optional[str] = None,
+    cursor: Optional[str] = None,
+    page_size: Optional[int] = None,
+    include_total: bool = False,
+    db = Depends(get_read_db),
+    username: Optional[str] = Depends(verify_token_optional)
+):
+    """Get all WhatsApp groups - public endpoint for viewing"""
+    query = filter_whatsapp_groups(WHATSAPP_GROUP_PROJECTION.select(), approved_only, include_deleted, sector)
+    
+    not_modified, groups = await read_list(
+        request, response, db, ["whatsapp_groups"], query, whatsapp_group_sort(sector),
+        cursor=cursor, page_size=page_size, include_total=include_total
+    )
+    if not_modified:
+        return not_modified
+    return await WHATSAPP_GROUP_PROJECTION.response_async(groups, headers=response.headers)
 
 
 @app.post("/api/whatsapp-groups", response_model=WhatsAppGroupResponse, status_code=status.HTTP_201_CREATED)
@@ -742,28 +1156,44 @@ def restore_whatsapp_group(
 
 
 # Resources endpoints
+RESOURCE_SORT = [DBResource.created_at, DBResource.id]
+
+
+def filter_resources(query, approved_only: bool = True, category: Optional[str] = None,
+                     sector: Optional[str] = None):
+    """Apply the resource list filters to a select()"""
+    if approved_only:
+        query = query.filter(DBResource.approved == True)
+    
+    if category:
+        query = query.filter(DBResource.category == category)
+    
+    if sector:
+        query = query.filter(DBResource.sector == sector)
+    
+    return query
+
+
 @app.get("/api/resources-db", response_model=List[ResourceResponse])
 def get_resources_db(
+    response: Response,
     approved_only: bool = True,
     category: Optional[str] = None,
     sector: Optional[str] = None,
+    cursor: Optional[str] = None,
+    page_size: Optional[int] = None,
+    include_total: bool = False,
     db: Session = Depends(get_db),
     username: str = Depends(verify_token)
 ):
     """Get all user-submitted resources"""
-    query = db.query(DBResource)
-    
-    if approved_only:
-        query = query.filter(DBResource.approved == True)
+    query = filter_resources(RESOURCE_PROJECTION.select(), approved_only, category, sector)
     
-    if category:
-        query = query.filter(DBResource.category == category)
-    
-    if sector:
-        query = query.filter(DBResource.sector == sector)
-    
-    resources = query.order_by(DBResource.created_at.desc()).all()
-    return [resource.to_dict() for resource in resources]
+    resources = paginated(
+        response, db, query, RESOURCE_SORT, descending=True,
+        cursor=cursor, page_size=page_size, include_total=include_total, scalars=False
+    )
+    return RESOURCE_PROJECTION.response(resources, headers=response.headers)
 
 
 @app.post("/api/resources-db", response_model=ResourceResponse, status_code=status.HTTP_201_CREATED)
@@ -829,20 +1259,34 @@ def delete_resource(
 
 
 # Contact submissions endpoints
+CONTACT_SUBMISSION_SORT = [DBContactSubmission.created_at, DBContactSubmission.id]
+
+
+def filter_contact_submissions(query, approved_only: bool = True):
+    """Apply the contact submission list filters to a select()"""
+    if approved_only:
+        query = query.filter(DBContactSubmission.approved == True)
+    return query
+
+
 @app.get("/api/contact-submissions", response_model=List[ContactSubmissionResponse])
 def get_contact_submissions(
+    response: Response,
     approved_only: bool = True,
+    cursor: Optional[str] = None,
+    page_size: Optional[int] = None,
+    include_total: bool = False,
     db: Session = Depends(get_db),
     username: str = Depends(verify_token)
 ):
     """Get all contact submissions"""
-    query = db.query(DBContactSubmission)
-    
-    if approved_only:
-        query = query.filter(DBContactSubmission.approved == True)
+    query = filter_contact_submissions(CONTACT_SUBMISSION_PROJECTION.select(), approved_only)
     
-    submissions = query.order_by(DBContactSubmission.created_at.desc()).all()
-    return [sub.to_dict() for sub in submissions]
+    submissions = paginated(
+        response, db, query, CONTACT_SUBMISSION_SORT, descending=True,
+        cursor=cursor, page_size=page_size, include_total=include_total, scalars=False
+    )
+    return CONTACT_SUBMISSION_PROJECTION.response(submissions, headers=response.headers)
 
 
 @app.post("/api/contact-submissions", response_model=ContactSubmissionResponse, status_code=status.HTTP_201_CREATED)
@@ -909,21 +1353,31 @@ def delete_contact_submission(
 
 
 # User management endpoints
+USER_SORT = [DBUser.username, DBUser.id]
+
+
 @app.get("/api/users", response_model=List[UserResponse])
 def get_users(
+    response: Response,
+    cursor: Optional[str] = None,
+    page_size: Optional[int] = None,
+    include_total: bool = False,
     db: Session = Depends(get_db),
-    username: str = Depends(verify_token)
+    admin: AuthUser = Depends(require_admin)
 ):
     """Get all users (admin only)"""
-    users = db.query(DBUser).order_by(DBUser.username).all()
-    return [user.to_dict() for user in users]
+    users = paginated(
+        response, db, USER_PROJECTION.select(), USER_SORT,
+        cursor=cursor, page_size=page_size, include_total=include_total, scalars=False
+    )
+    return USER_PROJECTION.response(users, headers=response.headers)
 
 
 @app.post("/api/users", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 def create_user(
     user_data: UserCreate,
     db: Session = Depends(get_db),
-    username: str = Depends(verify_token)
+    admin: AuthUser = Depends(require_admin)
 ):
     """Create a new user (admin only)"""
     # Check if username already exists
@@ -939,11 +1393,13 @@ def create_user(
         is_admin=user_data.is_admin,
         is_active=True
     )
-    new_user.set_password(user_data.password)
+    new_user.password_hash = hash_password(user_data.password)
     
     db.add(new_user)
     db.commit()
     db.refresh(new_user)
+    # The username may be cached as unknown (e.g. the environment admin's)
+    user_cache.discard(new_user.username)
     
     return new_user.to_dict()
 
@@ -953,7 +1409,7 @@ def update_user(
     user_id: int,
     user_data: UserUpdate,
     db: Session = Depends(get_db),
-    username: str = Depends(verify_token)
+    admin: AuthUser = Depends(require_admin)
 ):
     """Update a user (admin only)"""
     user = db.query(DBUser).filter(DBUser.id == user_id).first()
@@ -971,11 +1427,13 @@ def update_user(
     if user_data.is_active is not None:
         user.is_active = user_data.is_active
     if user_data.password is not None:
-        user.set_password(user_data.password)
+        user.password_hash = hash_password(user_data.password)
     
     user.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(user)
+    credential_cache.discard(user.username)
+    user_cache.discard(user.username)
     
     return user.to_dict()
 
@@ -984,7 +1442,7 @@ def update_user(
 def delete_user(
     user_id: int,
     db: Session = Depends(get_db),
-    username: str = Depends(verify_token)
+    admin: AuthUser = Depends(require_admin)
 ):
     """Delete a user (admin only)"""
     user = db.query(DBUser).filter(DBUser.id == user_id).first()
@@ -993,35 +1451,30 @@ def delete_user(
         raise HTTPException(status_code=404, detail="User not found")
     
     # Prevent deleting yourself
-    current_user = db.query(DBUser).filter(DBUser.username == username).first()
-    if current_user and current_user.id == user_id:
+    if admin.id == user_id:
         raise HTTPException(status_code=400, detail="Cannot delete your own account")
     
+    deleted_username = user.username
     db.delete(user)
     db.commit()
+    credential_cache.discard(deleted_username)
+    user_cache.discard(deleted_username)
     
     return {"message": "User deleted", "id": user_id}
 
 
 # Contacts endpoints
-@app.get("/api/contacts", response_model=List[ContactResponse])
-def get_contacts(
-    include_deleted: bool = False,
-    location_type: Optional[str] = None,
-    parish: Optional[str] = None,
-    sector: Optional[str] = None,
-    status: Optional[str] = None,
-    db: Session = Depends(get_db),
-    username: Optional[str] = Depends(verify_token_optional)
-):
-    """Get all contacts with optional filters - public endpoint"""
-    query = db.query(DBContact)
-    
+CONTACT_SORT = [DBContact.organization, DBContact.name, DBContact.id]
+
+
+def filter_contacts(query, include_deleted: bool = False, location_type: Optional[str] = None,
+                    parish: Optional[str] = None, sector: Optional[str] = None, status: Optional[str] = None,
+                    bounds=None, circle=None):
+    """Apply the contact list filters to a select()"""
     # Filter out deleted contacts unless specifically requested
     if not include_deleted:
         query = query.filter(DBContact.deleted == False)
     
-    # Apply filters
     if location_type:
         query = query.filter(DBContact.location_type == location_type)
     
@@ -1034,8 +1487,245 @@ def get_contacts(
     if status:
         query = query.filter(DBContact.status == status)
     
-    contacts = query.order_by(DBContact.organization, DBContact.name).all()
-    return [contact.to_dict() for contact in contacts]
+    if bounds:
+        query = within_bbox(query, *bounds)
+    
+    if circle:
+        query = within_radius(query, *circle)
+    
+    return query
+
+
+@app.get("/api/contacts", response_model=List[ContactResponse])
+async def get_contacts(
+    request: Request,
+    response: Response,
+    include_deleted: bool = False,
+    location_type: Optional[str] = None,
+    parish: Optional[str] = None,
+    sector: Optional[str] = None,
+    status: Optional[str] = None,
+    bbox: Optional[str] = None,
+    near: Optional[str] = None,
+    radius_km: Optional[float] = None,
+    cursor: Optional[str] = None,
+    page_size: Optional[int] = None,
+    include_total: bool = False,
+    db = Depends(get_read_db),
+    username: Optional[str] = Depends(verify_token_optional)
+):
+    """
+    Get all contacts with optional filters - public endpoint
+    bbox=min_lon,min_lat,max_lon,max_lat and near=lat,lon&radius_km= filter by location
+    """
+    try:
+        bounds = parse_bbox(bbox) if bbox else None
+        circle = parse_near(near, radius_km) if near else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if radius_km is not None and not near:
+        raise HTTPException(status_code=400, detail="radius_km requires near")
+    
+    query = filter_contacts(
+        CONTACT_PROJECTION.select(), include_deleted, location_type, parish, sector, status, bounds, circle
+    )
+    
+    not_modified, contacts = await read_list(
+        request, response, db, ["contacts"], query, CONTACT_SORT,
+        cursor=cursor, page_size=page_size, include_total=include_total
+    )
+    if not_modified:
+        return not_modified
+    return await CONTACT_PROJECTION.response_async(contacts, headers=response.headers)
+
+
+@app.get("/api/contacts/clusters")
+async def get_contact_clusters(
+    request: Request,
+    response: Response,
+    zoom: int,
+    bbox: Optional[str] = None,
+    db = Depends(get_read_db),
+):
+    """
+    Clustered contact locations for the map - public endpoint
+    Returns one entry per 64 px cell in view: a cluster (centroid, count, sector and
+    status counts, expansion_zoom) or a single contact (contact_id).
+    """
+    if not 0 <= zoom <= 22:
+        raise HTTPException(status_code=400, detail="zoom must be between 0 and 22")
+    try:
+        bounds = parse_bbox(bbox) if bbox else (-90.0, -180.0, 90.0, 180.0)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    not_modified = await check_not_modified(request, response, db, "contacts")
+    if not_modified:
+        return not_modified
+    
+    # Re-read every located contact when the table version moved; apply() re-buckets the ones that differ
+    version = dict(await read_rows(db, table_versions_statement("contacts"))).get("contacts")
+    if version != contact_clusters.version:
+        rows = await read_rows(db, select(
+            DBContact.id, DBContact.lat, DBContact.lon, DBContact.sector, DBContact.status
+        ).where(DBContact.deleted == False, DBContact.lat.is_not(None), DBContact.lon.is_not(None)))
+        await run_in_threadpool(contact_clusters.apply, rows, version)
+    
+    clusters = contact_clusters.query(zoom, *bounds)
+    return Response(
+        content=orjson.dumps({"zoom": zoom, "count": len(clusters), "clusters": clusters}),
+        media_type="application/json",
+        headers=response.headers,
+    )
+
+
+@app.get("/api/contacts/nearest")
+async def get_nearest_contacts(
+    request: Request,
+    response: Response,
+    lat: float,
+    lon: float,
+    k: int = 5,
+    sector: Optional[str] = None,
+    status: Optional[str] = None,
+    db = Depends(get_read_db),
+):
+    """
+    The k located contacts closest to a point, nearest first - public endpoint
+    Each contact carries its great-circle distance_km.
+    """
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise HTTPException(status_code=400, detail="lat must be within -90..90 and lon within -180..180")
+    if not 1 <= k <= NEAREST_MAX_K:
+        raise HTTPException(status_code=400, detail=f"k must be between 1 and {NEAREST_MAX_K}")
+    
+    not_modified = await check_not_modified(request, response, db, "contacts")
+    if not_modified:
+        return not_modified
+    
+    # Rebuild the k-d trees off the event loop when located contacts have changed
+    version = dict(await read_rows(db, table_versions_statement("contacts"))).get("contacts")
+    if version != nearest_contacts.version:
+        rows = await read_rows(db, select(
+            DBContact.id, DBContact.lat, DBContact.lon, DBContact.sector, DBContact.status
+        ).where(
+            DBContact.deleted == False, DBContact.lat.is_not(None), DBContact.lon.is_not(None)
+        ).order_by(DBContact.id))
+        await run_in_threadpool(nearest_contacts.apply, rows, version)
+    
+    matches = nearest_contacts.nearest(lat, lon, k, sector, status)
+    rows = await read_rows(db, CONTACT_PROJECTION.select().where(DBContact.id.in_([cid for cid, _ in matches])))
+    by_id = {row[0]: row for row in rows}
+    contacts = [
+        dict(zip(CONTACT_PROJECTION.keys, by_id[contact_id]), distance_km=round(distance, 3))
+        for contact_id, distance in matches if contact_id in by_id
+    ]
+    return Response(
+        content=orjson.dumps({"lat": lat, "lon": lon, "count": len(contacts), "contacts": contacts}),
+        media_type="application/json",
+        headers=response.headers,
+    )
+
+
+def contact_features_query(location_type: Optional[str] = None, parish: Optional[str] = None,
+                           sector: Optional[str] = None, status: Optional[str] = None, bounds=None):
+    """Live located contacts in list order, for the GeoJSON stream"""
+    query = filter_contacts(
+        CONTACT_FEATURE_PROJECTION.select(), False, location_type, parish, sector, status, bounds
+    ).where(DBContact.lat.is_not(None), DBContact.lon.is_not(None))
+    return query.order_by(*CONTACT_SORT)
+
+
+@app.get("/api/contacts.geojson")
+async def get_contacts_geojson(
+    request: Request,
+    response: Response,
+    location_type: Optional[str] = None,
+    parish: Optional[str] = None,
+    sector: Optional[str] = None,
+    status: Optional[str] = None,
+    bbox: Optional[str] = None,
+    precision: int = 6,
+    db = Depends(get_read_db),
+):
+    """
+    Located contacts as a GeoJSON FeatureCollection of points - public endpoint
+    Streamed from the database cursor; precision sets the coordinate decimals (0-8).
+    """
+    if not 0 <= precision <= 8:
+        raise HTTPException(status_code=400, detail="precision must be between 0 and 8")
+    try:
+        bounds = parse_bbox(bbox) if bbox else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    not_modified = await check_not_modified(request, response, db, "contacts")
+    if not_modified:
+        return not_modified
+    
+    query = contact_features_query(location_type, parish, sector, status, bounds)
+    
+    return StreamingResponse(
+        CONTACT_FEATURE_PROJECTION.stream(query, precision),
+        media_type="application/geo+json",
+        headers=response.headers,
+    )
+
+
+@app.get("/api/geocode")
+def geocode(q: str, parish: Optional[str] = None, limit: int = 5):
+    """
+    Look up a community, development area or parish name offline - public endpoint
+    Matches are fuzzy; "Half Way Tree, St Andrew" or parish= narrows them to a parish.
+    """
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="q is required")
+    if not 1 <= limit <= GEOCODE_MAX_RESULTS:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {GEOCODE_MAX_RESULTS}")
+    
+    results = get_gazetteer().geocode(q, parish, limit)
+    return Response(
+        content=orjson.dumps({"query": q, "count": len(results), "results": results}),
+        media_type="application/json",
+    )
+
+
+def contact_area_counts_query():
+    """Live contact counts per (adm1, adm2, sector, status, location_type)"""
+    columns = (DBContact.adm1_pcode, DBContact.adm2_pcode, DBContact.sector, DBContact.status, DBContact.location_type)
+    return select(*columns, func.count()).where(DBContact.deleted == False).group_by(*columns)
+
+
+@app.get("/api/stats/contacts-by-area")
+def get_contacts_by_area(
+    request: Request,
+    level: str = "adm1",
+    group_by: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Contact counts per parish (adm1) or community (adm2) keyed by pcode - public endpoint
+    Each area carries its name, population and contacts per 10k people;
+    group_by=sector,status,location_type adds a breakdown per field.
+    """
+    if level not in AREA_LEVELS:
+        raise HTTPException(status_code=400, detail=f"level must be one of: {', '.join(AREA_LEVELS)}")
+    try:
+        fields = parse_group_by(group_by)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    boundaries = get_boundary_index()
+    version = get_table_versions(db, "contacts").get("contacts")
+    
+    def load_rows():
+        return db.execute(contact_area_counts_query()).all()
+    
+    etag, body = area_stats.get((version, boundaries.version), load_rows, boundaries.areas, level, fields)
+    
+    response = Response(content=body, media_type="application/json")
+    not_modified = conditional_response(request, response, etag)
+    return not_modified or response
 
 
 @app.post("/api/contacts", response_model=ContactResponse, status_code=status.HTTP_201_CREATED)
@@ -1139,64 +1829,22 @@ def restore_contact(
 
 @app.get("/api/mapaction-feed")
 async def get_mapaction_feed():
-    """Fetch and parse MapAction RSS feed - public endpoint"""
-    feed_url = "https://maps.mapaction.org/feeds/custom.atom?groups=2025-jam-001"
-    
+    """MapAction maps feed (cached with stale-while-revalidate) - public endpoint"""
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(feed_url)
-            response.raise_for_status()
-            
-        # Parse the RSS/Atom feed
-        feed = feedparser.parse(response.text)
-        
-        # Extract relevant information from feed entries
-        maps = []
-        for entry in feed.entries[:20]:  # Limit to 20 most recent entries
-            map_data = {
-                "title": entry.get("title", ""),
-                "summary": entry.get("summary", ""),
-                "link": entry.get("link", ""),
-                "updated": entry.get("updated", ""),
-                "published": entry.get("published", ""),
-                "id": entry.get("id", ""),
-            }
-            
-            # Extract georss box if available
-            if hasattr(entry, 'georss_box'):
-                map_data["georss_box"] = entry.georss_box
-            
-            # Extract enclosure link (package download)
-            if hasattr(entry, 'links'):
-                for link in entry.links:
-                    if link.get('rel') == 'enclosure':
-                        map_data["package_url"] = link.get('href', '')
-                        map_data["package_type"] = link.get('type', '')
-                        break
-            
-            maps.append(map_data)
-        
-        return {
-            "feed_title": feed.feed.get("title", "MapAction Maps"),
-            "feed_updated": feed.feed.get("updated", ""),
-            "maps": maps
-        }
-        
+        return await mapaction_feed.get()
     except httpx.HTTPError as e:
         raise HTTPException(status_code=503, detail=f"Failed to fetch MapAction feed: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing feed: {str(e)}")
 
 
-@app.get("/api/announcements")
-def get_announcements(
-    include_deleted: bool = False,
-    limit: Optional[int] = None,
-    db: Session = Depends(get_db),
-    username: Optional[str] = Depends(verify_token_optional)
-):
-    """Get announcements from database - public endpoint"""
-    query = db.query(DBAnnouncement)
+ANNOUNCEMENT_FIELD_SETS = {"full": ANNOUNCEMENT_PROJECTION, "summary": ANNOUNCEMENT_SUMMARY_PROJECTION}
+
+
+def announcements_query(projection=ANNOUNCEMENT_PROJECTION, include_deleted: bool = False,
+                        limit: Optional[int] = None):
+    """Approved announcements, newest first"""
+    query = projection.select()
     
     # Filter out deleted announcements unless specifically requested
     if not include_deleted:
@@ -1205,27 +1853,66 @@ def get_announcements(
     # Only show approved announcements
     query = query.filter(DBAnnouncement.approved == True)
     
-    # Order by date descending (newest first), then by priority
+    # Order by date descending (newest first)
     query = query.order_by(DBAnnouncement.date.desc())
     
     # Apply limit if specified
     if limit:
         query = query.limit(limit)
     
-    announcements = query.all()
-    
-    # Convert to dict and add summary field
-    result = []
-    for announcement in announcements:
-        data = announcement.to_dict()
-        
-        # Extract summary (first paragraph) from content
-        summary_match = re.search(r'<p>(.*?)</p>', data['content'], re.DOTALL)
-        data['summary'] = summary_match.group(1) if summary_match else ""
-        
-        result.append(data)
+    return query
+
+
+@app.get("/api/announcements")
+async def get_announcements(
+    request: Request,
+    response: Response,
+    include_deleted: bool = False,
+    limit: Optional[int] = None,
+    fields: str = "full",
+    db = Depends(get_read_db),
+    username: Optional[str] = Depends(verify_token_optional)
+):
+    """
+    Get announcements from database - public endpoint.
+    fields=summary leaves out the HTML content (cards show summary/excerpt).
+    """
+    projection = ANNOUNCEMENT_FIELD_SETS.get(fields)
+    if projection is None:
+        raise HTTPException(status_code=400, detail="fields must be 'full' or 'summary'")
     
-    return {"announcements": result}
+    not_modified, rows = await read_list(
+        request, response, db, ["announcements"], announcements_query(projection, include_deleted, limit)
+    )
+    if not_modified:
+        return not_modified
+    # Serialized in the threadpool so a long list does not hold up the event loop
+    content = await run_in_threadpool(lambda: orjson.dumps({"announcements": projection.rows_to_dicts(rows)}))
+    return Response(
+        content=content,
+        media_type="application/json",
+        headers=response.headers,
+    )
+
+
+@app.get("/api/announcements/{announcement_id}", response_model=AnnouncementResponse)
+async def get_announcement(
+    announcement_id: int,
+    db = Depends(get_read_db),
+    username: Optional[str] = Depends(verify_token_optional)
+):
+    """Get one published announcement (full content) - public endpoint"""
+    rows = await read_rows(db, ANNOUNCEMENT_PROJECTION.select().where(
+        DBAnnouncement.id == announcement_id,
+        DBAnnouncement.deleted == False,
+        DBAnnouncement.approved == True,
+    ))
+    if not rows:
+        raise HTTPException(status_code=404, detail="Announcement not found")
+    return Response(
+        content=orjson.dumps(ANNOUNCEMENT_PROJECTION.rows_to_dicts(rows)[0]),
+        media_type="application/json",
+    )
 
 
 @app.post("/api/announcements", response_model=AnnouncementResponse, status_code=status.HTTP_201_CREATED)
@@ -1243,7 +1930,7 @@ def create_announcement(
         except:
             pass
     
-    # Convert tags list to comma-separated string
+    # Convert tags list to comma-separated string (normalized by the model)
     tags_str = ','.join(announcement.tags) if announcement.tags else ''
     
     db_announcement = DBAnnouncement(
@@ -1343,101 +2030,85 @@ def restore_announcement(
     return {"message": "Announcement restored", "id": announcement_id}
 
 
-@app.get("/feeds/announcements.xml")
-def get_announcements_rss(db: Session = Depends(get_db)):
-    """Generate RSS feed for announcements from database - public endpoint"""
-    content = load_content_yaml()
-    
-    # Site information
-    site_title = content.get("title", "IM Hub")
+FEED_MEDIA_TYPES = {
+    "rss": "application/xml",
+    "atom": "application/atom+xml",
+    "json": "application/feed+json",
+}
+
+
+def announcement_feed_response(feed_format: str, request: Request, db: Session):
+    """Serve a pre-rendered announcements feed, rebuilt only when announcements or the site title change"""
+    site_title = load_content_yaml().get("title", "IM Hub")
     site_url = os.getenv("SITE_URL", "http://localhost:8000")
-    
-    # Get announcements from database
-    announcements = db.query(DBAnnouncement).filter(
-        DBAnnouncement.deleted == False,
-        DBAnnouncement.approved == True
-    ).order_by(DBAnnouncement.date.desc()).limit(20).all()
-    
-    if not announcements:
-        # Return empty feed
-        rss = f"""<?xml version="1.0" encoding="UTF-8"?>
-<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">
-  <channel>
-    <title>{site_title} - Announcements</title>
-    <link>{site_url}</link>
-    <description>Latest announcements from {site_title}</description>
-    <atom:link href="{site_url}/feeds/announcements.xml" rel="self" type="application/rss+xml" />
-  </channel>
-</rss>"""
-        return Response(content=rss, media_type="application/xml")
-    
-    # Build RSS feed
-    items_xml = ""
-    for announcement in announcements:
-        data = announcement.to_dict()
-        
-        title = data["title"].replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-        author = (data.get("author") or "IM Team").replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-        content = data["content"]
-        
-        # Get publication date
-        pub_date = formatdate(time.mktime(announcement.date.timetuple()), usegmt=True)
-        
-        # Add priority badge to content
-        priority_emoji = {"high": "🔴", "medium": "🟠", "normal": "🔵", "low": "⚪"}
-        priority_badge = priority_emoji.get(data["priority"], "🔵")
-        
-        categories = ""
-        for tag in data["tags"]:
-            tag_escaped = tag.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-            categories += f"    <category>{tag_escaped}</category>\n"
-        
-        item_url = f"{site_url}/#announcement-{data['id']}"
-        
-        items_xml += f"""  <item>
-    <title>{priority_badge} {title}</title>
-    <link>{item_url}</link>
-    <guid isPermaLink="false">announcement-{data['id']}</guid>
-    <pubDate>{pub_date}</pubDate>
-    <author>{author}</author>
-{categories}    <description><![CDATA[{content}]]></description>
-  </item>
-"""
-    
-    # Get latest update time
-    latest_date = formatdate(time.mktime(announcements[0].date.timetuple()), usegmt=True) if announcements else formatdate(usegmt=True)
-    
-    rss = f"""<?xml version="1.0" encoding="UTF-8"?>
-<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">
-  <channel>
-    <title>{site_title} - Announcements</title>
-    <link>{site_url}</link>
-    <description>Latest announcements and updates from {site_title}</description>
-    <language>en-us</language>
-    <lastBuildDate>{latest_date}</lastBuildDate>
-    <atom:link href="{site_url}/feeds/announcements.xml" rel="self" type="application/rss+xml" />
-{items_xml}  </channel>
-</rss>"""
-    
-    return Response(content=rss, media_type="application/xml")
+    version, changed_at = get_table_version(db, "announcements")
+
+    def load_items():
+        return db.query(DBAnnouncement).filter(
+            DBAnnouncement.deleted == False,
+            DBAnnouncement.approved == True
+        ).order_by(DBAnnouncement.date.desc()).limit(FEED_SIZE).all()
+
+    etag, last_modified, body = announcement_feed.get(
+        (version, site_title, site_url), load_items, feed_format, changed_at
+    )
+
+    response = Response(content=body, media_type=FEED_MEDIA_TYPES[feed_format])
+    not_modified = conditional_response(request, response, etag, last_modified)
+    return not_modified or response
+
+
+@app.get("/feeds/announcements.xml")
+def get_announcements_rss(request: Request, db: Session = Depends(get_db)):
+    """RSS feed for announcements - public endpoint"""
+    return announcement_feed_response("rss", request, db)
+
+
+@app.get("/feeds/announcements.atom")
+def get_announcements_atom(request: Request, db: Session = Depends(get_db)):
+    """Atom feed for announcements - public endpoint"""
+    return announcement_feed_response("atom", request, db)
+
+
+@app.get("/feeds/announcements.json")
+def get_announcements_json_feed(request: Request, db: Session = Depends(get_db)):
+    """JSON Feed for announcements - public endpoint"""
+    return announcement_feed_response("json", request, db)
 
 
 # Links endpoints
+LINK_SORT = [DBLink.created_at, DBLink.id]
+
+
+def filter_links(query, include_deleted: bool = False):
+    """Apply the link list filters to a select()"""
+    # Filter out deleted links unless specifically requested
+    if not include_deleted:
+        query = query.filter(DBLink.deleted == False)
+    return query
+
+
 @app.get("/api/links", response_model=List[LinkResponse])
-def get_links(
+async def get_links(
+    request: Request,
+    response: Response,
     include_deleted: bool = False,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    page_size: Optional[int] = None,
+    include_total: bool = False,
+    db = Depends(get_read_db),
     username: Optional[str] = Depends(verify_token_optional)
 ):
     """Get all links (optionally include deleted) - no auth required for viewing"""""
-    query = db.query(DBLink)
-    
-    # Filter out deleted links unless specifically requested
-    if not include_deleted:
-        query = query.filter(DBLink.deleted == False)
+    query = filter_links(LINK_PROJECTION.select(), include_deleted)
     
-    links = query.order_by(DBLink.created_at.desc()).all()
-    return [link.to_dict() for link in links]
+    not_modified, links = await read_list(
+        request, response, db, ["links"], query, LINK_SORT, descending=True,
+        cursor=cursor, page_size=page_size, include_total=include_total
+    )
+    if not_modified:
+        return not_modified
+    return await LINK_PROJECTION.response_async(links, headers=response.headers)
 
 
 @app.post("/api/links", response_model=LinkResponse, status_code=status.HTTP_201_CREATED)
@@ -1468,6 +2139,7 @@ def create_link(
     db.add(db_link)
     db.commit()
     db.refresh(db_link)
+    link_index.invalidate()
     
     return db_link.to_dict()
 
@@ -1509,6 +2181,7 @@ def update_link(
     link.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(link)
+    link_index.invalidate()
     
     return link.to_dict()
 
@@ -1528,12 +2201,16 @@ def delete_link(
     
     if permanent:
         db.delete(link)
+        db.execute(delete(DBLinkClick).where(DBLinkClick.link_id == link_id))
         db.commit()
+        link_index.invalidate()
+        link_clicks.discard(link_id)
         return {"message": "Link permanently deleted", "id": link_id}
     else:
         link.deleted = True
         link.updated_at = datetime.utcnow()
         db.commit()
+        link_index.invalidate()
         return {"message": "Link marked as deleted", "id": link_id}
 
 
@@ -1552,24 +2229,107 @@ def restore_link(
     link.deleted = False
     link.updated_at = datetime.utcnow()
     db.commit()
+    link_index.invalidate()
     
     return {"message": "Link restored", "id": link_id}
 
 
+# Every click must reach the server to be counted, so no cache may answer a redirect
+# itself; the lookup is served from memory, so this costs a round trip and nothing more
+LINK_CACHE_CONTROL = "private, no-cache"
+
+
+def refresh_link_index(force: bool = False):
+    """Sync the slug index with the links table if its version changed"""
+    db = SessionLocal()
+    try:
+        link_index.refresh(
+            lambda: get_table_versions(db, "links").get("links"),
+            lambda: db.execute(select(DBLink.slug, DBLink.id, DBLink.url).where(DBLink.deleted == False)).all(),
+            force=force,
+        )
+    finally:
+        db.close()
+
+
 @app.get("/link/{slug}")
-def redirect_link(slug: str, db: Session = Depends(get_db)):
+async def redirect_link(slug: str, request: Request):
     """Public endpoint to redirect from short URL to destination - no auth required"""
-    link = db.query(DBLink).filter(
-        DBLink.slug == slug,
-        DBLink.deleted == False
-    ).first()
+    if link_index.stale():
+        await run_in_threadpool(refresh_link_index)
+    link = link_index.lookup(slug)
+    if link is None:
+        # The link may have just been created by another worker
+        await run_in_threadpool(refresh_link_index, True)
+        link = link_index.lookup(slug)
+    
+    if link is None:
+        raise HTTPException(status_code=404, detail="Link not found")
     
+    link_id, url = link
+    # Counted in memory; written in batches by the click flusher
+    link_clicks.record(link_id, request.headers.get("referer"), request.headers.get("user-agent"))
+    
+    # Redirect to the destination URL
+    return RedirectResponse(url=url, status_code=302, headers={"Cache-Control": LINK_CACHE_CONTROL})
+
+
+def write_link_clicks(rows):
+    """
+    Add a batch of click counts to link_clicks in one transaction.
+    Each row is selected through links, so counts of a link that another worker has
+    permanently deleted since the click are dropped instead of left for a reused id.
+    """
+    columns = ["link_id", "hour", "referrer", "agent", "clicks"]
+    existing = select(
+        DBLink.id, *(bindparam(name, type_=DBLinkClick.__table__.c[name].type) for name in columns[1:])
+    ).where(DBLink.id == bindparam("link_id"))
+    statement = sqlite_insert(DBLinkClick).from_select(columns, existing)
+    statement = statement.on_conflict_do_update(
+        index_elements=["link_id", "hour", "referrer", "agent"],
+        set_={"clicks": DBLinkClick.clicks + statement.excluded.clicks},
+    )
+    with engine.begin() as conn:
+        conn.execute(statement, rows)
+
+
+def flush_link_clicks():
+    try:
+        link_clicks.flush(write_link_clicks)
+    except Exception as e:
+        print(f"Could not write link clicks (kept for the next flush): {e}")
+
+
+async def flush_link_clicks_periodically():
+    while True:
+        await asyncio.sleep(LINK_CLICK_FLUSH_INTERVAL)
+        await run_in_threadpool(flush_link_clicks)
+
+
+@app.get("/api/links/{link_id}/stats")
+def get_link_stats(
+    link_id: int,
+    hours: int = 168,
+    db: Session = Depends(get_db),
+    username: str = Depends(verify_token)
+):
+    """Click counts for a link: totals, hourly series for the last `hours` hours, referrers and user agents"""
+    if not 1 <= hours <= 24 * 90:
+        raise HTTPException(status_code=400, detail="hours must be between 1 and 2160")
+    link = db.execute(select(DBLink.id, DBLink.slug).where(DBLink.id == link_id)).first()
     if not link:
         raise HTTPException(status_code=404, detail="Link not found")
     
-    # Redirect to the destination URL
-    from fastapi.responses import RedirectResponse
-    return RedirectResponse(url=link.url, status_code=302)
+    rows = db.execute(
+        select(DBLinkClick.hour, DBLinkClick.referrer, DBLinkClick.agent, DBLinkClick.clicks)
+        .where(DBLinkClick.link_id == link_id)
+    ).all()
+    pending = link_clicks.pending_for(link_id)
+    now = datetime.utcnow()
+    since = now.replace(minute=0, second=0, microsecond=0) - timedelta(hours=hours - 1)
+    
+    stats = summarize_clicks(list(rows) + pending, since)
+    return {"link_id": link.id, "slug": link.slug, **stats, "pending_clicks": sum(row[3] for row in pending)}
 
 
 # Serve frontend static files in production
@@ -1578,25 +2338,25 @@ print(f"Looking for frontend at: {frontend_dist}")
 print(f"Frontend dist exists: {frontend_dist.exists()}")
 if frontend_dist.exists():
     print(f"Frontend dist contents: {list(frontend_dist.iterdir())}")
-    app.mount("/assets", StaticFiles(directory=str(frontend_dist / "assets")), name="assets")
+    app.mount("/assets", PrecompressedStaticFiles(directory=str(frontend_dist / "assets")), name="assets")
     
     @app.get("/")
-    async def serve_root():
+    async def serve_root(request: Request):
         """Serve frontend index.html at root"""
         index_path = frontend_dist / "index.html"
         print(f"Serving index.html from: {index_path}, exists: {index_path.exists()}")
-        return FileResponse(index_path)
+        return file_response(request.headers, index_path)
     
     @app.get("/{full_path:path}")
-    async def serve_frontend(full_path: str):
+    async def serve_frontend(full_path: str, request: Request):
         """Serve frontend for all non-API routes"""
         if full_path.startswith("api/") or full_path.startswith("feeds/") or full_path.startswith("link/"):
             raise HTTPException(status_code=404, detail="API endpoint not found")
         
         file_path = frontend_dist / full_path
         if file_path.is_file():
-            return FileResponse(file_path)
-        return FileResponse(frontend_dist / "index.html")
+            return file_response(request.headers, file_path)
+        return file_response(request.headers, frontend_dist / "index.html")
 else:
     print(f"WARNING: Frontend dist directory not found at {frontend_dist}")
     print(f"Current working directory: {Path.cwd()}")
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Migration script for stored announcement summaries
+Adds announcements.summary/excerpt and recomputes them, with normalized tags, for every
+announcement. The app backfills rows that have no summary on startup (init_db); run
+this to recompute all rows, e.g. after changing how summaries or excerpts are built.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import text
+from database import engine, init_db
+from announcement_text import summary_html, plain_excerpt, normalize_tags
+
+
+def migrate_announcement_summaries():
+    """Recompute summary, excerpt and tags for every announcement and report what changed"""
+    init_db()
+
+    with engine.begin() as conn:
+        rows = conn.execute(text("SELECT id, title, content, summary, excerpt, tags FROM announcements ORDER BY id")).all()
+
+        updates = []
+        for announcement_id, title, content, summary, excerpt, tags in rows:
+            new = (summary_html(content), plain_excerpt(content), normalize_tags(tags))
+            if new != (summary, excerpt, tags):
+                updates.append({"id": announcement_id, "summary": new[0], "excerpt": new[1], "tags": new[2]})
+                print(f"  ✓ #{announcement_id} {title}")
+                if not new[0]:
+                    print(f"    (no <p> paragraph - summary is empty)")
+        if updates:
+            conn.execute(text(
+                "UPDATE announcements SET summary = :summary, excerpt = :excerpt, tags = :tags WHERE id = :id"
+            ), updates)
+
+    print(f"\n{'='*60}")
+    print(f"Migration complete!")
+    print(f"  Announcements: {len(rows)}")
+    print(f"  Updated: {len(updates)}")
+    print(f"{'='*60}")
+
+
+if __name__ == "__main__":
+    print("="*60)
+    print("Announcement Summaries Migration Script")
+    print("="*60)
+
+    migrate_announcement_summaries()
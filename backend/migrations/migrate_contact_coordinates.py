@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Migration script for numeric contact coordinates
+Adds contacts.lat/lon, backfills them from the latitude/longitude strings and builds
+the contacts_rtree spatial index. The app does the same on startup (init_db); run this
+to see which contacts have coordinates that could not be parsed.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import text
+from database import engine, init_db
+
+
+def migrate_contact_coordinates():
+    """Backfill numeric coordinates and report the rows that could not be parsed"""
+    init_db()
+
+    with engine.connect() as conn:
+        located = conn.execute(text("SELECT count(*) FROM contacts WHERE lat IS NOT NULL AND lon IS NOT NULL")).scalar()
+        indexed = conn.execute(text("SELECT count(*) FROM contacts_rtree")).scalar()
+        invalid = conn.execute(text(
+            "SELECT id, name, latitude, longitude FROM contacts "
+            "WHERE (lat IS NULL AND trim(coalesce(latitude, '')) <> '') "
+            "OR (lon IS NULL AND trim(coalesce(longitude, '')) <> '') "
+            "ORDER BY id"
+        )).all()
+
+    print(f"\n{'='*60}")
+    print(f"Migration complete!")
+    print(f"  Contacts with coordinates: {located}")
+    print(f"  Spatial index entries: {indexed}")
+    print(f"  Unparseable coordinates: {len(invalid)}")
+    for contact_id, name, latitude, longitude in invalid:
+        print(f"    #{contact_id} {name}: latitude={latitude!r} longitude={longitude!r}")
+    print(f"{'='*60}")
+
+    if located != indexed:
+        print("✗ Spatial index is out of sync with contacts.lat/lon")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    print("="*60)
+    print("Contact Coordinates Migration Script")
+    print("="*60)
+
+    migrate_contact_coordinates()
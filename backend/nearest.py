@@ -0,0 +1,153 @@
+"""
+Nearest-contact (k-NN) search
+Located contacts are held in static k-d trees over 3D unit vectors, where straight-line
+distance orders points exactly as great-circle distance does. A query visits nodes
+best-first by the distance to their bounding box and stops once the k-th result is
+closer than every box left, then reports haversine distances. There is one tree for all
+contacts and one per sector, so a sector filter does not have to skip other sectors'
+points. The trees are rebuilt when the contacts table version changes and the located
+contacts differ; queries keep using the previous trees until the new ones are swapped in.
+"""
+
+from heapq import heappush, heappop, heapreplace
+from math import radians, cos, sin
+from typing import Optional
+import threading
+import time
+
+from geo import haversine_km
+
+LEAF_SIZE = 16
+MAX_K = 50
+
+
+def unit_vector(lat: float, lon: float):
+    phi, lam = radians(lat), radians(lon)
+    return cos(phi) * cos(lam), cos(phi) * sin(lam), sin(phi)
+
+
+class KDTree:
+    """Static k-d tree over points (x, y, z, contact_id, lat, lon, status)"""
+
+    def __init__(self, points):
+        self.points = list(points)
+        # Per node: index range into points, bounding box and (left, right) or None for a leaf
+        self._ranges = []
+        self._boxes = []
+        self._children = []
+        if self.points:
+            self._build(0, len(self.points))
+
+    def __len__(self):
+        return len(self.points)
+
+    def _build(self, lo: int, hi: int) -> int:
+        points = self.points[lo:hi]
+        columns = [[point[axis] for point in points] for axis in range(3)]
+        box = tuple(min(column) for column in columns) + tuple(max(column) for column in columns)
+
+        node = len(self._ranges)
+        self._ranges.append((lo, hi))
+        self._boxes.append(box)
+        self._children.append(None)
+
+        if hi - lo > LEAF_SIZE:
+            axis = max(range(3), key=lambda a: box[a + 3] - box[a])
+            self.points[lo:hi] = sorted(points, key=lambda point: point[axis])
+            mid = (lo + hi) // 2
+            self._children[node] = (self._build(lo, mid), self._build(mid, hi))
+        return node
+
+    def _box_distance2(self, node: int, x: float, y: float, z: float) -> float:
+        min_x, min_y, min_z, max_x, max_y, max_z = self._boxes[node]
+        dx = min_x - x if x < min_x else x - max_x if x > max_x else 0.0
+        dy = min_y - y if y < min_y else y - max_y if y > max_y else 0.0
+        dz = min_z - z if z < min_z else z - max_z if z > max_z else 0.0
+        return dx * dx + dy * dy + dz * dz
+
+    def nearest(self, x: float, y: float, z: float, k: int, status: Optional[str] = None) -> list:
+        """The k points closest to a unit vector, optionally only with a given status"""
+        if not self.points:
+            return []
+        points = self.points
+        best = []  # max-heap of (-distance², index)
+        queue = [(self._box_distance2(0, x, y, z), 0)]
+        while queue:
+            distance2, node = heappop(queue)
+            if len(best) == k and distance2 > -best[0][0]:
+                break
+            children = self._children[node]
+            if children is not None:
+                for child in children:
+                    heappush(queue, (self._box_distance2(child, x, y, z), child))
+                continue
+            lo, hi = self._ranges[node]
+            for i in range(lo, hi):
+                point = points[i]
+                if status is not None and point[6] != status:
+                    continue
+                dx, dy, dz = point[0] - x, point[1] - y, point[2] - z
+                d2 = dx * dx + dy * dy + dz * dz
+                if len(best) < k:
+                    heappush(best, (-d2, i))
+                elif d2 < -best[0][0]:
+                    heapreplace(best, (-d2, i))
+        return [points[i] for _, i in sorted(best, key=lambda item: (-item[0], points[item[1]][3]))]
+
+
+class NearestIndex:
+    """k-NN over located contacts, kept in sync with the contacts table version"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # None -> all contacts, sector -> that sector's contacts
+        self._trees = {None: KDTree([])}
+        self._rows = None
+        self.version = None
+
+        self.build_count = 0
+        self.build_seconds = 0.0
+
+    def apply(self, rows, version):
+        """
+        Rebuild from rows of (id, lat, lon, sector, status), ordered by id, unless
+        they are the rows the current trees were built from.
+        """
+        rows = [tuple(row) for row in rows]
+        with self._lock:
+            if rows != self._rows:
+                started = time.perf_counter()
+                by_sector = {}
+                everything = []
+                for contact_id, lat, lon, sector, status in rows:
+                    point = unit_vector(lat, lon) + (contact_id, lat, lon, status)
+                    everything.append(point)
+                    by_sector.setdefault(sector, []).append(point)
+                trees = {None: KDTree(everything)}
+                for sector, points in by_sector.items():
+                    if sector is not None:
+                        trees[sector] = KDTree(points)
+                self._trees = trees
+                self._rows = rows
+                self.build_count += 1
+                self.build_seconds = time.perf_counter() - started
+            self.version = version
+
+    def nearest(self, lat: float, lon: float, k: int, sector: Optional[str] = None,
+                status: Optional[str] = None) -> list:
+        """(contact_id, distance_km) of the k closest contacts, nearest first"""
+        tree = self._trees.get(sector) if sector else self._trees[None]
+        if tree is None:
+            return []
+        points = tree.nearest(*unit_vector(lat, lon), k, status)
+        return [(point[3], haversine_km(lat, lon, point[4], point[5])) for point in points]
+
+    def stats(self) -> dict:
+        """Index statistics for monitoring"""
+        return {
+            "contacts": len(self._trees[None]),
+            "sectors": len(self._trees) - 1,
+            "version": self.version,
+            "build_count": self.build_count,
+            "build_seconds": round(self.build_seconds, 3),
+        }
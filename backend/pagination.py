@@ -0,0 +1,147 @@
+"""
+Keyset (cursor) pagination for list endpoints
+Pages are selected with a row-value comparison on the endpoint's sort key, so page N
+costs the same as page 1 and inserts/deletes between requests never shift rows.
+"""
+
+from sqlalchemy import select, func, tuple_, literal
+from datetime import datetime
+from typing import Optional
+import base64
+import json
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+class InvalidPage(ValueError):
+    """Raised for pagination parameters a list endpoint cannot use (answered with 400)"""
+
+
+class InvalidCursor(InvalidPage):
+    """Raised when a cursor token cannot be decoded for the requested sort key"""
+
+
+def encode_cursor(values) -> str:
+    """Encode sort key values of the last row into an opaque URL-safe token"""
+    data = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_columns) -> list:
+    """Decode a cursor token back into typed sort key values"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise InvalidCursor("Invalid cursor")
+
+    if not isinstance(data, list) or len(data) != len(sort_columns):
+        raise InvalidCursor("Invalid cursor")
+
+    return [_cursor_value(column, value) for column, value in zip(sort_columns, data)]
+
+
+def _cursor_value(column, value):
+    """A decoded cursor value checked against (and converted to) its column's Python type"""
+    if value is None:
+        if column.nullable:
+            return None
+        raise InvalidCursor("Invalid cursor")
+    python_type = column.type.python_type
+    if python_type is datetime:
+        try:
+            return datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise InvalidCursor("Invalid cursor")
+    # bool is an int subclass, so it is matched exactly
+    if python_type is bool:
+        valid = isinstance(value, bool)
+    elif python_type is int:
+        valid = isinstance(value, int) and not isinstance(value, bool)
+    elif python_type is float:
+        valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+        value = float(value) if valid else value
+    else:
+        valid = python_type is str and isinstance(value, str)
+    if not valid:
+        raise InvalidCursor("Invalid cursor")
+    return value
+
+
+def page_statement(stmt, sort_columns, descending: bool = False,
+                   cursor: Optional[str] = None, page_size: Optional[int] = None):
+    """
+    Apply ordering and the keyset condition to a select() statement.
+
+    sort_columns must end with a unique column (the primary key) so the key is total.
+    Pagination only kicks in when page_size or cursor is given; otherwise every row is
+    returned so existing clients keep working.
+
+    Returns (statement, page_size) - page_size is None when the full list is requested.
+    """
+    stmt = stmt.order_by(*[column.desc() if descending else column for column in sort_columns])
+
+    if page_size is None and cursor is None:
+        return stmt, None
+
+    if page_size is not None and page_size < 1:
+        raise InvalidPage("page_size must be at least 1")
+    page_size = min(page_size or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+
+    if cursor:
+        values = decode_cursor(cursor, sort_columns)
+        key = tuple_(*sort_columns)
+        bound = tuple_(*[literal(value, type_=column.type) for column, value in zip(sort_columns, values)])
+        stmt = stmt.where(key < bound if descending else key > bound)
+
+    # Fetch one extra row to know whether there is a next page
+    return stmt.limit(page_size + 1), page_size
+
+
+def count_statement(stmt):
+    """SELECT count(*) over the filtered (unordered, unpaged) statement"""
+    return select(func.count()).select_from(stmt.order_by(None).subquery())
+
+
+def finish_page(rows, sort_columns, page_size: Optional[int]):
+    """Trim the extra row and build the next cursor. Returns (rows, next_cursor)"""
+    if page_size is None or len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    return rows, encode_cursor([getattr(rows[-1], column.key) for column in sort_columns])
+
+
+def paginate(db, stmt, sort_columns, descending: bool = False, cursor: Optional[str] = None,
+             page_size: Optional[int] = None, include_total: bool = False, scalars: bool = True):
+    """
+    Run a keyset-paginated select() on a sync Session.
+    Returns ORM objects, or row tuples for column selects when scalars is False.
+    Returns (rows, next_cursor, total) - total is None unless include_total is set.
+    """
+    page, page_size = page_statement(stmt, sort_columns, descending, cursor, page_size)
+    total = db.execute(count_statement(stmt)).scalar() if include_total else None
+    result = db.execute(page)
+    rows = result.scalars().all() if scalars else result.all()
+    rows, next_cursor = finish_page(rows, sort_columns, page_size)
+    return rows, next_cursor, total
+
+
+async def paginate_async(db, stmt, sort_columns, descending: bool = False, cursor: Optional[str] = None,
+                         page_size: Optional[int] = None, include_total: bool = False, scalars: bool = True):
+    """Same as paginate() for an AsyncSession"""
+    page, page_size = page_statement(stmt, sort_columns, descending, cursor, page_size)
+    total = (await db.execute(count_statement(stmt))).scalar() if include_total else None
+    result = await db.execute(page)
+    rows = result.scalars().all() if scalars else result.all()
+    rows, next_cursor = finish_page(rows, sort_columns, page_size)
+    return rows, next_cursor, total
+
+
+def set_page_headers(response, next_cursor: Optional[str], total: Optional[int]):
+    """Expose pagination state as response headers (the body stays a plain JSON array)"""
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
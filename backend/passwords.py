@@ -0,0 +1,199 @@
+"""
+Password hashing off the request threadpool
+bcrypt runs in a small dedicated process pool with a bounded queue, so a burst of logins
+uses at most PASSWORD_WORKERS cores and is turned away with 503 once the queue is full,
+instead of tying up the threads every other sync endpoint needs. Successful logins are
+remembered for a short time (keyed by username and password hash, storing only an HMAC
+of the password under a per-process key), so repeat logins skip bcrypt entirely.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from hashlib import sha256
+import asyncio
+import hmac
+import multiprocessing
+import os
+import threading
+import time
+
+import bcrypt
+
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", str(min(2, os.cpu_count() or 1))))
+# Checks waiting for a worker beyond this are rejected (each takes ~250 ms)
+PASSWORD_QUEUE_SIZE = int(os.getenv("PASSWORD_QUEUE_SIZE", "8"))
+
+CREDENTIAL_CACHE_TTL = int(os.getenv("CREDENTIAL_CACHE_TTL", "300"))
+CREDENTIAL_CACHE_SIZE = 1024
+
+
+class PasswordPoolBusy(Exception):
+    """The password pool's queue is full"""
+
+
+# --- Worker functions (run in the pool processes) ---
+
+def _checkpw(password: bytes, password_hash: bytes):
+    started = time.time()
+    return bcrypt.checkpw(password, password_hash), started, time.time()
+
+
+def _hashpw(password: bytes):
+    started = time.time()
+    return bcrypt.hashpw(password, bcrypt.gensalt()).decode("utf-8"), started, time.time()
+
+
+class PasswordPool:
+    """Bounded process pool for bcrypt, started on first use"""
+
+    def __init__(self, workers: int = PASSWORD_WORKERS, queue_size: int = PASSWORD_QUEUE_SIZE):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._executor = None
+        self._lock = threading.Lock()
+
+        self.pending = 0
+        self.max_pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.queue_seconds = 0.0
+        self.max_queue_seconds = 0.0
+        self.run_seconds = 0.0
+
+    def _submit(self, fn, *args):
+        with self._lock:
+            if self.pending >= self.workers + self.queue_size:
+                self.rejected += 1
+                raise PasswordPoolBusy()
+            submitted = time.time()
+            try:
+                executor = self._start()
+                future = executor.submit(fn, *args)
+            except BrokenProcessPool:
+                # A worker died while the pool was idle (e.g. killed for memory); a broken
+                # pool never recovers, so retry once on a fresh one
+                self._discard(executor)
+                executor = self._start()
+                future = executor.submit(fn, *args)
+            self.pending += 1
+            self.max_pending = max(self.max_pending, self.pending)
+        # Outside the lock: the callback runs at once if the future is already done
+        future.add_done_callback(lambda done: self._finished(done, submitted, executor))
+        return future
+
+    def _start(self) -> ProcessPoolExecutor:
+        """The current executor, created if there is none (call with the lock held)"""
+        if self._executor is None:
+            # spawn: forking a process that runs threads and an event loop is unsafe
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    def _discard(self, executor: ProcessPoolExecutor):
+        """Drop a broken executor so the next submit starts a fresh pool (call with the lock held)"""
+        if self._executor is executor:
+            self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _finished(self, future, submitted: float, executor: ProcessPoolExecutor):
+        with self._lock:
+            self.pending -= 1
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                if isinstance(future.exception(), BrokenProcessPool):
+                    # A worker died mid-check; start a fresh pool on next use
+                    self._discard(executor)
+                return
+            _, started, finished = future.result()
+            self.completed += 1
+            self.queue_seconds += started - submitted
+            self.max_queue_seconds = max(self.max_queue_seconds, started - submitted)
+            self.run_seconds += finished - started
+
+    async def check(self, password: str, password_hash: str) -> bool:
+        """Verify a password against a bcrypt hash without blocking the event loop"""
+        future = self._submit(_checkpw, password.encode("utf-8"), password_hash.encode("utf-8"))
+        matches, _, _ = await asyncio.wrap_future(future)
+        return matches
+
+    def hash(self, password: str) -> str:
+        """bcrypt hash of a password (blocks the calling thread, not the CPU it runs on)"""
+        password_hash, _, _ = self._submit(_hashpw, password.encode("utf-8")).result()
+        return password_hash
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        """Pool statistics for monitoring"""
+        completed = self.completed or 1
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_queue_ms": round(self.queue_seconds * 1000 / completed, 1),
+            "max_queue_ms": round(self.max_queue_seconds * 1000, 1),
+            "avg_run_ms": round(self.run_seconds * 1000 / completed, 1),
+        }
+
+
+class CredentialCache:
+    """Recently verified (username, password hash) pairs, held in memory for ttl seconds"""
+
+    def __init__(self, ttl: int = CREDENTIAL_CACHE_TTL, max_size: int = CREDENTIAL_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        # Only an HMAC of the password is kept, under a key that never leaves this process
+        self._key = os.urandom(32)
+        self._lock = threading.Lock()
+        # (username, password_hash) -> (hmac digest, expires at)
+        self._entries = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def _digest(self, password: str) -> bytes:
+        return hmac.new(self._key, password.encode("utf-8"), sha256).digest()
+
+    def check(self, username: str, password_hash: str, password: str) -> bool:
+        """True if this password was verified for this user and hash within the TTL"""
+        if not self.ttl:
+            return False
+        key = (username, password_hash)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+        if entry is not None and hmac.compare_digest(entry[0], self._digest(password)):
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def add(self, username: str, password_hash: str, password: str):
+        if not self.ttl:
+            return
+        key = (username, password_hash)
+        with self._lock:
+            self._entries[key] = (self._digest(password), time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, username: str):
+        """Forget every entry for a user (password change, deactivation, deletion)"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == username]:
+                del self._entries[key]
+
+    def stats(self) -> dict:
+        """Cache statistics for monitoring"""
+        return {"entries": len(self._entries), "ttl": self.ttl, "hits": self.hits, "misses": self.misses}
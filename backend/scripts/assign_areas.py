@@ -0,0 +1,104 @@
+"""
+Assign parish/community pcodes (contacts.adm1_pcode / adm2_pcode) to existing contacts
+by point-in-polygon lookup against geojson/jamaica-communities.geojson.
+New and moved contacts are assigned on save; run this once after upgrading and again
+after replacing the communities boundary file.
+
+Usage:
+    cd backend
+    python scripts/assign_areas.py                 # write pcodes, fill blank parish/community
+    python scripts/assign_areas.py --dry-run       # report only
+    python scripts/assign_areas.py --show-mismatches 20
+"""
+
+from pathlib import Path
+import argparse
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import text
+
+from database import engine, init_db
+from boundaries import get_boundary_index
+from gazetteer import normalize_name
+
+BATCH_SIZE = 5000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="report changes without writing them")
+    parser.add_argument("--show-mismatches", type=int, default=0, metavar="N",
+                        help="list up to N contacts whose parish text disagrees with their coordinates")
+    args = parser.parse_args()
+
+    init_db()
+
+    started = time.perf_counter()
+    index = get_boundary_index()
+    print(f"Loaded {index.polygon_count} community polygons in {time.perf_counter() - started:.2f}s")
+
+    started = time.perf_counter()
+    with engine.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT id, lat, lon, parish, community, adm1_pcode, adm2_pcode FROM contacts"
+        )).all()
+    read_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    updates = []
+    unlocated = outside = filled_names = 0
+    mismatches = []
+    for contact_id, lat, lon, parish, community, adm1_pcode, adm2_pcode in rows:
+        if lat is None or lon is None:
+            unlocated += 1
+            area = None
+        else:
+            area = index.lookup(lat, lon)
+            if area is None:
+                outside += 1
+
+        new_adm1 = area["adm1_pcode"] if area else None
+        new_adm2 = area["adm2_pcode"] if area else None
+        new_parish, new_community = parish, community
+        if area:
+            if not (parish or "").strip():
+                new_parish = area["adm1_name"]
+            if not (community or "").strip():
+                new_community = area["adm2_name"]
+            if (parish or "").strip() and normalize_name(parish) != normalize_name(area["adm1_name"]):
+                mismatches.append((contact_id, parish, area["adm1_name"]))
+
+        if (new_adm1, new_adm2, new_parish, new_community) != (adm1_pcode, adm2_pcode, parish, community):
+            if (new_parish, new_community) != (parish, community):
+                filled_names += 1
+            updates.append({
+                "id": contact_id, "adm1_pcode": new_adm1, "adm2_pcode": new_adm2,
+                "parish": new_parish, "community": new_community,
+            })
+    lookup_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    if updates and not args.dry_run:
+        with engine.begin() as conn:
+            statement = text(
+                "UPDATE contacts SET adm1_pcode = :adm1_pcode, adm2_pcode = :adm2_pcode, "
+                "parish = :parish, community = :community WHERE id = :id"
+            )
+            for start in range(0, len(updates), BATCH_SIZE):
+                conn.execute(statement, updates[start:start + BATCH_SIZE])
+    write_time = time.perf_counter() - started
+
+    print(f"Contacts: {len(rows)} ({unlocated} without coordinates, {outside} outside every community)")
+    print(f"{'Would update' if args.dry_run else 'Updated'} {len(updates)} contacts "
+          f"({filled_names} with a blank parish/community filled in)")
+    print(f"Parish text disagrees with coordinates: {len(mismatches)}")
+    for contact_id, parish, resolved in mismatches[:args.show_mismatches]:
+        print(f"  contact {contact_id}: parish '{parish}', coordinates in {resolved}")
+    print(f"Timings: read {read_time:.2f}s, lookup {lookup_time:.2f}s, write {write_time:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
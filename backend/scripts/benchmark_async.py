@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Benchmark the sync and async (DB_ASYNC) database modes
+Starts the API twice against a scratch database - once per mode - and fires
+concurrent requests at the contact and announcement list endpoints.
+
+Usage:
+    cd backend
+    python scripts/benchmark_async.py [--contacts 2000] [--requests 400] [--concurrency 100]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+ENDPOINTS = ["/api/contacts", "/api/announcements", "/api/health"]
+
+
+def seed_database(db_path: Path, contact_count: int):
+    """Create a scratch database with contact_count contacts"""
+    env = dict(os.environ, DATABASE_PATH=str(db_path))
+    code = f"""
+from database import init_db, seed_initial_data, SessionLocal, Contact
+init_db()
+seed_initial_data()
+db = SessionLocal()
+db.add_all([
+    Contact(name=f"Responder {{i}}", organization=f"Org {{i % 50}}", sector="WASH",
+            parish="Kingston", latitude="17.97", longitude="-76.79")
+    for i in range({contact_count})
+])
+db.commit()
+db.close()
+"""
+    subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, env=env, check=True,
+                   stdout=subprocess.DEVNULL)
+
+
+def start_server(db_path: Path, port: int, async_mode: bool, threads: int):
+    env = dict(
+        os.environ,
+        DATABASE_PATH=str(db_path),
+        DB_ASYNC="true" if async_mode else "false",
+        THREADPOOL_SIZE=str(threads),
+    )
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_until_ready(base_url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f"{base_url}/api/health")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError("Server did not start")
+
+
+async def run_load(base_url: str, path: str, total: int, concurrency: int):
+    """Fire total requests with the given concurrency; return (req/s, p50 ms, p95 ms, errors)"""
+    latencies = []
+    errors = 0
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        async def worker():
+            nonlocal errors
+            while not queue.empty():
+                queue.get_nowait()
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    return total / elapsed, statistics.median(latencies), p95, errors
+
+
+async def probe_during_load(base_url: str, path: str, total: int, concurrency: int):
+    """Median /api/health latency (ms) measured while path is under load"""
+    probes = []
+
+    async def probe():
+        async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+            while not load.done():
+                started = time.perf_counter()
+                await client.get("/api/health")
+                probes.append((time.perf_counter() - started) * 1000)
+                await asyncio.sleep(0.05)
+
+    load = asyncio.ensure_future(run_load(base_url, path, total, concurrency))
+    await asyncio.gather(load, probe())
+    return statistics.median(probes) if probes else float("nan")
+
+
+async def benchmark(args):
+    results = {}
+    health = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        print(f"Seeding {args.contacts} contacts...")
+        seed_database(db_path, args.contacts)
+
+        for async_mode in (False, True):
+            mode = "async" if async_mode else "sync"
+            server = start_server(db_path, args.port, async_mode, args.threads)
+            base_url = f"http://127.0.0.1:{args.port}"
+            try:
+                await wait_until_ready(base_url)
+                for path in ENDPOINTS:
+                    results[(mode, path)] = await run_load(base_url, path, args.requests, args.concurrency)
+                health[mode] = await probe_during_load(base_url, "/api/contacts", args.requests, args.concurrency)
+            finally:
+                server.terminate()
+                server.wait()
+
+    print(f"\n{'mode':<6} {'endpoint':<20} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+    for (mode, path), (rps, p50, p95, errors) in results.items():
+        print(f"{mode:<6} {path:<20} {rps:>8.1f} {p50:>8.1f} {p95:>8.1f} {errors:>7}")
+
+    print("\n/api/health median latency while /api/contacts is under load:")
+    for mode, p50 in health.items():
+        print(f"  {mode:<6} {p50:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark sync vs async database mode")
+    parser.add_argument("--contacts", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--threads", type=int, default=40, help="THREADPOOL_SIZE for the server")
+    parser.add_argument("--port", type=int, default=8765)
+    asyncio.run(benchmark(parser.parse_args()))
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Load test: short-link redirects with click counting
+Starts the API against a scratch database with a long click flush interval, fires a
+burst of /link/{slug} redirects, and checks that the burst wrote nothing to SQLite (the
+database and WAL files are unchanged and link_clicks is empty). Then stops the server
+and checks that the shutdown flush stored exactly one click per redirect.
+
+Usage:
+    cd backend
+    python scripts/benchmark_clicks.py [--links 20] [--requests 20000] [--concurrency 50]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+USER_AGENTS = [
+    "WhatsApp/2.23.20.0 A",
+    "Mozilla/5.0 (Linux; Android 13) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Mobile Safari/537.36",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1",
+    "facebookexternalhit/1.1",
+]
+REFERRERS = [None, "https://www.facebook.com/", "android-app://com.whatsapp/", "https://t.co/abc"]
+
+
+def seed_links(db_path: Path, link_count: int):
+    """Create a scratch database with link_count links (slugs link0, link1, ...)"""
+    env = dict(os.environ, DATABASE_PATH=str(db_path))
+    code = f"""
+from database import init_db, seed_initial_data, SessionLocal, Link
+init_db()
+seed_initial_data()
+db = SessionLocal()
+for i in range({link_count}):
+    db.add(Link(title=f"Link {{i}}", slug=f"link{{i}}", url=f"https://example.org/{{i}}"))
+db.commit()
+db.close()
+"""
+    subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, env=env, check=True,
+                   stdout=subprocess.DEVNULL)
+
+
+def start_server(db_path: Path, port: int):
+    env = dict(os.environ, DATABASE_PATH=str(db_path), LINK_CLICK_FLUSH_INTERVAL="3600")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_until_ready(base_url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f"{base_url}/api/health")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError("Server did not start")
+
+
+def file_state(db_path: Path):
+    """(size, mtime) of the database and its WAL file"""
+    state = []
+    for path in (db_path, Path(f"{db_path}-wal")):
+        stat = path.stat() if path.exists() else None
+        state.append((stat.st_size, stat.st_mtime_ns) if stat else None)
+    return tuple(state)
+
+
+def stored_clicks(db_path: Path) -> int:
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT COALESCE(SUM(clicks), 0) FROM link_clicks").fetchone()[0]
+    finally:
+        conn.close()
+
+
+async def redirect_burst(base_url: str, links: int, total: int, concurrency: int):
+    """Fire total redirects; return latencies (ms)"""
+    latencies = []
+    remaining = iter(range(total))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def worker():
+            for _ in remaining:
+                headers = {"user-agent": random.choice(USER_AGENTS)}
+                referrer = random.choice(REFERRERS)
+                if referrer:
+                    headers["referer"] = referrer
+                started = time.perf_counter()
+                response = await client.get(f"/link/link{random.randrange(links)}", headers=headers)
+                latencies.append((time.perf_counter() - started) * 1000)
+                if response.status_code != 302:
+                    raise RuntimeError(f"Redirect returned {response.status_code}")
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+async def benchmark(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        print(f"Seeding {args.links} links...")
+        seed_links(db_path, args.links)
+
+        server = start_server(db_path, args.port)
+        base_url = f"http://127.0.0.1:{args.port}"
+        try:
+            await wait_until_ready(base_url)
+            # Warm up: loads the slug index
+            await redirect_burst(base_url, args.links, args.links, 1)
+            await asyncio.sleep(0.5)
+
+            before = file_state(db_path)
+            started = time.perf_counter()
+            latencies = await redirect_burst(base_url, args.links, args.requests, args.concurrency)
+            elapsed = time.perf_counter() - started
+            after = file_state(db_path)
+            clicks_during = stored_clicks(db_path)
+
+            async with httpx.AsyncClient(base_url=base_url) as client:
+                health = (await client.get("/api/health")).json()
+        finally:
+            server.terminate()
+            server.wait()
+
+        clicks_after = stored_clicks(db_path)
+
+    latencies.sort()
+    print(f"\nRedirect burst: {args.requests} requests over {args.links} links, concurrency {args.concurrency}")
+    print(f"  {args.requests / elapsed:.0f} req/s, p50 {statistics.median(latencies):.2f} ms, "
+          f"p95 {latencies[int(len(latencies) * 0.95) - 1]:.2f} ms")
+    print(f"  link_index: {health['link_index']}")
+    print(f"  link_clicks: {health['link_clicks']}")
+
+    write_free = before == after and clicks_during == 0
+    print(f"\nDatabase/WAL files unchanged during the burst: {before == after}")
+    print(f"Clicks stored during the burst: {clicks_during}")
+    expected = args.requests + args.links
+    print(f"Clicks stored after the shutdown flush: {clicks_after} (expected {expected})")
+
+    if not write_free or clicks_after != expected:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check that redirects are write-free and clicks are not lost")
+    parser.add_argument("--links", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--port", type=int, default=8767)
+    asyncio.run(benchmark(parser.parse_args()))
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Load test: other endpoints during a login storm
+Starts the API against a scratch database, measures /api/content and /api/health
+latency at rest, then again while a burst of concurrent logins (a mix of correct and
+wrong passwords, so most need bcrypt) runs against /api/auth/login.
+
+Usage:
+    cd backend
+    python scripts/benchmark_login.py [--users 10] [--logins 300] [--concurrency 60] [--threads 8]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+PROBE_PATHS = ["/api/content", "/api/health"]
+
+
+def seed_users(db_path: Path, user_count: int):
+    """Create a scratch database with user_count users (password = username)"""
+    env = dict(os.environ, DATABASE_PATH=str(db_path))
+    code = f"""
+from database import init_db, seed_initial_data, SessionLocal, User
+init_db()
+seed_initial_data()
+db = SessionLocal()
+for i in range({user_count}):
+    user = User(username=f"user{{i}}", full_name=f"User {{i}}", is_active=True)
+    user.set_password(f"user{{i}}")
+    db.add(user)
+db.commit()
+db.close()
+"""
+    subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, env=env, check=True,
+                   stdout=subprocess.DEVNULL)
+
+
+def start_server(db_path: Path, port: int, threads: int, workers: int):
+    env = dict(
+        os.environ,
+        DATABASE_PATH=str(db_path),
+        THREADPOOL_SIZE=str(threads),
+        PASSWORD_WORKERS=str(workers),
+    )
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_until_ready(base_url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f"{base_url}/api/health")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError("Server did not start")
+
+
+def percentiles(latencies):
+    latencies = sorted(latencies)
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.95) - 1]
+
+
+async def probe(client, path: str, until, interval: float = 0.02):
+    """Latencies (ms) of path, requested one at a time until until() is true"""
+    latencies = []
+    while not until():
+        started = time.perf_counter()
+        await client.get(path)
+        latencies.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def login_storm(base_url: str, users: int, total: int, concurrency: int):
+    """Fire total logins; return (status counts, latencies ms)"""
+    statuses = Counter()
+    latencies = []
+    queue = asyncio.Queue()
+    for i in range(total):
+        user = f"user{random.randrange(users)}"
+        # One in three logins uses a wrong password and always needs bcrypt
+        password = user if i % 3 else "wrong-password"
+        queue.put_nowait({"username": user, "password": password})
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        async def worker():
+            while not queue.empty():
+                credentials = queue.get_nowait()
+                started = time.perf_counter()
+                response = await client.post("/api/auth/login", json=credentials)
+                latencies.append((time.perf_counter() - started) * 1000)
+                statuses[response.status_code] += 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return statuses, latencies
+
+
+async def benchmark(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        print(f"Seeding {args.users} users...")
+        seed_users(db_path, args.users)
+
+        server = start_server(db_path, args.port, args.threads, args.workers)
+        base_url = f"http://127.0.0.1:{args.port}"
+        try:
+            await wait_until_ready(base_url)
+            async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+                # Warm up (the password pool starts its processes on first use)
+                await client.post("/api/auth/login", json={"username": "user0", "password": "user0"})
+
+                idle = {}
+                for path in PROBE_PATHS:
+                    deadline = time.monotonic() + 2
+                    idle[path] = await probe(client, path, lambda: time.monotonic() > deadline)
+
+                storm = asyncio.ensure_future(login_storm(base_url, args.users, args.logins, args.concurrency))
+                started = time.perf_counter()
+                busy = await asyncio.gather(*(probe(client, path, storm.done) for path in PROBE_PATHS))
+                statuses, login_latencies = await storm
+                elapsed = time.perf_counter() - started
+
+                pool = (await client.get("/api/health")).json()
+        finally:
+            server.terminate()
+            server.wait()
+
+    print(f"\nLogin storm: {args.logins} logins, concurrency {args.concurrency}, "
+          f"THREADPOOL_SIZE={args.threads}, PASSWORD_WORKERS={args.workers}")
+    p50, p95 = percentiles(login_latencies)
+    print(f"  {args.logins / elapsed:.1f} logins/s, p50 {p50:.0f} ms, p95 {p95:.0f} ms, "
+          f"status codes {dict(sorted(statuses.items()))}")
+    print(f"  password_pool: {pool['password_pool']}")
+    print(f"  credential_cache: {pool['credential_cache']}")
+
+    print(f"\n{'endpoint':<16} {'idle p50':>9} {'idle p95':>9} {'storm p50':>10} {'storm p95':>10}")
+    for path, latencies in zip(PROBE_PATHS, busy):
+        idle_p50, idle_p95 = percentiles(idle[path])
+        storm_p50, storm_p95 = percentiles(latencies)
+        print(f"{path:<16} {idle_p50:>7.1f}ms {idle_p95:>7.1f}ms {storm_p50:>8.1f}ms {storm_p95:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure endpoint latency during a login storm")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--logins", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=60)
+    parser.add_argument("--threads", type=int, default=8, help="THREADPOOL_SIZE for the server")
+    parser.add_argument("--workers", type=int, default=min(2, os.cpu_count() or 1),
+                        help="PASSWORD_WORKERS for the server")
+    parser.add_argument("--port", type=int, default=8766)
+    asyncio.run(benchmark(parser.parse_args()))
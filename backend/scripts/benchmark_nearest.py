@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark the nearest-contact index behind /api/contacts/nearest
+Builds the index from random contacts spread over Jamaica (no database needed),
+checks its answers against a brute-force haversine scan and times queries.
+
+Usage:
+    cd backend
+    python scripts/benchmark_nearest.py [--contacts 100000] [--queries 2000] [--k 5]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from geo import haversine_km
+from nearest import NearestIndex
+
+SECTORS = ["WASH", "Health", "Shelter", "Protection", "Education", "Food Security", "Logistics", None]
+STATUSES = ["active", "deployed", "inactive"]
+# Jamaica's bounding box
+MIN_LAT, MAX_LAT, MIN_LON, MAX_LON = 17.7, 18.53, -78.37, -76.18
+
+
+def random_rows(count: int):
+    rows = []
+    for contact_id in range(1, count + 1):
+        rows.append((
+            contact_id,
+            random.uniform(MIN_LAT, MAX_LAT),
+            random.uniform(MIN_LON, MAX_LON),
+            random.choice(SECTORS),
+            random.choice(STATUSES),
+        ))
+    return rows
+
+
+def brute_force(rows, lat, lon, k, sector=None, status=None):
+    matches = [
+        (haversine_km(lat, lon, row[1], row[2]), row[0])
+        for row in rows
+        if (sector is None or row[3] == sector) and (status is None or row[4] == status)
+    ]
+    return [contact_id for _, contact_id in sorted(matches)[:k]]
+
+
+def time_queries(index, points, k, sector=None, status=None):
+    timings = []
+    for lat, lon in points:
+        started = time.perf_counter()
+        index.nearest(lat, lon, k, sector, status)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contacts", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    rows = random_rows(args.contacts)
+    index = NearestIndex()
+    index.apply(rows, 1)
+    print(f"Built index for {args.contacts} contacts in {index.build_seconds:.2f}s")
+
+    points = [(random.uniform(MIN_LAT, MAX_LAT), random.uniform(MIN_LON, MAX_LON)) for _ in range(args.queries)]
+
+    checks = [(None, None), ("WASH", None), (None, "deployed"), ("Health", "active")]
+    mismatches = 0
+    for lat, lon in points[:20]:
+        for sector, status in checks:
+            expected = brute_force(rows, lat, lon, args.k, sector, status)
+            found = [contact_id for contact_id, _ in index.nearest(lat, lon, args.k, sector, status)]
+            mismatches += found != expected
+    print(f"Brute-force check: {20 * len(checks)} queries, {mismatches} mismatches")
+
+    for label, sector, status in [
+        ("all contacts", None, None),
+        ("sector=WASH", "WASH", None),
+        ("status=deployed", None, "deployed"),
+        ("sector=Health&status=active", "Health", "active"),
+    ]:
+        p50, p95 = time_queries(index, points, args.k, sector, status)
+        print(f"k={args.k} {label:30} p50 {p50:.3f} ms  p95 {p95:.3f} ms")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Pre-build the simplified WGS84 levels of detail for every file in backend/geojson/
+so the first ?detail= request after a deploy does not pay for the build.
+
+Usage:
+    cd backend
+    python scripts/build_geojson.py
+"""
+
+from pathlib import Path
+import os
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from geo import GEOJSON_DIR, CACHE_DIR, DETAIL_LEVELS, build_detail_levels, get_detail_file
+
+
+def main():
+    for source in sorted(GEOJSON_DIR.glob("*.geojson")):
+        started = time.perf_counter()
+        build_detail_levels(source)
+        elapsed = time.perf_counter() - started
+
+        sizes = ", ".join(
+            f"{detail} {os.path.getsize(get_detail_file(source, detail)) / 1024:.0f} KB"
+            for detail in DETAIL_LEVELS
+        )
+        print(f"{source.name}: source {source.stat().st_size / 1024:.0f} KB -> {sizes} ({elapsed:.1f}s)")
+
+    print(f"Cache directory: {CACHE_DIR}")
+
+
+if __name__ == "__main__":
+    main()
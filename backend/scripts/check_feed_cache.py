@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Behaviour check for the MapAction feed cache (feed_cache.FeedCache)
+Serves an Atom feed from a local http.server and checks that concurrent cold requests
+share one upstream fetch, that a stale copy is served at once while a single background
+refresh runs, and that the last good copy is kept (and retries are spaced out) when
+upstream fails.
+
+Usage:
+    cd backend
+    python scripts/check_feed_cache.py
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from feed_cache import FeedCache
+
+TTL = 0.5
+RETRY_AFTER = 1.0
+SLOW_UPSTREAM = 0.5
+
+ATOM = """<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>{title}</title>
+  <updated>2025-10-30T12:00:00Z</updated>
+  <entry>
+    <title>Jamaica - Hurricane Melissa - Situation Overview</title>
+    <id>map-1</id>
+    <link href="https://maps.mapaction.org/dataset/map-1"/>
+    <updated>2025-10-30T12:00:00Z</updated>
+  </entry>
+</feed>"""
+
+
+class Upstream:
+    """What the local server answers; changed by the checks between steps"""
+
+    def __init__(self):
+        self.title = "Feed v1"
+        self.status = 200
+        self.delay = 0.0
+        self.requests = 0
+        self.lock = threading.Lock()
+
+
+def make_handler(upstream: Upstream):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with upstream.lock:
+                upstream.requests += 1
+            time.sleep(upstream.delay)
+            body = ATOM.format(title=upstream.title).encode("utf-8") if upstream.status == 200 else b"error"
+            self.send_response(upstream.status)
+            self.send_header("Content-Type", "application/atom+xml")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+async def timed_get(cache: FeedCache):
+    """(feed title, seconds) of one cache.get()"""
+    started = time.perf_counter()
+    data = await cache.get()
+    return data["feed_title"], time.perf_counter() - started
+
+
+async def check_feed_cache(url: str, upstream: Upstream) -> list:
+    """Return a list of failure descriptions (empty when every check passes)"""
+    failures = []
+
+    def check(ok: bool, description: str):
+        print(f"{'✓' if ok else '✗'} {description}")
+        if not ok:
+            failures.append(description)
+
+    cache = FeedCache(url, ttl=TTL, timeout=5.0, retry_after=RETRY_AFTER)
+    try:
+        # Cold cache: concurrent callers wait on one fetch
+        upstream.delay = SLOW_UPSTREAM
+        results = await asyncio.gather(*(timed_get(cache) for _ in range(20)))
+        check(upstream.requests == 1, f"20 concurrent cold requests -> {upstream.requests} upstream fetch (expected 1)")
+        check(all(title == "Feed v1" for title, _ in results), "every cold request got the fetched feed")
+
+        # Fresh: served from memory
+        await cache.get()
+        check(upstream.requests == 1, "fresh copy served without an upstream fetch")
+
+        # Stale: served at once while one background refresh runs
+        upstream.title = "Feed v2"
+        await asyncio.sleep(TTL)
+        results = await asyncio.gather(*(timed_get(cache) for _ in range(20)))
+        slowest = max(seconds for _, seconds in results)
+        check(all(title == "Feed v1" for title, _ in results), "stale requests got the previous copy")
+        check(slowest < SLOW_UPSTREAM / 2, f"stale requests did not wait for upstream (slowest {slowest * 1000:.1f} ms)")
+        await asyncio.sleep(SLOW_UPSTREAM * 2)
+        check(upstream.requests == 2, f"20 concurrent stale requests -> {upstream.requests - 1} refresh (expected 1)")
+        title, _ = await timed_get(cache)
+        check(title == "Feed v2", "refreshed copy served once the background refresh finished")
+
+        # Upstream failing: the last good copy is kept and retries are spaced out
+        upstream.status = 500
+        upstream.delay = 0.0
+        await asyncio.sleep(TTL)
+        title, _ = await timed_get(cache)
+        await asyncio.sleep(0.2)
+        check(title == "Feed v2", "last good copy served while upstream returns 500")
+        check(cache.error_count == 1, f"failed refresh recorded (error_count {cache.error_count})")
+        requests = upstream.requests
+        for _ in range(10):
+            await cache.get()
+        await asyncio.sleep(0.2)
+        check(upstream.requests == requests, f"no retry within retry_after ({upstream.requests - requests} extra fetches)")
+        await asyncio.sleep(RETRY_AFTER)
+        await cache.get()
+        await asyncio.sleep(0.2)
+        check(upstream.requests == requests + 1, "one retry after retry_after")
+
+        # Recovery
+        upstream.status = 200
+        upstream.title = "Feed v3"
+        await asyncio.sleep(RETRY_AFTER)
+        await cache.get()
+        await asyncio.sleep(0.2)
+        title, _ = await timed_get(cache)
+        check(title == "Feed v3", "new copy served after upstream recovered")
+    finally:
+        await cache.close()
+
+    # Nothing cached and upstream failing: the error reaches the caller
+    upstream.status = 500
+    cold = FeedCache(url, ttl=TTL, timeout=5.0, retry_after=RETRY_AFTER)
+    try:
+        await cold.get()
+        check(False, "cold request with upstream failing raises")
+    except Exception:
+        check(True, "cold request with upstream failing raises")
+    finally:
+        await cold.close()
+
+    return failures
+
+
+if __name__ == "__main__":
+    upstream = Upstream()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(upstream))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        failures = asyncio.run(check_feed_cache(f"http://127.0.0.1:{server.server_port}/feed.atom", upstream))
+    finally:
+        server.shutdown()
+
+    if failures:
+        print(f"\n✗ {len(failures)} check(s) failed")
+        sys.exit(1)
+    print("\n✓ Feed cache is single-flight, serves stale copies and keeps the last good copy")
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Check that the list endpoint queries are served by their intended indexes
+Builds each list query with the same helpers the endpoints use (main.py filters and
+sort keys, pagination.paginate), captures the SQL and parameters they send to SQLite,
+and runs EXPLAIN QUERY PLAN on exactly that. Paginated lists are checked as a full
+list, a first page and a keyset (cursor) page. Fails if a plan does not use the
+expected index, scans the whole table or sorts through a temporary B-tree.
+
+Usage:
+    cd backend
+    python scripts/check_query_plans.py
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import event
+from database import SessionLocal, engine, init_db
+from pagination import paginate, encode_cursor
+from main import (
+    ANNOUNCEMENT_PROJECTION,
+    CONTACT_PROJECTION,
+    CONTACT_SORT,
+    CONTACT_SUBMISSION_PROJECTION,
+    CONTACT_SUBMISSION_SORT,
+    LINK_PROJECTION,
+    LINK_SORT,
+    RESOURCE_PROJECTION,
+    RESOURCE_SORT,
+    USER_PROJECTION,
+    USER_SORT,
+    WHATSAPP_GROUP_PROJECTION,
+    WHATSAPP_GROUP_SORT,
+    WHATSAPP_GROUP_SECTOR_SORT,
+    announcements_query,
+    contact_area_counts_query,
+    contact_features_query,
+    deleted_whatsapp_groups_query,
+    filter_contact_submissions,
+    filter_contacts,
+    filter_links,
+    filter_resources,
+    filter_whatsapp_groups,
+)
+
+PAGE_SIZE = 100
+# Stand-in values for a cursor, by column type
+CURSOR_VALUES = {str: "m", int: 1, float: 0.0, datetime: datetime(2025, 10, 28)}
+
+
+def paginated_queries():
+    """
+    (name, statement, sort columns, descending, expected index) as issued by the paginated
+    endpoints; the expected index is a name or a tuple of acceptable names
+    """
+    contacts = CONTACT_PROJECTION.select()
+    groups = WHATSAPP_GROUP_PROJECTION.select()
+    return [
+        ("contacts", filter_contacts(contacts), CONTACT_SORT, False, "ix_contacts_live_org_name"),
+        ("contacts by sector", filter_contacts(contacts, sector="WASH"), CONTACT_SORT, False,
+         "ix_contacts_live_sector_org_name"),
+        ("contacts by parish", filter_contacts(contacts, parish="Kingston"), CONTACT_SORT, False,
+         "ix_contacts_live_parish_org_name"),
+        ("contacts by status", filter_contacts(contacts, status="active"), CONTACT_SORT, False,
+         "ix_contacts_live_status_org_name"),
+        ("contacts by location type", filter_contacts(contacts, location_type="field"), CONTACT_SORT, False,
+         "ix_contacts_live_location_type_org_name"),
+        ("contacts incl. deleted", filter_contacts(contacts, include_deleted=True), CONTACT_SORT, False,
+         "ix_contacts_org_name"),
+        ("whatsapp groups", filter_whatsapp_groups(groups), WHATSAPP_GROUP_SORT, False,
+         "ix_whatsapp_groups_public_sector_name"),
+        # Both sector indexes serve sector = ? equally well and SQLite may pick either one
+        # for the first page; the next page seeks (sector, name) in the partial index
+        ("whatsapp groups by sector", filter_whatsapp_groups(groups, sector="WASH"), WHATSAPP_GROUP_SECTOR_SORT, False,
+         ("ix_whatsapp_groups_public_sector_name", "ix_whatsapp_groups_sector_name")),
+        ("whatsapp groups (admin)", filter_whatsapp_groups(groups, approved_only=False, include_deleted=True),
+         WHATSAPP_GROUP_SORT, False, "ix_whatsapp_groups_sector_name"),
+        ("resources", filter_resources(RESOURCE_PROJECTION.select()), RESOURCE_SORT, True,
+         "ix_resources_approved_created"),
+        ("resources by sector", filter_resources(RESOURCE_PROJECTION.select(), sector="WASH"), RESOURCE_SORT, True,
+         "ix_resources_approved_sector_created"),
+        ("resources (admin)", filter_resources(RESOURCE_PROJECTION.select(), approved_only=False), RESOURCE_SORT, True,
+         "ix_resources_created"),
+        ("contact submissions", filter_contact_submissions(CONTACT_SUBMISSION_PROJECTION.select()),
+         CONTACT_SUBMISSION_SORT, True, "ix_contact_submissions_approved_created"),
+        ("contact submissions (admin)", filter_contact_submissions(CONTACT_SUBMISSION_PROJECTION.select(), False),
+         CONTACT_SUBMISSION_SORT, True, "ix_contact_submissions_created"),
+        ("users", USER_PROJECTION.select(), USER_SORT, False, "ix_users_username"),
+        ("links", filter_links(LINK_PROJECTION.select()), LINK_SORT, True, "ix_links_live_created"),
+        ("links incl. deleted", filter_links(LINK_PROJECTION.select(), include_deleted=True), LINK_SORT, True,
+         "ix_links_created"),
+    ]
+
+
+def plain_queries():
+    """(name, statement, expected index) for the other list queries"""
+    return [
+        ("contacts geojson", contact_features_query(), "ix_contacts_live_org_name"),
+        ("contacts by area (stats)", contact_area_counts_query(), "ix_contacts_live_area"),
+        ("deleted whatsapp groups", deleted_whatsapp_groups_query(), "ix_whatsapp_groups_deleted_updated"),
+        ("announcements", announcements_query(ANNOUNCEMENT_PROJECTION), "ix_announcements_public_date"),
+    ]
+
+
+def issued_statements(run) -> list:
+    """(sql, parameters) of every statement run() sends to SQLite"""
+    issued = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        issued.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        run()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    return issued
+
+
+def query_plan(db, sql: str, parameters) -> list:
+    return [row[-1] for row in db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", parameters).all()]
+
+
+def check_plan(db, name: str, run, index) -> bool:
+    """Print the plan of the statement run() issues; True if it uses index without scanning or sorting"""
+    (sql, parameters), = issued_statements(run)
+    plan = query_plan(db, sql, parameters)
+
+    indexes = (index,) if isinstance(index, str) else index
+    uses_index = any(
+        step.endswith(f"INDEX {name}") or f"INDEX {name} (" in step for step in plan for name in indexes
+    )
+    full_scan = any(step.startswith("SCAN") and "USING" not in step for step in plan)
+    temp_sort = any("TEMP B-TREE" in step for step in plan)
+    ok = uses_index and not (full_scan or temp_sort)
+
+    print(f"{'✓' if ok else '✗'} {name}" + ("" if uses_index else f" (expected {' or '.join(indexes)})"))
+    for step in plan:
+        print(f"    {step}")
+    return ok
+
+
+def check_query_plans():
+    """Print the plan of each list query; return the names of queries that miss their index"""
+    init_db()
+    db = SessionLocal()
+    failures = []
+    try:
+        for name, stmt, sort_columns, descending, index in paginated_queries():
+            cursor = encode_cursor([CURSOR_VALUES[column.type.python_type] for column in sort_columns])
+            variants = {
+                "": {},
+                ", first page": {"page_size": PAGE_SIZE},
+                ", next page": {"page_size": PAGE_SIZE, "cursor": cursor},
+            }
+            for suffix, page in variants.items():
+                run = lambda: paginate(db, stmt, sort_columns, descending=descending, scalars=False, **page)
+                if not check_plan(db, name + suffix, run, index):
+                    failures.append(name + suffix)
+
+        for name, stmt, index in plain_queries():
+            if not check_plan(db, name, lambda: db.execute(stmt).all(), index):
+                failures.append(name)
+    finally:
+        db.close()
+    return failures
+
+
+if __name__ == "__main__":
+    failures = check_query_plans()
+    print()
+    if failures:
+        print(f"✗ {len(failures)} queries miss their index: {', '.join(failures)}")
+        sys.exit(1)
+    print("✓ All list queries use their indexes")
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Contract check for the fast JSON serialization path
+Compares, row by row, the JSON produced by each serializers.py projection with the
+legacy path (to_dict() validated through the endpoint's response model). Runs on a
+scratch copy of the database with representative rows added (null optional fields,
+timestamps with and without microseconds, unicode text, tags), so your database is
+not touched and every projection is compared on more than whatever rows exist.
+
+Usage:
+    cd backend
+    python scripts/check_serialization.py
+"""
+
+from contextlib import closing
+from datetime import datetime
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+# Work on a scratch copy: the seeded rows must not reach the real database
+SOURCE_DB = Path(os.getenv("DATABASE_PATH") or BACKEND / "imhub.db")
+SCRATCH_DIR = tempfile.TemporaryDirectory()
+SCRATCH_DB = Path(SCRATCH_DIR.name) / "check_serialization.db"
+if SOURCE_DB.exists():
+    with closing(sqlite3.connect(SOURCE_DB)) as source, closing(sqlite3.connect(SCRATCH_DB)) as scratch:
+        source.backup(scratch)
+os.environ["DATABASE_PATH"] = str(SCRATCH_DB)
+
+from database import (
+    SessionLocal,
+    init_db,
+    WhatsAppGroup,
+    Resource,
+    ContactSubmission,
+    Contact,
+    User,
+    Announcement,
+    Link,
+)
+from main import (
+    WhatsAppGroupResponse,
+    ResourceResponse,
+    ContactSubmissionResponse,
+    ContactResponse,
+    UserResponse,
+    AnnouncementResponse,
+    LinkResponse,
+    CONTACT_SORT,
+    contact_features_query,
+)
+from serializers import (
+    WHATSAPP_GROUP_PROJECTION,
+    RESOURCE_PROJECTION,
+    CONTACT_SUBMISSION_PROJECTION,
+    CONTACT_PROJECTION,
+    CONTACT_FEATURE_PROJECTION,
+    USER_PROJECTION,
+    ANNOUNCEMENT_PROJECTION,
+    ANNOUNCEMENT_SUMMARY_PROJECTION,
+    LINK_PROJECTION,
+)
+
+# (name, projection, response model) of the JSON list endpoints
+CONTRACTS = [
+    ("whatsapp_groups", WHATSAPP_GROUP_PROJECTION, WhatsAppGroupResponse),
+    ("resources", RESOURCE_PROJECTION, ResourceResponse),
+    ("contact_submissions", CONTACT_SUBMISSION_PROJECTION, ContactSubmissionResponse),
+    ("contacts", CONTACT_PROJECTION, ContactResponse),
+    ("users", USER_PROJECTION, UserResponse),
+    ("announcements", ANNOUNCEMENT_PROJECTION, AnnouncementResponse),
+    ("announcements (summary)", ANNOUNCEMENT_SUMMARY_PROJECTION, AnnouncementResponse),
+    ("links", LINK_PROJECTION, LinkResponse),
+]
+
+WITH_MICROSECONDS = datetime(2025, 10, 28, 14, 5, 9, 123456)
+WHOLE_SECOND = datetime(2025, 10, 29, 8, 0, 0)
+
+
+def representative_rows() -> list:
+    """One row with every optional field set (unicode text, tags) and one with them all null, per table"""
+    return [
+        WhatsAppGroup(
+            name="Équipe WASH – Saint-Élizabeth 💧", sector="WASH", description="Coordination «eau» & sanitation",
+            link="https://chat.whatsapp.com/check-1", contact_name="Zoë Brown", contact_email="zoe@example.org",
+            approved=True, deleted=False, created_at=WITH_MICROSECONDS, updated_at=WHOLE_SECOND,
+        ),
+        WhatsAppGroup(
+            name="Shelter", sector="Shelter", description="", link="https://chat.whatsapp.com/check-2",
+            approved=False, deleted=True,
+        ),
+        Resource(
+            title="Guía de evaluación rápida – 2025", description="Multi-sector “MIRA” template", url="https://example.org/mira",
+            category="template", sector="Coordination", submitted_by="Ana Muñoz", email="ana@example.org",
+            approved=True, created_at=WITH_MICROSECONDS, updated_at=WHOLE_SECOND,
+        ),
+        Resource(title="Untitled", url="https://example.org/r"),
+        ContactSubmission(
+            organization="Croix-Rouge", focal_point_name="Renée Dupré", email="renee@example.org",
+            phone="+1 876 555 0100", sector="Health", role="Coordinator", location="Montego Bay",
+            additional_info="Disponible 24/7 ✓", approved=True, created_at=WITH_MICROSECONDS, updated_at=WHOLE_SECOND,
+        ),
+        ContactSubmission(organization="NGO", focal_point_name="A", email="a@example.org"),
+        Contact(
+            name="José Ángel", organization="Médecins du Monde", position="Field lead", email="jose@example.org",
+            phone="+1 876 555 0101", sector="Health", parish="St. Elizabeth", community="Black River",
+            latitude="18.0264123", longitude="-77.8487456", location_type="field", status="deployed",
+            notes="Notes with “quotes” and ✓", deleted=False, approved=True,
+            created_at=WITH_MICROSECONDS, updated_at=WHOLE_SECOND,
+        ),
+        Contact(name="No location", organization="Unknown"),
+        User(
+            username="check-ünïcode", password_hash="x", full_name="Siobhán O'Neill", email="s@example.org",
+            is_admin=False, is_active=True, created_at=WITH_MICROSECONDS, updated_at=WHOLE_SECOND,
+            last_login=WITH_MICROSECONDS,
+        ),
+        User(username="check-sparse", password_hash="x"),
+        Announcement(
+            title="Mise à jour – distribution d'eau 💧", content="<p>Première phrase.</p><p>Second paragraph.</p>",
+            date=WITH_MICROSECONDS, priority="high", author="Zoë", tags=" WASH, eau ,wash,, Santé ",
+            approved=True, deleted=False, created_at=WITH_MICROSECONDS, updated_at=WHOLE_SECOND,
+        ),
+        Announcement(title="Untagged", content="Plain text", date=WHOLE_SECOND, tags=None),
+        Link(
+            title="Évaluation – résultats", slug="check-unicode", url="https://example.org/résultats?q=ü",
+            description="Lien «court»", created_by="zoë", deleted=False,
+            created_at=WITH_MICROSECONDS, updated_at=WHOLE_SECOND,
+        ),
+        Link(title="Sparse", slug="check-sparse", url="https://example.org", deleted=True),
+    ]
+
+
+def legacy_json(obj, response_model, keys) -> dict:
+    """obj.to_dict() through the response model, limited to keys (in to_dict() order)"""
+    data = response_model.model_validate(obj.to_dict()).model_dump()
+    return {key: value for key, value in data.items() if key in keys}
+
+
+def legacy_feature(obj) -> dict:
+    """A GeoJSON point feature built from to_dict()"""
+    return {
+        "type": "Feature",
+        "id": obj.id,
+        "geometry": {"type": "Point", "coordinates": [round(obj.lon, 6), round(obj.lat, 6)]},
+        "properties": legacy_json(obj, ContactResponse, CONTACT_FEATURE_PROJECTION.keys),
+    }
+
+
+def compare(name: str, legacy: list, fast: list, mismatches: list):
+    """Record rows that differ in keys, key order or values; an empty comparison is a failure too"""
+    found = len(mismatches)
+    if not fast:
+        mismatches.append(f"{name}: no rows compared")
+    elif len(legacy) != len(fast):
+        mismatches.append(f"{name}: {len(legacy)} vs {len(fast)} rows")
+    else:
+        for old, new in zip(legacy, fast):
+            if json.dumps(old) != json.dumps(new):
+                mismatches.append(f"{name} id={old['id']}: {old} != {new}")
+    print(f"{'✓' if len(mismatches) == found else '✗'} {name}: {len(fast)} rows")
+
+
+def check_serialization():
+    """Return a list of mismatch descriptions (empty when both paths agree)"""
+    init_db()
+    db = SessionLocal()
+    mismatches = []
+    try:
+        db.add_all(representative_rows())
+        db.commit()
+
+        for name, projection, response_model in CONTRACTS:
+            model = projection.model
+            legacy = [
+                legacy_json(obj, response_model, projection.keys)
+                for obj in db.query(model).order_by(model.id).all()
+            ]
+            fast = json.loads(projection.dumps(db.execute(projection.select().order_by(model.id)).all()))
+            compare(name, legacy, fast, mismatches)
+
+        located = db.query(Contact).filter(
+            Contact.deleted == False, Contact.lat.is_not(None), Contact.lon.is_not(None)
+        ).order_by(*CONTACT_SORT).all()
+        fast = json.loads(b"".join(CONTACT_FEATURE_PROJECTION.stream(contact_features_query())))["features"]
+        compare("contacts (geojson)", [legacy_feature(obj) for obj in located], fast, mismatches)
+    finally:
+        db.close()
+    return mismatches
+
+
+if __name__ == "__main__":
+    try:
+        mismatches = check_serialization()
+    finally:
+        SCRATCH_DIR.cleanup()
+    if mismatches:
+        print()
+        for mismatch in mismatches:
+            print(f"✗ {mismatch}")
+        sys.exit(1)
+    print("\n✓ Fast serialization matches the response models")
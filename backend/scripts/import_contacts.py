@@ -5,6 +5,12 @@ This demonstrates how to migrate data from existing sources (e.g., PowerBI expor
 
 import requests
 import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from gazetteer import get_gazetteer
 
 # Configuration
 API_BASE_URL = "http://localhost:8000"
@@ -164,17 +170,56 @@ sample_contacts = [
 ]
 
 
-def import_contacts(contacts_data, auth_token):
+def fill_coordinates(contacts_data):
+    """
+    Fill missing latitude/longitude from the community name (and parish, when given)
+    using the offline gazetteer built from the boundary files - no network lookups.
+    Only close, unambiguous matches are used; the others are listed for manual review.
+    
+    Returns:
+        Tuple of (filled_count, unmatched_names)
+    """
+    gazetteer = get_gazetteer()
+    filled = 0
+    unmatched = []
+    
+    for contact in contacts_data:
+        if contact.get('latitude') and contact.get('longitude'):
+            continue
+        community, parish = contact.get('community'), contact.get('parish')
+        if not community:
+            continue
+        
+        match = gazetteer.best_match(community, parish)
+        if match:
+            contact['latitude'] = str(match['lat'])
+            contact['longitude'] = str(match['lon'])
+            filled += 1
+            print(f"  ⌖ {contact['name']}: '{community}' -> {match['name']}, {match['parish']} ({match['score']:.2f})")
+        else:
+            unmatched.append(f"{contact['name']}: {community}" + (f", {parish}" if parish else ""))
+    
+    return filled, unmatched
+
+
+def import_contacts(contacts_data, auth_token, geocode=True):
     """
     Import a list of contacts via the API
     
     Args:
         contacts_data: List of contact dictionaries
         auth_token: Authentication token for API
+        geocode: Fill missing coordinates from community/parish names first
     
     Returns:
         Tuple of (success_count, error_count, errors)
     """
+    if geocode:
+        filled, unmatched = fill_coordinates(contacts_data)
+        print(f"Geocoded {filled} contacts without coordinates")
+        for name in unmatched:
+            print(f"  ? No close match for {name}")
+    
     headers = {
         "Authorization": f"Bearer {auth_token}",
         "Content-Type": "application/json"
@@ -0,0 +1,53 @@
+"""
+Write maximum-quality .br/.gz copies of the static files the app serves: the frontend
+bundle (frontend/dist) and the GeoJSON files with their levels of detail.
+Clients that send Accept-Encoding get these instead of the uncompressed files.
+
+Usage:
+    cd backend
+    python scripts/precompress.py
+"""
+
+from pathlib import Path
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from compression import precompress, precompress_tree, compressed_path, brotli
+from geo import GEOJSON_DIR, CACHE_DIR, DETAIL_LEVELS, get_detail_file
+
+FRONTEND_DIST = Path(__file__).resolve().parent.parent.parent / "frontend" / "dist"
+
+
+def report(path: Path, cache_dir=None):
+    sizes = [f"{path.stat().st_size / 1024:.0f} KB"]
+    for encoding in (["br", "gzip"] if brotli is not None else ["gzip"]):
+        compressed = compressed_path(path, encoding, cache_dir)
+        if compressed.exists():
+            sizes.append(f"{encoding} {compressed.stat().st_size / 1024:.0f} KB")
+    print(f"  {path.name}: {', '.join(sizes)}")
+
+
+def main():
+    if brotli is None:
+        print("brotli is not installed - writing gzip copies only")
+
+    started = time.perf_counter()
+    if FRONTEND_DIST.exists():
+        written = precompress_tree(FRONTEND_DIST)
+        print(f"frontend/dist: {len(written)} files written")
+    else:
+        print(f"frontend/dist not found at {FRONTEND_DIST} - skipped")
+
+    print("geojson:")
+    for source in sorted(GEOJSON_DIR.glob("*.geojson")):
+        for path in [source] + [get_detail_file(source, detail) for detail in DETAIL_LEVELS]:
+            precompress(path, CACHE_DIR)
+            report(path, CACHE_DIR)
+
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
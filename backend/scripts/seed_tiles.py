@@ -0,0 +1,43 @@
+"""
+Seed the MBTiles-style tile caches for the /api/tiles/{layer}/{z}/{x}/{y}.mvt endpoint.
+Tiles in the seeded zoom range are then read from SQLite instead of being cut on demand.
+
+Usage:
+    cd backend
+    python scripts/seed_tiles.py                 # all layers, zoom 6-12
+    python scripts/seed_tiles.py parishes --min-zoom 6 --max-zoom 10
+"""
+
+from pathlib import Path
+import argparse
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tiles import TileCache, LAYERS, SEED_MIN_ZOOM, SEED_MAX_ZOOM
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("layers", nargs="*", help=f"layers to seed: {', '.join(LAYERS)} (default: all)")
+    parser.add_argument("--min-zoom", type=int, default=SEED_MIN_ZOOM)
+    parser.add_argument("--max-zoom", type=int, default=SEED_MAX_ZOOM)
+    args = parser.parse_args()
+    unknown = [name for name in args.layers if name not in LAYERS]
+    if unknown:
+        parser.error(f"unknown layer(s): {', '.join(unknown)}")
+
+    cache = TileCache()
+    for name in args.layers or LAYERS:
+        started = time.perf_counter()
+        counts = cache.seed(name, args.min_zoom, args.max_zoom)
+        elapsed = time.perf_counter() - started
+        path = cache.mbtiles_path(name, cache.layer_key(name))
+        per_zoom = ", ".join(f"z{z}: {count}" for z, count in counts.items())
+        print(f"{name}: {sum(counts.values())} tiles ({per_zoom}) in {elapsed:.1f}s -> {path.name} "
+              f"({path.stat().st_size / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Fast JSON serialization for list endpoints
+Each projection selects exactly the columns a model's to_dict() returns and dumps the
+SQL rows to JSON bytes with orjson in one pass - no ORM objects, no to_dict(), no
+response_model validation. Naive datetimes serialize the same as .isoformat().
+"""
+
+from fastapi.responses import Response
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import select
+import orjson
+
+from database import (
+    engine,
+    WhatsAppGroup,
+    Resource,
+    ContactSubmission,
+    Contact,
+    User,
+    Announcement,
+    Link,
+)
+
+
+class Projection:
+    """Ordered column projection of a model, matching the keys of its to_dict()"""
+
+    def __init__(self, model, fields):
+        self.model = model
+        self.keys = tuple(fields)
+        self.columns = [getattr(model, field) for field in fields]
+
+    def select(self):
+        """select() of the projected columns"""
+        return select(*self.columns)
+
+    def rows_to_dicts(self, rows) -> list:
+        keys = self.keys
+        return [dict(zip(keys, row)) for row in rows]
+
+    def dumps(self, rows) -> bytes:
+        """Serialize SQL row tuples to a JSON array"""
+        return orjson.dumps(self.rows_to_dicts(rows))
+
+    def response(self, rows, headers=None) -> Response:
+        """JSON response for SQL row tuples (headers: e.g. pagination headers already set)"""
+        return Response(content=self.dumps(rows), media_type="application/json", headers=headers)
+
+    async def response_async(self, rows, headers=None) -> Response:
+        """response() for async endpoints: serializes in the threadpool, off the event loop"""
+        content = await run_in_threadpool(self.dumps, rows)
+        return Response(content=content, media_type="application/json", headers=headers)
+
+
+class AnnouncementProjection(Projection):
+    """Projection of announcements; the stored (normalized) tags string becomes a list"""
+
+    def rows_to_dicts(self, rows) -> list:
+        items = super().rows_to_dicts(rows)
+        for item in items:
+            item["tags"] = item["tags"].split(",") if item["tags"] else []
+        return items
+
+
+class FeatureProjection(Projection):
+    """
+    Projection whose rows are streamed as a GeoJSON FeatureCollection of points.
+    The first two selected columns are lat and lon; the rest become feature properties,
+    and the first projected field (the primary key) is also the feature id.
+    """
+
+    def __init__(self, model, lat_field: str, lon_field: str, fields):
+        super().__init__(model, fields)
+        self.point_columns = [getattr(model, lat_field), getattr(model, lon_field)]
+
+    def select(self):
+        """select() of the point columns followed by the projected columns"""
+        return select(*self.point_columns, *self.columns)
+
+    def stream(self, stmt, precision: int = 6, batch_size: int = 1000):
+        """
+        Yield a FeatureCollection in chunks of batch_size features, reading the rows
+        through a server-side cursor on its own connection, so memory stays flat and
+        the first chunk is sent as soon as the first rows are read.
+        """
+        keys = self.keys
+        yield b'{"type":"FeatureCollection","features":['
+        separator = b""
+        with engine.connect() as conn:
+            result = conn.execution_options(yield_per=batch_size).execute(stmt)
+            for rows in result.partitions():
+                features = [
+                    {
+                        "type": "Feature",
+                        "id": row[2],
+                        "geometry": {"type": "Point", "coordinates": [round(row[1], precision), round(row[0], precision)]},
+                        "properties": dict(zip(keys, row[2:])),
+                    }
+                    for row in rows
+                ]
+                # Strip the list brackets and join the batches with commas
+                yield separator + orjson.dumps(features)[1:-1]
+                separator = b","
+        yield b"]}"
+
+
+WHATSAPP_GROUP_PROJECTION = Projection(WhatsAppGroup, [
+    "id", "name", "sector", "description", "link", "contact_name", "contact_email",
+    "approved", "deleted", "created_at", "updated_at",
+])
+
+RESOURCE_PROJECTION = Projection(Resource, [
+    "id", "title", "description", "url", "category", "sector", "submitted_by", "email",
+    "approved", "created_at", "updated_at",
+])
+
+CONTACT_SUBMISSION_PROJECTION = Projection(ContactSubmission, [
+    "id", "organization", "focal_point_name", "email", "phone", "sector", "role",
+    "location", "additional_info", "approved", "created_at", "updated_at",
+])
+
+CONTACT_PROJECTION = Projection(Contact, [
+    "id", "name", "organization", "position", "email", "phone", "sector", "parish",
+    "community", "latitude", "longitude", "adm1_pcode", "adm2_pcode", "location_type",
+    "status", "notes", "deleted", "approved", "created_at", "updated_at",
+])
+
+# latitude/longitude are carried by the geometry
+CONTACT_FEATURE_PROJECTION = FeatureProjection(Contact, "lat", "lon", [
+    "id", "name", "organization", "position", "email", "phone", "sector", "parish",
+    "community", "adm1_pcode", "adm2_pcode", "location_type", "status", "notes",
+    "created_at", "updated_at",
+])
+
+USER_PROJECTION = Projection(User, [
+    "id", "username", "full_name", "email", "is_admin", "is_active",
+    "created_at", "updated_at", "last_login",
+])
+
+ANNOUNCEMENT_FIELDS = [
+    "id", "title", "content", "summary", "excerpt", "date", "priority", "author", "tags",
+    "approved", "deleted", "created_at", "updated_at",
+]
+
+ANNOUNCEMENT_PROJECTION = AnnouncementProjection(Announcement, ANNOUNCEMENT_FIELDS)
+
+# Cards: everything but the full HTML body
+ANNOUNCEMENT_SUMMARY_PROJECTION = AnnouncementProjection(
+    Announcement, [field for field in ANNOUNCEMENT_FIELDS if field != "content"]
+)
+
+LINK_PROJECTION = Projection(Link, [
+    "id", "title", "slug", "url", "description", "created_by", "deleted",
+    "created_at", "updated_at",
+])
@@ -0,0 +1,72 @@
+"""
+Spatial filters for contacts
+Candidates come from the contacts_rtree R*Tree (kept in sync with contacts.lat/lon by
+triggers); the exact test then runs on the numeric columns, because R*Tree bounds are
+stored as 32-bit floats and rounded outwards.
+"""
+
+from sqlalchemy import select, func
+
+from database import Contact, contacts_rtree
+from geo import radius_bbox
+
+MAX_RADIUS_KM = 500.0
+
+
+def _numbers(value: str, count: int, name: str) -> list:
+    parts = value.split(",")
+    if len(parts) != count:
+        raise ValueError(f"{name} must be {count} comma-separated numbers")
+    try:
+        return [float(part) for part in parts]
+    except ValueError:
+        raise ValueError(f"{name} must be {count} comma-separated numbers")
+
+
+def parse_bbox(value: str):
+    """'min_lon,min_lat,max_lon,max_lat' (GeoJSON order) -> (min_lat, min_lon, max_lat, max_lon)"""
+    min_lon, min_lat, max_lon, max_lat = _numbers(value, 4, "bbox")
+    if not (-90 <= min_lat <= max_lat <= 90 and -180 <= min_lon <= max_lon <= 180):
+        raise ValueError("bbox must be min_lon,min_lat,max_lon,max_lat within -180..180 / -90..90")
+    return min_lat, min_lon, max_lat, max_lon
+
+
+def parse_near(value: str, radius_km):
+    """'lat,lon' plus a radius -> (lat, lon, radius_km)"""
+    lat, lon = _numbers(value, 2, "near")
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ValueError("near must be lat,lon")
+    if radius_km is None:
+        raise ValueError("radius_km is required with near")
+    if not 0 < radius_km <= MAX_RADIUS_KM:
+        raise ValueError(f"radius_km must be greater than 0 and at most {MAX_RADIUS_KM:g}")
+    return lat, lon, radius_km
+
+
+def rtree_candidates(min_lat: float, min_lon: float, max_lat: float, max_lon: float):
+    """select() of contact ids whose R*Tree entry overlaps a box"""
+    rtree = contacts_rtree.c
+    return select(rtree.id).where(
+        rtree.max_lat >= min_lat, rtree.min_lat <= max_lat,
+        rtree.max_lon >= min_lon, rtree.min_lon <= max_lon,
+    )
+
+
+def within_bbox(stmt, min_lat: float, min_lon: float, max_lat: float, max_lon: float):
+    """Restrict a contacts select() to a bounding box"""
+    return stmt.where(
+        Contact.id.in_(rtree_candidates(min_lat, min_lon, max_lat, max_lon)),
+        Contact.lat.between(min_lat, max_lat),
+        Contact.lon.between(min_lon, max_lon),
+    )
+
+
+def distance_km(lat: float, lon: float):
+    """SQL expression: great-circle distance from a point to each contact"""
+    return func.haversine_km(Contact.lat, Contact.lon, lat, lon)
+
+
+def within_radius(stmt, lat: float, lon: float, radius_km: float):
+    """Restrict a contacts select() to a great-circle radius around a point"""
+    stmt = within_bbox(stmt, *radius_bbox(lat, lon, radius_km))
+    return stmt.where(distance_km(lat, lon) <= radius_km)
@@ -0,0 +1,452 @@
+"""
+Mapbox Vector Tiles (MVT 2.1) cut from the boundary files in backend/geojson/
+Tiles are built on demand from the WGS84 levels of detail produced by geo.py, kept in
+an in-memory LRU and, when seeded with scripts/seed_tiles.py, read from an
+MBTiles-style SQLite file per layer.
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+import hashlib
+import json
+import os
+import sqlite3
+import struct
+import threading
+
+from geo import GEOJSON_DIR, CACHE_DIR, get_detail_file, source_version, mercator
+
+# Layer name in the URL -> source file in geojson/
+LAYERS = {
+    "parishes": "jamaica-parishes.geojson",
+    "communities": "jamaica-communities.geojson",
+}
+
+EXTENT = 4096
+BUFFER = 64
+MIN_ZOOM = 0
+MAX_ZOOM = 16
+
+# Zoom levels written by scripts/seed_tiles.py
+SEED_MIN_ZOOM = 6
+SEED_MAX_ZOOM = 12
+
+# Bump when tile output changes so cached tiles are not reused
+TILES_VERSION = 1
+
+TILE_CACHE_SIZE = int(os.getenv("TILE_CACHE_SIZE", "2048"))
+
+
+def detail_for_zoom(z: int) -> str:
+    """Level of detail from geo.py that is fine enough for a zoom level"""
+    if z <= 8:
+        return "low"
+    if z <= 10:
+        return "medium"
+    return "high"
+
+
+# --- Protocol buffer encoding (only what vector_tile.proto needs) ---
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _zigzag(value: int) -> int:
+    return (value << 1) ^ (value >> 63)
+
+
+def _key(field: int, wire_type: int) -> bytes:
+    return _varint((field << 3) | wire_type)
+
+
+def _bytes_field(field: int, payload: bytes) -> bytes:
+    return _key(field, 2) + _varint(len(payload)) + payload
+
+
+def _packed(field: int, values) -> bytes:
+    return _bytes_field(field, b"".join(_varint(v) for v in values))
+
+
+def _encode_value(value) -> bytes:
+    if isinstance(value, bool):
+        return _key(7, 0) + _varint(int(value))
+    if isinstance(value, int):
+        if value >= 0:
+            return _key(5, 0) + _varint(value)
+        return _key(6, 0) + _varint(_zigzag(value))
+    if isinstance(value, float):
+        return _key(3, 1) + struct.pack("<d", value)
+    return _bytes_field(1, str(value).encode("utf-8"))
+
+
+# --- Geometry ---
+
+def _clip_ring(ring, low: float, high: float):
+    """Sutherland-Hodgman clip of a closed ring (no repeated end point) to a square"""
+    for axis, bound, keep_above in ((0, low, True), (0, high, False), (1, low, True), (1, high, False)):
+        if not ring:
+            return ring
+        clipped = []
+        previous = ring[-1]
+        previous_inside = previous[axis] >= bound if keep_above else previous[axis] <= bound
+        for point in ring:
+            inside = point[axis] >= bound if keep_above else point[axis] <= bound
+            if inside != previous_inside:
+                t = (bound - previous[axis]) / (point[axis] - previous[axis])
+                clipped.append((
+                    previous[0] + t * (point[0] - previous[0]),
+                    previous[1] + t * (point[1] - previous[1]),
+                ))
+            if inside:
+                clipped.append(point)
+            previous, previous_inside = point, inside
+        ring = clipped
+    return ring
+
+
+def _ring_area(ring) -> int:
+    """Twice the signed area (surveyor's formula) in tile coordinates"""
+    area = 0
+    for i in range(len(ring)):
+        x1, y1 = ring[i - 1]
+        x2, y2 = ring[i]
+        area += x1 * y2 - x2 * y1
+    return area
+
+
+def _tile_ring(ring, scale: float, offset_x: float, offset_y: float, exterior: bool):
+    """Project, clip and snap a ring to integer tile coordinates with MVT winding"""
+    points = [(x * scale - offset_x, y * scale - offset_y) for x, y in ring[:-1]]
+    points = _clip_ring(points, -BUFFER, EXTENT + BUFFER)
+
+    snapped = []
+    for x, y in points:
+        point = (int(round(x)), int(round(y)))
+        if not snapped or point != snapped[-1]:
+            snapped.append(point)
+    if len(snapped) > 1 and snapped[0] == snapped[-1]:
+        snapped.pop()
+    if len(snapped) < 3:
+        return None
+
+    area = _ring_area(snapped)
+    if area == 0:
+        return None
+    # Exterior rings have positive area, interior rings negative
+    if (area > 0) != exterior:
+        snapped.reverse()
+    return snapped
+
+
+def _encode_geometry(rings) -> list:
+    commands = []
+    cursor_x = cursor_y = 0
+    for ring in rings:
+        x, y = ring[0]
+        commands += [(1 << 3) | 1, _zigzag(x - cursor_x), _zigzag(y - cursor_y)]
+        cursor_x, cursor_y = x, y
+        commands.append((len(ring) - 1) << 3 | 2)
+        for x, y in ring[1:]:
+            commands += [_zigzag(x - cursor_x), _zigzag(y - cursor_y)]
+            cursor_x, cursor_y = x, y
+        commands.append((1 << 3) | 7)
+    return commands
+
+
+class TileLayer:
+    """One GeoJSON file prepared for tiling: features in Mercator units per level of detail"""
+
+    def __init__(self, name: str, source: Path):
+        self.name = name
+        self.source = source
+        self.version = None
+        self._levels = {}
+        self._lock = threading.Lock()
+
+    def _check_version(self):
+        version = source_version(self.source)
+        if version != self.version:
+            self._levels = {}
+            self.version = version
+
+    def features(self, detail: str):
+        """[(bbox, polygons, properties)] with coordinates in Mercator [0, 1] units"""
+        with self._lock:
+            self._check_version()
+            features = self._levels.get(detail)
+            if features is not None:
+                return features
+
+            with open(get_detail_file(self.source, detail), "r", encoding="utf-8") as f:
+                collection = json.load(f)
+
+            features = []
+            for feature in collection["features"]:
+                geometry = feature.get("geometry")
+                if not geometry or geometry["type"] not in ("Polygon", "MultiPolygon"):
+                    continue
+                polygons = [geometry["coordinates"]] if geometry["type"] == "Polygon" else geometry["coordinates"]
+                polygons = [[[mercator(lon, lat) for lon, lat in ring] for ring in polygon] for polygon in polygons]
+                xs = [x for polygon in polygons for x, _ in polygon[0]]
+                ys = [y for polygon in polygons for _, y in polygon[0]]
+                if not xs:
+                    continue
+                bbox = (min(xs), min(ys), max(xs), max(ys))
+                features.append((bbox, polygons, feature.get("properties") or {}))
+
+            self._levels[detail] = features
+            return features
+
+    def render(self, z: int, x: int, y: int) -> bytes:
+        """Encode one tile; returns b"" when no feature touches it"""
+        features = self.features(detail_for_zoom(z))
+        tiles = 1 << z
+        margin = BUFFER / EXTENT / tiles
+        min_x, min_y = x / tiles - margin, y / tiles - margin
+        max_x, max_y = (x + 1) / tiles + margin, (y + 1) / tiles + margin
+
+        scale = tiles * EXTENT
+        offset_x, offset_y = x * EXTENT, y * EXTENT
+
+        keys, key_index = [], {}
+        values, value_index = [], {}
+        encoded_features = []
+
+        for feature_id, (bbox, polygons, properties) in enumerate(features, start=1):
+            if bbox[0] > max_x or bbox[2] < min_x or bbox[1] > max_y or bbox[3] < min_y:
+                continue
+
+            rings = []
+            for polygon in polygons:
+                exterior = _tile_ring(polygon[0], scale, offset_x, offset_y, True)
+                if exterior is None:
+                    continue
+                rings.append(exterior)
+                for hole in polygon[1:]:
+                    hole = _tile_ring(hole, scale, offset_x, offset_y, False)
+                    if hole is not None:
+                        rings.append(hole)
+            if not rings:
+                continue
+
+            tags = []
+            for key, value in properties.items():
+                if value is None:
+                    continue
+                if key not in key_index:
+                    key_index[key] = len(keys)
+                    keys.append(key)
+                value_key = (type(value).__name__, value)
+                if value_key not in value_index:
+                    value_index[value_key] = len(values)
+                    values.append(value)
+                tags += [key_index[key], value_index[value_key]]
+
+            encoded_features.append(
+                _key(1, 0) + _varint(feature_id)
+                + _packed(2, tags)
+                + _key(3, 0) + _varint(3)  # POLYGON
+                + _packed(4, _encode_geometry(rings))
+            )
+
+        if not encoded_features:
+            return b""
+
+        layer = (
+            _key(15, 0) + _varint(2)
+            + _bytes_field(1, self.name.encode("utf-8"))
+            + b"".join(_bytes_field(2, feature) for feature in encoded_features)
+            + b"".join(_bytes_field(3, key.encode("utf-8")) for key in keys)
+            + b"".join(_bytes_field(4, _encode_value(value)) for value in values)
+            + _key(5, 0) + _varint(EXTENT)
+        )
+        return _bytes_field(3, layer)
+
+    def tile_range(self, z: int):
+        """(min_x, min_y, max_x, max_y) of the tiles covering the layer at zoom z"""
+        features = self.features(detail_for_zoom(z))
+        tiles = 1 << z
+        min_x = min(bbox[0] for bbox, _, _ in features)
+        min_y = min(bbox[1] for bbox, _, _ in features)
+        max_x = max(bbox[2] for bbox, _, _ in features)
+        max_y = max(bbox[3] for bbox, _, _ in features)
+        return (
+            int(min_x * tiles), int(min_y * tiles),
+            min(int(max_x * tiles), tiles - 1), min(int(max_y * tiles), tiles - 1),
+        )
+
+
+class MBTiles:
+    """MBTiles-style SQLite tile store (rows are TMS - y counted from the south)"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._local.connection = connection
+        return connection
+
+    def create(self, metadata: dict):
+        connection = self._connection()
+        connection.executescript("""
+            CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS tiles (
+                zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER, tile_data BLOB,
+                PRIMARY KEY (zoom_level, tile_column, tile_row)
+            );
+        """)
+        connection.executemany(
+            "INSERT OR REPLACE INTO metadata (name, value) VALUES (?, ?)",
+            [(name, str(value)) for name, value in metadata.items()],
+        )
+        connection.commit()
+
+    def metadata(self) -> dict:
+        return dict(self._connection().execute("SELECT name, value FROM metadata").fetchall())
+
+    def get(self, z: int, x: int, y: int):
+        row = self._connection().execute(
+            "SELECT tile_data FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?",
+            (z, x, (1 << z) - 1 - y),
+        ).fetchone()
+        return row[0] if row else None
+
+    def put_many(self, tiles):
+        """tiles: iterable of (z, x, y, data) in XYZ numbering"""
+        connection = self._connection()
+        connection.executemany(
+            "INSERT OR REPLACE INTO tiles (zoom_level, tile_column, tile_row, tile_data) VALUES (?, ?, ?, ?)",
+            [(z, x, (1 << z) - 1 - y, data) for z, x, y, data in tiles],
+        )
+        connection.commit()
+
+
+class TileCache:
+    """LRU of encoded tiles in front of the seeded MBTiles files and the tile renderer"""
+
+    def __init__(self, max_tiles: int = TILE_CACHE_SIZE):
+        self.max_tiles = max_tiles
+        self.layers = {name: TileLayer(name, GEOJSON_DIR / filename) for name, filename in LAYERS.items()}
+        self._tiles = OrderedDict()
+        self._stores = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.seeded_hits = 0
+        self.renders = 0
+
+    def layer_key(self, name: str) -> str:
+        """Short hash identifying the current source and tile format of a layer"""
+        layer = self.layers[name]
+        raw = f"{TILES_VERSION}|{source_version(layer.source)}|{EXTENT}|{BUFFER}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+    def mbtiles_path(self, name: str, key: str) -> Path:
+        return CACHE_DIR / f"tiles-{name}.{key}.mbtiles"
+
+    def _seeded(self, name: str, key: str):
+        """The MBTiles store for this layer version, if one has been seeded"""
+        store = self._stores.get(name)
+        if store is not None and store[0] == key:
+            return store[1]
+
+        path = self.mbtiles_path(name, key)
+        mbtiles = MBTiles(path) if path.exists() else None
+        if mbtiles is not None:
+            metadata = mbtiles.metadata()
+            zooms = (int(metadata.get("minzoom", 0)), int(metadata.get("maxzoom", -1)))
+            mbtiles = (mbtiles, zooms)
+        self._stores[name] = (key, mbtiles)
+        return mbtiles
+
+    def get(self, name: str, z: int, x: int, y: int):
+        """(etag, tile bytes) - bytes are empty when no feature touches the tile"""
+        key = self.layer_key(name)
+        etag = f'"{key}-{z}-{x}-{y}"'
+        cache_key = (name, key, z, x, y)
+
+        with self._lock:
+            data = self._tiles.get(cache_key)
+            if data is not None:
+                self._tiles.move_to_end(cache_key)
+                self.hits += 1
+                return etag, data
+            seeded = self._seeded(name, key)
+
+        if seeded is not None and seeded[1][0] <= z <= seeded[1][1]:
+            # Every non-empty tile in the seeded zoom range is in the file
+            data = seeded[0].get(z, x, y) or b""
+            self.seeded_hits += 1
+        else:
+            data = self.layers[name].render(z, x, y)
+            self.renders += 1
+
+        with self._lock:
+            self._tiles[cache_key] = data
+            self._tiles.move_to_end(cache_key)
+            while len(self._tiles) > self.max_tiles:
+                self._tiles.popitem(last=False)
+        return etag, data
+
+    def seed(self, name: str, min_zoom: int = SEED_MIN_ZOOM, max_zoom: int = SEED_MAX_ZOOM) -> dict:
+        """Render every tile of a layer in a zoom range into its MBTiles file"""
+        layer = self.layers[name]
+        key = self.layer_key(name)
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+        path = self.mbtiles_path(name, key)
+        tmp = path.with_suffix(".tmp")
+        tmp.unlink(missing_ok=True)
+        mbtiles = MBTiles(tmp)
+        mbtiles.create({
+            "name": name,
+            "format": "pbf",
+            "type": "overlay",
+            "minzoom": min_zoom,
+            "maxzoom": max_zoom,
+            "json": json.dumps({"vector_layers": [{"id": name, "minzoom": min_zoom, "maxzoom": max_zoom}]}),
+        })
+
+        counts = {}
+        for z in range(min_zoom, max_zoom + 1):
+            min_x, min_y, max_x, max_y = layer.tile_range(z)
+            tiles = []
+            for x in range(min_x, max_x + 1):
+                for y in range(min_y, max_y + 1):
+                    data = layer.render(z, x, y)
+                    if data:
+                        tiles.append((z, x, y, data))
+            mbtiles.put_many(tiles)
+            counts[z] = len(tiles)
+        mbtiles._connection().close()
+        os.replace(tmp, path)
+
+        for old in CACHE_DIR.glob(f"tiles-{name}.*.mbtiles"):
+            if old != path:
+                old.unlink(missing_ok=True)
+        with self._lock:
+            self._stores.pop(name, None)
+        return counts
+
+    def stats(self) -> dict:
+        """Cache statistics for monitoring"""
+        return {
+            "tiles": len(self._tiles),
+            "max_tiles": self.max_tiles,
+            "hits": self.hits,
+            "seeded_hits": self.seeded_hits,
+            "renders": self.renders,
+        }
@@ -4,8 +4,17 @@
 # Install backend dependencies
 pip install -r backend/requirements.txt
 
+# Pre-build simplified GeoJSON levels of detail (served by /api/geojson/{file}?detail=)
+(cd backend && python scripts/build_geojson.py)
+
+# Seed vector tiles for zoom 6-12 (served by /api/tiles/{layer}/{z}/{x}/{y}.mvt)
+(cd backend && python scripts/seed_tiles.py)
+
 # Build frontend
 cd frontend
 npm install --legacy-peer-deps
 npm run build
 cd ..
+
+# Write .br/.gz copies of the frontend bundle and GeoJSON files
+(cd backend && python scripts/precompress.py)
@@ -9,8 +9,9 @@ interface Announcement {
   priority: 'high' | 'medium' | 'normal' | 'low'
   author: string
   tags: string[]
-  content: string
+  content?: string  // left out of the list (fields=summary); loaded on "Read More"
   summary: string
+  excerpt: string
 }
 
 interface AnnouncementsProps {
@@ -27,19 +28,18 @@ export default function Announcements({ limit }: AnnouncementsProps) {
     fetchAnnouncements()
   }, [limit])
 
+  const authHeaders = (): HeadersInit => {
+    const token = localStorage.getItem('token')
+    return token ? { 'Authorization': `Bearer ${token}` } : {}
+  }
+
   const fetchAnnouncements = async () => {
     try {
-      const token = localStorage.getItem('token')
       const url = limit 
-        ? getApiUrl(`/api/announcements?limit=${limit}`)
-        : getApiUrl('/api/announcements')
-      
-      const headers: HeadersInit = {}
-      if (token) {
-        headers['Authorization'] = `Bearer ${token}`
-      }
+        ? getApiUrl(`/api/announcements?fields=summary&limit=${limit}`)
+        : getApiUrl('/api/announcements?fields=summary')
         
-      const response = await fetch(url, { headers })
+      const response = await fetch(url, { headers: authHeaders() })
 
       if (response.ok) {
         const data = await response.json()
@@ -73,7 +73,25 @@ export default function Announcements({ limit }: AnnouncementsProps) {
     return `priority-${priority}`
   }
 
+  const fetchContent = async (id: number) => {
+    try {
+      const response = await fetch(getApiUrl(`/api/announcements/${id}`), { headers: authHeaders() })
+      if (response.ok) {
+        const full: Announcement = await response.json()
+        setAnnouncements((current) =>
+          current.map((announcement) => announcement.id === id ? { ...announcement, content: full.content } : announcement)
+        )
+      }
+    } catch (err) {
+      console.error('Announcement content error:', err)
+    }
+  }
+
   const toggleExpanded = (id: number) => {
+    const announcement = announcements.find((item) => item.id === id)
+    if (expandedId !== id && announcement && announcement.content === undefined) {
+      fetchContent(id)
+    }
     setExpandedId(expandedId === id ? null : id)
   }
 
@@ -142,7 +160,7 @@ export default function Announcements({ limit }: AnnouncementsProps) {
                 {isExpanded ? (
                   <div 
                     className="announcement-full-content"
-                    dangerouslySetInnerHTML={{ __html: announcement.content }}
+                    dangerouslySetInnerHTML={{ __html: announcement.content ?? announcement.summary }}
                   />
                 ) : (
                   <div 
@@ -161,7 +161,7 @@ export default function ContactsPage({ isAuthenticated }: ContactsPageProps) {
         headers['Authorization'] = `Bearer ${token}`
       }
       
-      const response = await fetch('/api/geojson/jamaica-parishes.geojson', {
+      const response = await fetch('/api/geojson/jamaica-parishes.geojson?detail=medium', {
         headers,
         cache: 'no-cache'
       })